@@ -28,6 +28,10 @@ CHARACTER_MAP = {0: "", 1: "rpt+shfl ", 2: "rpt ", 3: "shfl ", 4: "◊ ", 5: "[)
                  236: "ì", 237: "í", 238: "î", 239: "ï", 240: "∂", 241: "ñ", 242: "ò", 243: "ó", 244: "ô", 245: "õ",
                  246: "ö", 247: "÷", 248: "ø", 249: "ù", 250: "ú", 251: "û", 252: "ü", 253: "y", 254: "p", 255: "ÿ"}
 
+# Display character code to text for every code from 0 to 255: printable ASCII stands for itself and everything else
+# comes from CHARACTER_MAP. Used to translate a whole front panel display in one pass.
+DISPLAY_CHARACTERS = tuple(CHARACTER_MAP[code] if code < 32 or code > 126 else chr(code) for code in range(256))
+
 # Channel volume receiver responses to device states map.
 CHANNEL_VOLUMES = {"L__": 'channelVolumeL', "R__": 'channelVolumeR', "C__": 'channelVolumeC', "SL_": 'channelVolumeSL',
                   "SR_": 'channelVolumeSR', "SBL": 'channelVolumeSBL', "SBR": 'channelVolumeSBR',
@@ -367,6 +371,80 @@ AUDIO_OUTPUT_FREQUENCIES = {'00': "32 kHz", '01': "44.1 kHz", '02': "48 kHz", '0
 AUDIO_CHANNELS = ['L', 'C', 'R', 'SL', 'SR', 'SBL', 'S', 'SBR', 'LFE', 'FHL', 'FHR', 'FWL', 'FWR', 'XL', 'XC', 'XR',
                   '(future)', '(future)', '(future)', '(future)', '(future)']
 
+# States that should have no value when the unit is off, and the value each is cleared to when both zones are off.
+ZONES_OFF_STATES = {
+    'audioInputFormat': "", 'audioInputFrequency': 0, 'inputChannels': "", 'outputChannels': "", 'monitorBitDepth': "",
+    'monitorColorSpaces': "", 'monitorRecommendedResolution': "", 'signalSource': "", 'sleepMode': False,
+    'sleepTime': 0, 'tunerBand': "", 'tunerFrequency': 0, 'tunerFrequencyText': "", 'tunerPreset': "",
+    'videoInputAspect': "", 'videoInputBitDepth': "", 'videoInputColorFormat': "", 'videoInputColorSpace': "",
+    'videoInputResolution': "", 'videoInputTerminal': "", 'videoOutputAspect': "", 'videoOutputBitDepth': "",
+    'videoOutputColorFormat': "", 'videoOutputColorSpace': "", 'videoOutputResolution': "",
+}
+
+# PQLS working mode ID to name map.
+PQLS_MODES = {'0': "off", '1': "2-channel", '2': "multi-channel", '3': "bitstream"}
+
+# Phase Control Plus reversed phase ID to state map.
+PHASE_CONTROL_PLUS_REVERSED = {'0': True, '1': False}
+
+# Video Input Terminal ID to name map.
+VIDEO_INPUT_TERMINALS = {'0': "", '1': "Video", '2': "S-Video", '3': "Component", '4': "HDMI", '5': "Self (OSD/JPEG)"}
+
+# Video Aspect Ratio ID to name map.
+VIDEO_ASPECTS = {'0': "", '1': "4:3", '2': "16:9", '3': "14:9"}
+
+# Video Color Format ID to name map.
+VIDEO_COLOR_FORMATS = {'0': "", '1': "RGB Limited", '2': "RGB Full", '3': "YCbCr 4:4:4", '4': "YCbCr 4:2:2"}
+
+# Video Bit Depth ID to name map.
+VIDEO_BIT_DEPTHS = {'0': "", '1': "24-bit (8-bit per pixel)", '2': "30-bit (10-bit per pixel)",
+                    '3': "36-bit (12-bit per pixel)", '4': "48-bit (16-bit per pixel)"}
+
+# Video Color Space ID to name map.
+VIDEO_COLOR_SPACES = {'0': "", '1': "Standard", '2': "xv.Color YCC 601", '3': "xv.Color YCC 709", '4': "sYCC",
+                      '5': "Adobe YCC 601", '6': "Adobe RGB"}
+
+# Monitor supported color space list (one flag each, in response order).
+MONITOR_COLOR_SPACES = ['xv.Color YCC 601', 'xv.Color YCC 709', 'xYCC', 'Adobe YCC 601', 'Adobe RGB']
+
+# Fixed-width field layouts of the audio (AST) and video (VST) status responses. Each field is (state, offset, width,
+# conversion), with the offset counted from the end of the response prefix. The conversion is a dictionary to look the
+# field up in, a list of names for a field of "1"/"0" flags (decoded to a comma-separated list of the names that are
+# set), or a function. See protocol.StatusDecoder.
+AUDIO_STATUS_FIELDS = (
+    ('audioInputFormat', 0, 2, AUDIO_INPUT_FORMATS),
+    ('audioInputFrequency', 2, 2, AUDIO_INPUT_FREQUENCIES),
+    ('inputChannels', 4, 21, AUDIO_CHANNELS),
+    ('outputChannels', 25, 18, AUDIO_CHANNELS),
+)
+
+# The VSX-1123-K responds with 55 instead of 43 characters. These extra data represent features found only in this and
+# other 2014 models (characters 48 through 51 are reserved).
+AUDIO_STATUS_FIELDS_2014 = AUDIO_STATUS_FIELDS + (
+    ('audioOutputFrequency', 43, 2, AUDIO_OUTPUT_FREQUENCIES),
+    ('audioOutputBitDepth', 45, 2, int),
+    ('pqlsMode', 51, 1, PQLS_MODES),
+    ('phaseControlPlusWorkingTime', 52, 2, int),
+    ('phaseControlPlusReversed', 54, 1, PHASE_CONTROL_PLUS_REVERSED),
+)
+
+VIDEO_STATUS_FIELDS = (
+    ('videoInputTerminal', 0, 1, VIDEO_INPUT_TERMINALS),
+    ('videoInputResolution', 1, 2, VIDEO_RESOLUTIONS),
+    ('videoInputAspect', 3, 1, VIDEO_ASPECTS),
+    ('videoInputColorFormat', 4, 1, VIDEO_COLOR_FORMATS),
+    ('videoInputBitDepth', 5, 1, VIDEO_BIT_DEPTHS),
+    ('videoInputColorSpace', 6, 1, VIDEO_COLOR_SPACES),
+    ('videoOutputResolution', 7, 2, VIDEO_RESOLUTIONS),
+    ('videoOutputAspect', 9, 1, VIDEO_ASPECTS),
+    ('videoOutputColorFormat', 10, 1, VIDEO_COLOR_FORMATS),
+    ('videoOutputBitDepth', 11, 1, VIDEO_BIT_DEPTHS),
+    ('videoOutputColorSpace', 12, 1, VIDEO_COLOR_SPACES),
+    ('monitorRecommendedResolution', 13, 2, VIDEO_RESOLUTIONS),
+    ('monitorBitDepth', 15, 1, VIDEO_BIT_DEPTHS),
+    ('monitorColorSpaces', 16, 5, MONITOR_COLOR_SPACES),
+)
+
 # Map button commands for Indigo actions to actual button names for display.
 REMOTE_BUTTON_NAMES = {'CUP': "Cursor UP", 'CDN': "Cursor DOWN", 'CRI': "Cursor RIGHT", 'CLE': "Cursor LEFT",
                        'CEN': "ENTER", 'CRT': "RETURN", '33NW': "CLEAR", 'HM': "HOME", 'STS': "DISPLAY", '00IP': "PLAY",
@@ -380,5 +458,231 @@ REMOTE_BUTTON_NAMES_ORDER = ['CUP', 'CDN', 'CRI', 'CLE', 'CEN', 'CRT', '33NW', '
                              '03IP', '04IP', '07IP', '08IP', '19SI', '00SI', '01SI', '02SI', '03SI', '04SI', '05SI',
                              '06SI', '07SI', '08SI', '09SI']
 
-# Connection retry delay (in approximately 1/10th second increments).
-CONNECTION_RETRY_DELAY = 300
+# Wait (in seconds) before the first retry after a failed connection attempt. It doubles after each further failure,
+# up to RECONNECT_MAX_DELAY, and each wait is randomly stretched or shrunk by up to RECONNECT_JITTER of itself.
+RECONNECT_INITIAL_DELAY = 0.5
+RECONNECT_MAX_DELAY = 60.0
+RECONNECT_JITTER = 0.2
+
+# Longest time (in seconds) to wait for a receiver to accept a TCP connection.
+CONNECT_TIMEOUT = 5.0
+
+# Most seconds a callback thread waits for the I/O thread to pick up a session it hands over to be closed. If it hasn't
+# by then, the session is left for the I/O thread to close when it gets to it.
+SESSION_HANDOFF_TIMEOUT = 2.0
+
+# Longest time (in seconds) to wait for a newly connected receiver to answer its first query before giving up on the
+# session.
+SESSION_SYNC_TIMEOUT = 3.0
+
+# Longest time (in seconds) a write to a connected receiver may block.
+SOCKET_WRITE_TIMEOUT = 1.0
+
+# Receiver session set-up stages: no session, TCP connect under way, primed and waiting for the answer to the first
+# query, and ready for commands.
+SESSION_IDLE = "idle"
+SESSION_CONNECTING = "connecting"
+SESSION_SYNCING = "syncing"
+SESSION_READY = "ready"
+
+# Longest time (in seconds) the I/O loop blocks with nothing to do before re-checking whether it should stop.
+IO_IDLE_TIMEOUT = 5.0
+
+# Seconds a receiver's data may sit unread while the I/O loop is busy with something else (another receiver's responses
+# or a timer) before the wait is logged as a stall.
+IO_STALL_WARNING = 0.5
+
+# Longest response line (in bytes) accepted from a receiver. Anything longer is discarded as garbage.
+MAX_RESPONSE_LENGTH = 512
+
+# Most bytes read from a receiver connection at once.
+RECEIVE_BUFFER_SIZE = 4096
+
+# Longest time (in seconds) to wait for a receiver to answer a command before writing the next queued one.
+COMMAND_REPLY_TIMEOUT = 0.5
+
+# Default for the most "display" state updates per second (0 means no limit).
+DEFAULT_DISPLAY_UPDATE_RATE = 4
+
+# Seconds to wait after an input source change before asking for the audio and video I/O status, and the longest wait
+# between repeated audio status queries while the new signal settles (the wait doubles each time the answer changes).
+AV_SETTLE_DELAY = 0.5
+AV_SETTLE_MAX_DELAY = 4.0
+
+# Volume command format for each zone (zone:(command suffix, digits, units per dB, units at 0 dB, highest units)).
+# Zone 1 volume is set in 0.5 dB steps from -80.5 dB (000VL) to +12 dB (185VL), zone 2 volume in 1 dB steps from
+# -81 dB (00ZV) to 0 dB (81ZV).
+VOLUME_COMMAND_UNITS = {1: ("VL", 3, 2, 161, 185), 2: ("ZV", 2, 1, 81, 81)}
+
+# Volume fade curves (see VolumeFade.level_at).
+VOLUME_FADE_CURVES = ("linear", "logarithmic", "sCurve")
+
+# Shortest time (in seconds) between the steps of a volume fade, and the most it's stretched to while the receiver says
+# it's busy (B00). Each step also waits for the receiver to answer the one before it.
+VOLUME_FADE_STEP_INTERVAL = 0.1
+VOLUME_FADE_MAX_STEP_INTERVAL = 1.0
+
+# Seconds input source and tuner preset label changes are held back so that a burst of them is written to the device
+# properties at once (a full sweep is also written as soon as its last answer is in).
+PROPS_WRITE_DELAY = 1.0
+
+# Longest time (in seconds) an action waits for the answer to a query it has made, including the time the query spends
+# queued behind other commands.
+QUERY_RESULT_TIMEOUT = 5.0
+
+# Most status queries the I/O loop keeps unanswered at once when pipelining them (the VSX-1021-K gets one at a time).
+QUERY_WINDOW = 4
+
+# Response that echoes each kind of command, by command code (what follows the command's parameter, if it has one), so
+# the command queue can tell a command's answer from the display updates and other responses the receiver sends on its
+# own. Only the tuner band commands of the "TN" family are echoed, so they're listed whole. Commands not listed are
+# answered by an "R" acknowledgement or an error, or are given up on after COMMAND_REPLY_TIMEOUT.
+COMMAND_RESPONSES = {
+    # Power, volume, mute and input source.
+    'PO': 'PWR', 'PF': 'PWR', 'PZ': 'PWR', 'APO': 'APR', 'APF': 'APR', 'APZ': 'APR',
+    'VL': 'VOL', 'VU': 'VOL', 'VD': 'VOL', 'ZV': 'ZV', 'ZU': 'ZV', 'ZD': 'ZV',
+    'MO': 'MUT', 'MF': 'MUT', 'MZ': 'MUT', 'Z2MO': 'Z2MUT', 'Z2MF': 'Z2MUT', 'Z2MZ': 'Z2MUT',
+    'FN': 'FN', 'FU': 'FN', 'FD': 'FN', 'ZS': 'Z2F',
+    # Listening modes, MCACC, tuner, display brightness and sleep timer.
+    'SR': 'SR', 'MC': 'MC', 'PR': 'PR', '00TN': 'FR', '01TN': 'FR', 'SAA': 'SAA', 'SAB': 'SAB',
+}
+
+# Status query to the prefix of the response that answers it. Input source name (?RGB##) and channel level (?###CLV)
+# queries take a parameter, so they're listed by their fixed part and answered by "RGB##" and "CLV###" respectively.
+QUERY_RESPONSES = {
+    # Power, volume, mute and input source.
+    '?P': 'PWR', '?AP': 'APR', '?V': 'VOL', '?ZV': 'ZV', '?M': 'MUT', '?Z2M': 'Z2MUT', '?F': 'FN', '?ZS': 'Z2F',
+    # Display, input source names, listening modes and MCACC.
+    '?FL': 'FL', '?RGB': 'RGB', '?L': 'LM', '?S': 'SR', '?MC': 'MC',
+    # Tuner.
+    '?TQ': 'TQ', '?FR': 'FR', '?PR': 'PR',
+    # System setup.
+    '?SPK': 'SPK', '?PKL': 'PKL', '?RML': 'RML', '?SSA': 'SSA', '?SSE': 'SSE', '?SSF': 'SSF', '?SAB': 'SAB',
+    # Audio DSP.
+    '?TO': 'TO', '?BA': 'BA', '?TR': 'TR', '?IS': 'IS', '?PQ': 'PQ', '?VSB': 'VSB', '?VHT': 'VHT', '?HA': 'HA',
+    '?SDA': 'SDA', '?SDB': 'SDB', '?ATA': 'ATA', '?ATC': 'ATC', '?ATD': 'ATD', '?ATE': 'ATE', '?ATF': 'ATF',
+    '?ATG': 'ATG', '?ATH': 'ATH', '?ATI': 'ATI', '?ATJ': 'ATJ', '?ATK': 'ATK', '?ATL': 'ATL', '?ATM': 'ATM',
+    '?ATN': 'ATN', '?ATO': 'ATO', '?ATP': 'ATP', '?ATQ': 'ATQ', '?ATR': 'ATR', '?ATS': 'ATS', '?ATT': 'ATT',
+    '?ATU': 'ATU',
+    # Video DSP.
+    '?VTB': 'VTB', '?VTC': 'VTC', '?VTD': 'VTD', '?VTE': 'VTE', '?VTG': 'VTG', '?VTH': 'VTH', '?VTL': 'VTL',
+    # Channel levels.
+    '?CLV': 'CLV',
+    # Audio and video input/output status.
+    '?AST': 'AST', '?VST': 'VST',
+}
+
+# Groups of status queries that are refreshed together, and how long (in seconds) a group's states are trusted before
+# an incremental refresh asks for them again. Receivers report most changes on their own, so this only bounds how long a
+# missed update can go unnoticed.
+STATE_GROUP_TTLS = {
+    'power': 300, 'volume': 300, 'source': 300, 'sourceNames': 3600, 'tuner': 600, 'systemSetup': 1800,
+    'audioDsp': 1800, 'videoDsp': 1800, 'channelLevels': 1800, 'avIO': 300,
+}
+
+# Seconds between checkpoints of the receivers' state group refresh times to the snapshot file. It's also written when
+# the plugin stops, so the first refresh after a restart only asks for the groups that have gone stale.
+SNAPSHOT_INTERVAL = 300
+
+# State groups asked for again after a restart however fresh the snapshot says they are, since the receiver's reports of
+# changes to them went unheard while the plugin wasn't running.
+WARM_START_VERIFY_GROUPS = ('power', 'volume', 'source', 'avIO', 'tuner')
+
+# State groups made out of date by zone 1 turning off, zone 2 turning off, both zones being off (the states cleared in
+# each case) and an input source change.
+ZONE1_OFF_STALE_GROUPS = ('volume', 'source', 'audioDsp', 'channelLevels')
+ZONE2_OFF_STALE_GROUPS = ('volume', 'source', 'tuner')
+ZONES_OFF_STALE_GROUPS = ('audioDsp', 'systemSetup', 'tuner', 'avIO')
+SOURCE_CHANGE_STALE_GROUPS = ('tuner', 'avIO')
+
+# Default minimum gap (in milliseconds) between commands sent to a VSX-1021-K, which can't keep up with back-to-back
+# commands even when it has answered the previous one. Configurable in the device settings.
+DEFAULT_COMMAND_GAP = 100
+
+# Receiver error responses and the text logged for each.
+RECEIVER_ERRORS = {'E02': "not available now.", 'E03': "invalid command.", 'E04': "command error.",
+                   'E06': "parameter error.", 'B00': "system busy."}
+
+# Errors that mean the receiver doesn't support a status query at all. E02 ("not available now") and B00 ("system
+# busy") are passing conditions, so a query answered with one of those is asked again next time.
+UNSUPPORTED_QUERY_ERRORS = ('E03', 'E04', 'E06')
+
+# Times in a row a status query has to be rejected with one of UNSUPPORTED_QUERY_ERRORS, while it's the only query
+# waiting for an answer, before it's remembered as unsupported. E04 and E06 can depend on the receiver's state (zone
+# power, listening mode), and a late error to a query that has timed out could otherwise be blamed on the next one.
+UNSUPPORTED_QUERY_REJECTIONS = 3
+
+# Responses whose value is one of a fixed set of codes. Each prefix maps to (state, response:value dictionary, log
+# message format, ignore the response if the state already has this value). Boolean values are logged as "on"/"off".
+ENUMERATED_RESPONSES = {
+    'IS': ('phaseControl', {'IS0': "off", 'IS1': "on", 'IS2': "on - full band"}, "Phase Control: {}", False),
+    'VSP': ('vsp', {'VSP0': "auto", 'VSP1': "manual"}, "Virtual Speakers: {}", False),
+    'VSB': ('vsb', {'VSB0': False, 'VSB1': True}, "Virtual Surround Back: {}", False),
+    'VHT': ('vht', {'VHT0': False, 'VHT1': True}, "Virtual Surround Height: {}", False),
+    'SPK': ('speakers', {'SPK0': "off", 'SPK1': "on - A", 'SPK2': "on - B", 'SPK3': "on - A+B"}, "speaker mode: {}",
+            False),
+    'HA': ('hdmiAudio', {'HA0': False, 'HA1': True}, "HDMI Audio Pass-Through: {}", False),
+    'PQ': ('pqls', {'PQ0': False, 'PQ1': True}, "PQLS: {}", False),
+    'SSA': ('operatingMode', {'SSA0': "Expert", 'SSA1': "(factory reserved)", 'SSA2': "Basic"}, "operating mode: {}",
+            False),
+    'SSF': ('speakerSystem', {'SSF00': "A + Surround Height", 'SSF01': "A + Surround Width", 'SSF02': "A Bi-Amped",
+                              'SSF03': "A + B 2-Channel", 'SSF04': "A + Zone 2"}, "speaker system layout: {}", False),
+    'PKL': ('panelKeyLockMode', {'PKL0': "off", 'PKL1': "on - panel", 'PKL2': "on - panel+volume"},
+            "front panel lock: {}", False),
+    'RML': ('remoteLock', {'RML0': False, 'RML1': True}, "remote control lock: {}", False),
+    'TO': ('toneControl', {'TO0': False, 'TO1': True}, "tone control: {}", False),
+    'ATA': ('soundRetriever', {'ATA0': False, 'ATA1': True}, "Sound Retriever: {}", False),
+    'SDA': ('signalSource', {'SDA0': "AUTO", 'SDA1': "ANALOG", 'SDA2': "DIGITAL", 'SDA3': "HDMI"},
+            "audio signal source: {}", False),
+    'SDB': ('analogInputAttenuator', {'SDB0': False, 'SDB1': True}, "analog input attenuator: {}", False),
+    'ATC': ('equalizer', {'ATC0': False, 'ATC1': True}, "equalizer: {}", True),
+    'ATD': ('standingWave', {'ATD0': False, 'ATD1': True}, "standing wave compensation: {}", True),
+    'ATG': ('digitalNR', {'ATG0': False, 'ATG1': True}, "Digital Noise Reduction: {}", False),
+    'ATH': ('dialogEnhancement', {'ATH0': "off", 'ATH1': "flat", 'ATH2': "up1", 'ATH3': "up2", 'ATH4': "up3",
+                                  'ATH5': "up4"}, "Dialog Enhancement mode: {}", False),
+    'ATI': ('hiBit24', {'ATI0': False, 'ATI1': True}, "Hi-bit 24: {}", False),
+    'ATJ': ('dualMono', {'ATJ0': False, 'ATJ1': True}, "Dual Mono sound processing: {}", False),
+    'ATK': ('fixedPCM', {'ATK0': False, 'ATK1': True}, "fixed rate PCM: {}", False),
+    'ATL': ('dynamicRangeCompression', {'ATL0': "off", 'ATL1': "auto", 'ATL2': "mid", 'ATL3': "max"},
+            "Dynamic Range Compression: {}", False),
+    'ATN': ('sacdGain', {'ATN0': 0, 'ATN1': 6}, "SACD gain: {} dB", False),
+    'ATO': ('autoDelay', {'ATO0': False, 'ATO1': True}, "Auto Sound Delay: {}", False),
+    'ATQ': ('pl2musicPanorama', {'ATQ0': False, 'ATQ1': True}, "Dolby Pro Logic II Music panorama: {}", False),
+    'ATU': ('pl2zHeightGain', {'ATU0': "LOW", 'ATU1': "MID", 'ATU2': "HIGH"}, "Dolby Pro Logic IIz height gain: {}",
+            False),
+    'VTB': ('videoConverter', {'VTB0': False, 'VTB1': True}, "video converter: {}", False),
+    'VTD': ('videoPureCinema', {'VTD0': "auto", 'VTD1': "on", 'VTD2': "off"}, "Pure Cinema mode: {}", False),
+    'VTG': ('videoAdvancedAdjust', {'VTG0': "PDP (Plasma)", 'VTG1': "LCD", 'VTG2': "FPJ (Front Projection)",
+                                    'VTG3': "Professional", 'VTG4': "Memory"}, "Advanced Video Adjustment: {}", False),
+}
+
+# Response prefix (or complete response) to the name of the Plugin method that handles it. Prefixes in
+# ENUMERATED_RESPONSES are handled by handleEnumeratedResponse and are not repeated here. No prefix is the beginning of
+# another one, so a response can only ever match one entry.
+RESPONSE_HANDLERS = {
+    # Errors and acknowledgements (complete responses).
+    'E02': 'handleErrorResponse', 'E03': 'handleErrorResponse', 'E04': 'handleErrorResponse',
+    'E06': 'handleErrorResponse', 'B00': 'handleErrorResponse', 'R': 'handleAcknowledgementResponse',
+    # Zone 1.
+    'PWR': 'handleZone1PowerResponse', 'MUT': 'handleZone1MuteResponse', 'FN': 'handleZone1SourceResponse',
+    'VOL': 'handleZone1VolumeResponse',
+    # Zone 2.
+    'APR': 'handleZone2PowerResponse', 'Z2F': 'handleZone2SourceResponse', 'Z2MUT': 'handleZone2MuteResponse',
+    'ZV': 'handleZone2VolumeResponse',
+    # System-wide.
+    'RGB': 'handleSourceNameResponse', 'FL': 'handleDisplayResponse', 'MC': 'handleMcaccMemoryResponse',
+    'CLV': 'handleChannelLevelResponse', 'SSE': 'handleOsdLanguageResponse', 'SAA': 'handleDisplayBrightnessResponse',
+    'SAB': 'handleSleepTimerResponse', 'FR': 'handleTunerFrequencyResponse', 'PR': 'handleTunerPresetResponse',
+    'TQ': 'handleTunerPresetLabelResponse', 'SR': 'handleListeningModeResponse',
+    'LM': 'handleDisplayListeningModeResponse', 'BA': 'handleBassResponse', 'TR': 'handleTrebleResponse',
+    # Audio DSP.
+    'ATE': 'handlePhaseControlPlusTimeResponse', 'ATF': 'handleSoundDelayResponse',
+    'ATM': 'handleLfeAttenuationResponse', 'ATP': 'handlePl2MusicCenterWidthResponse',
+    'ATR': 'handlePl2MusicDimensionResponse', 'ATS': 'handleNeo6CenterImageResponse',
+    'ATT': 'handleEffectAmountResponse',
+    # Video DSP.
+    'VTC': 'handleVideoResolutionResponse', 'VTE': 'handleVideoProgressiveQualityResponse',
+    'VTH': 'handleVideoYnrResponse', 'VTL': 'handleVideoDetailResponse',
+    # Audio/video input and output status.
+    'AST': 'handleAudioStatusResponse', 'VST': 'handleVideoStatusResponse',
+}
@@ -5,15 +5,28 @@
 Copyright (c) 2012, Nathan Sheldon. All rights reserved.
 http://www.nathansheldon.com/files/Pioneer-Receiver-Plugin.php  <--- this link may not remain active.
 
-Version 2022.0.11
+Version 2022.1.0
 """
 
 ################################################################################
 # import os
 # import sys
 # import signal
-import telnetlib
+import concurrent.futures
+import errno
+import functools
+import json
+import os
+import random
+import socket
+import threading
+import time
+import traceback
 from constants import *
+from protocol import (ReceiverError, StatusDecoder, command_response, decode_display, expected_response,
+                      find_response_handler)
+from receiver_io import LineFramer, ReceiverIOEngine
+from receiver_state import ReceiverShadow, VolumeFade
 
 try:
     import indigo
@@ -28,23 +41,45 @@ class Plugin(indigo.PluginBase):
     Placeholder - fixme
 
     """
-    ########################################
-    # Class Globals
-    ########################################
-
-    # Dictionary of device telnet sessions.
-    tn = {}
-    # List of devices whose complete status is being updated.
-    devicesBeingUpdated = []
-    # Dictionary of device connection waiting counters (device ID:1/10 second count)
-    devicesWaitingToConnect = {}
-
     ########################################
     def __init__(self, plugin_id, plugin_display_name, plugin_version, plugin_prefs):
         indigo.PluginBase.__init__(self, plugin_id, plugin_display_name, plugin_version, plugin_prefs)
         self.debug = plugin_prefs.get('showDebugInfo', False)
+        self.display_update_interval = self.getDisplayUpdateInterval(plugin_prefs)
         self.device_list = []
         self.volume_device_list = []
+        # Index of started Virtual Volume Controllers by the receiver control they follow ((receiver device ID, control
+        # destination):list of volume device IDs), and the control each one is indexed under (volume device ID:key).
+        self.volume_devices = {}
+        self.volume_device_bindings = {}
+        # Event-driven multiplexer that watches every receiver connection.
+        self.io_engine = ReceiverIOEngine()
+        self.io_engine.error_handler = self.ioCallbackFailed
+        # Dictionary of started receivers' in-memory states, properties and sessions (device ID:ReceiverShadow).
+        self.receivers = {}
+        # Thread for each started receiver that makes the I/O thread's server writes about it, in order (device
+        # ID:single-worker ThreadPoolExecutor; see writeToServer).
+        self.server_writers = {}
+        # Longest time (in seconds) any receiver's data has waited to be read while the I/O loop was busy elsewhere.
+        self.worst_io_stall = 0.0
+        # State changes collected by each thread while a batch is open (thread-local; see beginStateBatch).
+        self.state_batch = threading.local()
+        # Set while a refresh sweep queues a state group's queries (thread-local; see queryStateGroup).
+        self.refreshing = threading.local()
+        # Response dispatch table (response or response prefix:handler method). See RESPONSE_HANDLERS.
+        self.response_handlers = {prefix: getattr(self, name) for prefix, name in RESPONSE_HANDLERS.items()}
+        for prefix in ENUMERATED_RESPONSES:
+            self.response_handlers[prefix] = functools.partial(self.handleEnumeratedResponse, prefix)
+        # Decoders for the fixed-width audio and video status responses.
+        self.audio_status_decoder = StatusDecoder(AUDIO_STATUS_FIELDS)
+        self.audio_status_decoder_2014 = StatusDecoder(AUDIO_STATUS_FIELDS_2014)
+        self.video_status_decoder = StatusDecoder(VIDEO_STATUS_FIELDS)
+        # File that keeps the receivers' state group refresh times across restarts, and what was read from it at
+        # startup (device ID:{group:refresh time since the epoch}).
+        self.snapshot_path = os.path.join(
+            indigo.server.getInstallFolderPath(), "Preferences", "Plugins", f"{plugin_id}.snapshot.json"
+        )
+        self.snapshot = {}
 
     ########################################
     def __del__(self):
@@ -62,7 +97,30 @@ class Plugin(indigo.PluginBase):
 
         :return:
         """
-        # ...
+        # Pick up where the last run left off, and keep the snapshot current in case it doesn't get to write it.
+        self.loadSnapshot()
+        self.io_engine.call_later(SNAPSHOT_INTERVAL, self.checkpointSnapshot)
+
+    ########################################
+    def deviceUpdated(self, orig_dev, new_dev):
+        """
+        Called by the plugin host whenever a device changes.
+
+        :param orig_dev:
+        :param new_dev:
+        :return:
+        """
+        indigo.PluginBase.deviceUpdated(self, orig_dev, new_dev)
+        # The plugin host already reports changes to this plugin's own devices (no subscribeToChanges needed), which is
+        # how the receivers' in-memory properties keep in step with the device configuration dialog.
+        if new_dev.pluginId != self.pluginId:
+            return
+        receiver = self.receivers.get(new_dev.id)
+        if receiver is not None:
+            receiver.device_updated(new_dev)
+        elif new_dev.id in self.volume_device_bindings:
+            # A Virtual Volume Controller may have been pointed at another receiver or zone.
+            self.indexVolumeDevice(new_dev)
 
     ########################################
     def deviceCreated(self, device):
@@ -186,6 +244,14 @@ class Plugin(indigo.PluginBase):
                 self.debugLog(f"deviceStartComm: adding sc75 device_id {device.id} to deviceList.")
                 self.device_list.append(device.id)
 
+        # Keep an in-memory copy of a newly started receiver and have the I/O loop connect to it right away.
+        if device.id in self.device_list:
+            if device.id not in self.server_writers:
+                self.server_writers[device.id] = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="ServerWriter"
+                )
+            self.startSession(device)
+
         #
         # Virtual Volume Controller Device
         #
@@ -196,6 +262,7 @@ class Plugin(indigo.PluginBase):
                     f"deviceStartComm: adding virtualVolume device_id {device.id} to volumeDeviceList."
                 )
                 self.volume_device_list.append(device.id)
+            self.indexVolumeDevice(device)
             # Update the device to the value of the receiver device control to which it is configured to virtualize.
             receiver_device_id = int(device.pluginProps.get('receiverDeviceId', ""))
             control_destination = device.pluginProps.get('controlDestination', "")
@@ -269,6 +336,19 @@ class Plugin(indigo.PluginBase):
             if device.states['connected']:
                 self.disconnect(device)
 
+        # The receiver is disconnected, so its in-memory copy is no longer needed once any labels still held back have
+        # been written. Abandon any session still being set up and any pending reconnection attempt along with it.
+        receiver = self.receivers.get(device.id)
+        try:
+            if receiver is not None:
+                self.io_engine.call_and_wait(self.stopSession, receiver, timeout=SESSION_HANDOFF_TIMEOUT)
+        except TimeoutError as err:
+            self.errorLog(f"{device.name} will be stopped once the plugin is less busy. {err}")
+        # Writes already handed to the receiver's server writer are still made.
+        server_writer = self.server_writers.pop(device.id, None)
+        if server_writer is not None:
+            server_writer.shutdown(wait=False)
+
         #
         # Virtual Volume Controller Device
         #
@@ -276,6 +356,7 @@ class Plugin(indigo.PluginBase):
             # Remove this device from the list of level devices associated with this plugin.
             if device.id in self.volume_device_list:
                 self.volume_device_list.remove(device.id)
+            self.unindexVolumeDevice(device.id)
 
     ########################################
     def didDeviceCommPropertyChange(self, orig_dev, new_dev):
@@ -307,59 +388,218 @@ class Plugin(indigo.PluginBase):
             return False
 
     ########################################
+    def recordIoStall(self, receiver, stall):
+        """
+        Keep track of how long a receiver's data waited to be read after the I/O loop first saw it arrive (time spent
+        on timers and on other receivers' responses meanwhile).
+
+        :param receiver: ReceiverShadow instance.
+        :param stall: seconds the data waited.
+        :return:
+        """
+        if stall > receiver.worst_stall:
+            receiver.worst_stall = stall
+        if stall > self.worst_io_stall:
+            self.worst_io_stall = stall
+            self.debugLog(f"recordIoStall: New worst wait for data: {stall * 1000:.1f} ms ({receiver.name}).")
+        if stall >= IO_STALL_WARNING:
+            self.receiverLog(
+                receiver.device, f"Data waited {stall:.2f} seconds to be read while other work was done."
+            )
+
+    ########################################
+    def startSession(self, device):
+        """
+        Keep an in-memory copy of a newly started receiver and have the I/O loop connect to it. Runs on the I/O thread
+        (deviceStartComm hands it over). The hand-off is queued behind any stopSession still waiting from the last
+        time the device was stopped, so the receiver starts over with a new copy.
+
+        :param device:
+        :return:
+        """
+        if threading.current_thread() is not self.io_engine.poll_thread and self.io_engine.poll_thread is not None:
+            self.io_engine.call_later(0, self.startSession, device)
+            return
+        if device.id not in self.device_list:
+            # The device was stopped again in the meantime.
+            return
+        if device.id not in self.receivers:
+            self.receivers[device.id] = ReceiverShadow(device)
+            self.restoreSnapshot(self.receivers[device.id])
+        self.scheduleReconnect(self.receivers[device.id], 0)
+
+    ########################################
+    def stopSession(self, receiver):
+        """
+        Write any labels still held back, close the session and forget a stopped receiver. Runs on the I/O thread
+        (deviceStopComm hands it over). Does nothing if the receiver has already been forgotten, so a stop that ran
+        late can't touch a copy made when the device was started again.
+
+        :param receiver: ReceiverShadow instance.
+        :return:
+        """
+        if self.receivers.get(receiver.device_id) is not receiver:
+            return
+        self.flushDeviceProps(receiver.device_id)
+        del self.receivers[receiver.device_id]
+        self.io_engine.cancel(receiver.reconnect_timer)
+        self.closeSession(receiver)
+
+    #########################################
+    # Threading Model
+    #
+    #   Indigo calls the plugin on several threads: runConcurrentThread runs on its own thread, while action, menu,
+    #   dialog and device start/stop callbacks arrive on the server's callback threads, sometimes several at once.
+    #   runConcurrentThread is the I/O thread. It alone touches the receiver sockets, the LineFramer buffers, the
+    #   command queues' in-flight lists, the session state and the refresh sweeps.
+    #
+    #   Other threads never read or write a socket. They hand work to the I/O thread in one of these ways:
+    #     - sendCommand, queueCommand, queryReceiver and queueCallback append to the receiver's command queue (a
+    #       thread-safe deque) and wake the I/O loop. queryReceiver returns a concurrent.futures.Future, and
+    #       waitForQuery blocks the calling thread (never the I/O thread) on it.
+    #     - connect, startSession, getReceiverStatus, stageDeviceProps, updateDeviceState (for started receivers),
+    #       startVolumeFade and stopVolumeFade re-schedule themselves on the I/O thread with call_later(0, ...) when
+    #       called from another thread, and reprobeCapabilities hands its work over the same way. The receiver shadows,
+    #       their unsupported query lists and their volume fades are only ever changed on the I/O thread.
+    #     - disconnect and deviceStopComm use io_engine.call_and_wait, so the session is closed by the I/O thread before
+    #       they return. If the I/O thread doesn't get to it within SESSION_HANDOFF_TIMEOUT seconds, they log it and
+    #       leave it queued; the session is never closed on the calling thread. Work handed over runs in the order it
+    #       was handed over, so a device started again meanwhile gets a new shadow only once the old one is closed.
+    #   The I/O thread doesn't wait on the Indigo server either: writeToServer, receiverLog and receiverError hand its
+    #   state, property and log writes about a receiver to that receiver's server writer thread (started and stopped
+    #   with the device; see server_writers), which makes them in order.
+    #   The ReceiverIOEngine timer heap is lock-protected and may be used from any thread.
+    #########################################
     def runConcurrentThread(self):
         """
-        Placeholder - fixme
+        The I/O thread (see Threading Model): wait for receiver activity and process it until the plugin stops.
 
         :return:
         """
         self.debugLog("runConcurrentThread called.")
-        # loopCount = 0  TODO: the only reference now. No longer necessary?
         #
-        # Continuously loop through all receiver devices. Obtain any data that they might be providing and process it.
+        # Block until a receiver has data waiting, a timer falls due or another thread wakes the loop up, then read and
+        # process only the receivers that actually said something.
         #
         try:
             while True:
-                self.sleep(0.1)
-                # Cycle through each receiver device.
-                for device_id in self.device_list:
-                    response = ""
-                    response_line = ""
-                    result = ""
-
-                    connected = indigo.devices[device_id].states.get('connected', False)
-
-                    # Only proceed if we're connected.
-                    if connected:
-                        # Remove the device ID from the devicesWaitingToConnect dictionary.
-                        if self.devicesWaitingToConnect.get(device_id, -1) > -1:
-                            del self.devicesWaitingToConnect[device_id]
-                        # Call the readData method with the device instance
-                        response = self.readData(indigo.devices[device_id])
-                        # If a response was returned, process it.
-                        if response != "":
-                            # There is often more than one line.  Process all of them.
-                            for response_line in response.splitlines():
-                                result = self.processResponse(indigo.devices[device_id], response_line)
+                if self.stopThread:
+                    raise self.StopThread
+                for device_id in self.io_engine.poll(IO_IDLE_TIMEOUT):
+                    # Ignore stragglers from a device that was stopped while the poll was running.
+                    receiver = self.receivers.get(device_id)
+                    if receiver is None or device_id not in self.device_list:
+                        continue
+                    self.recordIoStall(receiver, time.monotonic() - self.io_engine.readable_since(device_id))
+                    # Call the readData method with the device instance. There is often more than one complete line.
+                    # Process all of them, collecting the state changes they make so the whole burst is written to the
+                    # server at once.
+                    # A failure while dealing with one response is logged and the loop carries on, so it can't stop
+                    # the I/O thread for every receiver.
+                    self.beginStateBatch(receiver)
+                    try:
+                        for response_line in self.readData(receiver.device):
+                            try:
+                                result = self.processResponse(receiver.device, response_line)
                                 # If there was a result, send it to the log.
                                 if result != "":
-                                    indigo.server.log(result, indigo.devices[device_id].name)
-                    else:
-                        # Since we're not connected, try to connect.
-                        self.connect(indigo.devices[device_id])
+                                    self.receiverLog(receiver.device, result)
+                            except Exception:
+                                self.receiverError(
+                                    receiver.device,
+                                    f"Unable to process {response_line!r} from {receiver.name}:\n"
+                                    f"{traceback.format_exc()}"
+                                )
+                            # Let the command queue know if this answers one of the commands it sent.
+                            self.commandAnswered(receiver, response_line)
+                    except Exception:
+                        self.receiverError(
+                            receiver.device, f"Unable to read from {receiver.name}:\n{traceback.format_exc()}"
+                        )
+                    finally:
+                        self.endStateBatch()
+                    # Time the data that arrived for other receivers while this one was being dealt with.
+                    self.io_engine.note_readable()
 
         except self.StopThread:
             self.debugLog("runConcurrentThread stopped.")
+            # Save the refresh times before disconnecting forgets them.
+            self.saveSnapshot()
             # Cycle through each receiver device.
             for device_id in self.device_list:
-                self.disconnect(indigo.devices[device_id])
+                receiver = self.receivers.get(device_id)
+                if receiver is not None:
+                    self.disconnect(receiver.device)
 
+        # Nothing is polling any more, so whatever other threads hand over from now on is run in their own thread.
+        self.io_engine.poll_thread = None
         self.debugLog("runConcurrentThread exiting.")
 
+    ########################################
+    def ioCallbackFailed(self, callback, trace):
+        """
+        Log an exception raised by an I/O engine timer or watch callback. The engine carries on with the next one.
+
+        :param callback: the callback that failed.
+        :param trace: traceback text.
+        :return:
+        """
+        self.errorLog(f"Error in {getattr(callback, '__name__', callback)}:\n{trace}")
+
+    ########################################
+    def stopConcurrentThread(self):
+        """
+        Placeholder - fixme
+
+        :return:
+        """
+        indigo.PluginBase.stopConcurrentThread(self)
+        # The I/O loop may be blocked waiting for receiver data, so wake it up to notice the stop request.
+        self.io_engine.wakeup()
+
     ########################################
     # Core Custom Methods
     ########################################
 
+    # Reconnection Scheduling
+    ########################################
+    def scheduleReconnect(self, receiver, delay=None):
+        """
+        Arrange for the I/O loop to try connecting to a receiver. Safe to call from any thread.
+
+        Without an explicit delay, the wait doubles after each failed attempt (starting at RECONNECT_INITIAL_DELAY and
+        capped at RECONNECT_MAX_DELAY), with some random jitter so receivers that went away together don't all retry at
+        the same moment. A receiver that's off for the night costs one connection attempt a minute.
+
+        :param receiver: ReceiverShadow instance.
+        :param delay: seconds until the attempt, or None to back off.
+        :return: the delay used.
+        """
+        if delay is None:
+            receiver.reconnect_delay = min(max(receiver.reconnect_delay * 2, RECONNECT_INITIAL_DELAY),
+                                           RECONNECT_MAX_DELAY)
+            delay = receiver.reconnect_delay * random.uniform(1 - RECONNECT_JITTER, 1 + RECONNECT_JITTER)
+        self.io_engine.cancel(receiver.reconnect_timer)
+        receiver.reconnect_timer = self.io_engine.call_later(delay, self.reconnect, receiver.device_id)
+        return delay
+
+    ########################################
+    def reconnect(self, device_id):
+        """
+        Scheduled connection attempt. Runs on the I/O thread.
+
+        :param device_id:
+        :return:
+        """
+        receiver = self.receivers.get(device_id)
+        if receiver is None:
+            return
+        receiver.reconnect_timer = None
+        # A "connected" state left over from before the session was lost is no longer true.
+        if receiver.connected:
+            self.updateDeviceState(receiver.device, 'connected', False)
+        self.connect(receiver.device)
+
     # Update Device State
     ########################################
     def updateDeviceState(self, device, state, new_value):
@@ -371,1741 +611,2177 @@ class Plugin(indigo.PluginBase):
         :param new_value:
         :return:
         """
+        # A started receiver's in-memory copy belongs to the I/O thread.
+        receiver = self.receivers.get(device.id)
+        if (
+                receiver is not None
+                and threading.current_thread() is not self.io_engine.poll_thread
+                and self.io_engine.poll_thread is not None
+        ):
+            self.io_engine.call_later(0, self.updateDeviceState, device, state, new_value)
+            return
         # Change the device state on the server if it's different from the current state.
-        if new_value != device.states[state]:
+        if new_value != self.getDeviceState(device, state):
             try:
                 self.debugLog(f"updateDeviceState: Updating device {device.name} state: {state} = {new_value}")
             except Exception as err:
                 self.debugLog(
                     f"updateDeviceState: Updating device {device.name} state: (Unable to display state due to "
                     f"error: {err})")
+            # Keep the in-memory copy current.
+            if receiver is not None:
+                receiver.record_state(state, new_value)
+            # If this thread is collecting state changes, hold on to the change until the batch is flushed.
+            pending = getattr(self.state_batch, 'pending', None)
+            if pending is not None:
+                pending.setdefault(device.id, (device, {}))[1][state] = new_value
             # If this is a floating point number, specify the maximum number of digits to make visible in the state.
             # Everything in this plugin only needs 1 decimal place of precision. If this isn't a floating point value,
             # don't specify a number of decimal places to display.
-            if new_value.__class__.__name__ == 'float':
-                device.updateStateOnServer(key=state, value=new_value, decimalPlaces=1)
+            elif new_value.__class__.__name__ == 'float':
+                self.writeToServer(receiver, device.updateStateOnServer, key=state, value=new_value, decimalPlaces=1)
             else:
-                device.updateStateOnServer(key=state, value=new_value)
+                self.writeToServer(receiver, device.updateStateOnServer, key=state, value=new_value)
 
-    # Update Device Properties
     ########################################
-    def updateDeviceProps(self, device, new_props):
+    def getDeviceState(self, device, state):
         """
-        Placeholder - fixme
+        Get a device state without fetching the device from the server. Started receivers are read from their
+        in-memory copy; other devices include any change made by this thread that hasn't been flushed yet.
 
         :param device:
-        :param new_props:
+        :param state:
         :return:
         """
-        # Change the properties for this device that are stored on the server.
-        if device.pluginProps != new_props:
-            self.debugLog(f"updateDeviceProps: Updating device {device.name} properties.")
-            device.replacePluginPropsOnServer(new_props)
-
-    # Connect to a Receiver Device
+        receiver = self.receivers.get(device.id)
+        if receiver is not None:
+            return receiver.states[state]
+        pending = getattr(self.state_batch, 'pending', None)
+        if pending and device.id in pending:
+            changes = pending[device.id][1]
+            if state in changes:
+                return changes[state]
+        return device.states[state]
+
+    # Virtual Volume Controller Index
     ########################################
-    def connect(self, device):
+    def indexVolumeDevice(self, device):
         """
-        Placeholder - fixme
-        :param device:
+        Add a Virtual Volume Controller to the index under the receiver control it's configured to follow, moving it if
+        it was indexed under another one.
+
+        :param device: Virtual Volume Controller device.
         :return:
         """
-        # Display this debug message only once every 50 times the method is called.
-        if (self.devicesWaitingToConnect.get(device.id, 0) % 10 == 0
-                or self.devicesWaitingToConnect.get(device.id, 0) == 0):
-            self.debugLog("connect method called.")
+        try:
+            receiver_device_id = int(device.pluginProps.get('receiverDeviceId', 0))
+        except ValueError:
+            receiver_device_id = 0
+        key = (receiver_device_id, device.pluginProps.get('controlDestination', ""))
+        if self.volume_device_bindings.get(device.id) == key:
+            return
+        self.unindexVolumeDevice(device.id)
+        self.volume_devices.setdefault(key, []).append(device.id)
+        self.volume_device_bindings[device.id] = key
 
-        connected = device.states['connected']
-        dev_props = device.pluginProps
-        connecting = dev_props.get('tryingToConnect', False)
-        # Get the device address.
-        receiver_ip = dev_props['address']
-
-        # Display these debug messages only once every 50 times the method is called.
-        if self.devicesWaitingToConnect.get(device.id, 0) % 50 == 0:
-            self.debugLog(f"connect: {device.name} connected? {connected}")
-            self.debugLog(f"connect: {device.name} connecting? {connecting}")
-
-        # Only try to connect if we're not already connected and aren't trying to connect.
-        if not connected and not connecting:
-            connecting = True
-            # Update the device properties just in case the properties aren't up-to-date.
-            dev_props['tryingToConnect'] = True
-            self.updateDeviceProps(device, dev_props)
+    ########################################
+    def unindexVolumeDevice(self, device_id):
+        """
+        Remove a Virtual Volume Controller from the index. Devices that aren't indexed are ignored.
 
-            # Try to connect to the receiver.
-            self.debugLog(f"connect: Connecting to {device.name} at {receiver_ip}")
-            try:
-                self.updateDeviceState(device, 'status', "connecting")
+        :param device_id: Indigo device ID of the Virtual Volume Controller.
+        :return:
+        """
+        key = self.volume_device_bindings.pop(device_id, None)
+        if key is not None:
+            self.volume_devices[key].remove(device_id)
+            if not self.volume_devices[key]:
+                del self.volume_devices[key]
 
-                # Use the correct TCP port number based on device type.
-                if device.deviceTypeId == "vsx1022k":
-                    # The VSX-1022-K only accepts connections on port 8102.
-                    self.tn[device.id] = telnetlib.Telnet(receiver_ip, 8102)
-                else:
-                    # All other receivers accept connections on the standard telnet port.
-                    self.tn[device.id] = telnetlib.Telnet(receiver_ip)
-
-                # Connection established if we get to this point.
-                indigo.server.log("Connection established.", device.name)
-                connected = True
-                # Upon initial connection to a Pioneer receiver, it is necessary to "prime" the connection by simply
-                # sending a CR and LF.
-                # self.tn[device.id].write("\r\n")
-                self.tn[device.id].write(str.encode("\r\n"))
-                connecting = False
-                # Update the device state on the server.
-                self.updateDeviceState(device, 'status', "connected")
-                self.updateDeviceState(device, 'connected', True)
-                dev_props['tryingToConnect'] = False
-                self.updateDeviceProps(device, dev_props)
-                # Remove the device ID from the list of devices waiting to connect.
-                waiting_count = self.devicesWaitingToConnect.get(device.id, -1)
-                if waiting_count > -1:
-                    del self.devicesWaitingToConnect[device.id]
-
-                # Now that we're connected, gather receiver status information.
-                self.getReceiverStatus(device)
+    ########################################
+    def getVolumeDevices(self, device, control_destination):
+        """
+        Get the Virtual Volume Controllers that follow a receiver control.
 
-            except Exception as err:
-                # If this was a connection refused error, report it.
-                if "(61," in str(err):
-                    self.errorLog(
-                        f"Connection refused when trying to connect to {device.name}. Will try again in "
-                        f"{float((CONNECTION_RETRY_DELAY / 10))} seconds."
-                    )
-                    # Increment the number of times we attempted to connect but reached this point because we were
-                    # already trying to connect.
-                    waiting_count = self.devicesWaitingToConnect.get(device.id, -1)
-                    if waiting_count > -1:
-                        self.devicesWaitingToConnect[device.id] += 1
-                    else:
-                        self.devicesWaitingToConnect[device.id] = 1
-                else:
-                    self.errorLog(
-                        f"Unable to establish a connection to {device.name}: {err}. Will try again in "
-                        f"{float(CONNECTION_RETRY_DELAY / 10)} seconds."
-                    )
-                    # Increment the number of times we attempted to connect but reached this point because we were
-                    # already trying to connect.
-                    waiting_count = self.devicesWaitingToConnect.get(device.id, -1)
-                    if waiting_count > -1:
-                        self.devicesWaitingToConnect[device.id] += 1
-                    else:
-                        self.devicesWaitingToConnect[device.id] = 1
-            except self.StopThread:
-                self.debugLog("connect: Cancelling connection attempt.")
-                return
+        :param device: receiver device.
+        :param control_destination: receiver state the controllers follow ("zone1volume" or "zone2volume").
+        :return: list of Virtual Volume Controller devices.
+        """
+        device_ids = self.volume_devices.get((device.id, control_destination), ())
+        return [indigo.devices[device_id] for device_id in device_ids]
 
-        elif not connected and connecting:
-            # Increment the number of times we attempted to connect but reached this point because we were already
-            # trying to connect.
-            waiting_count = self.devicesWaitingToConnect.get(device.id, -1)
-            if waiting_count > -1:
-                self.devicesWaitingToConnect[device.id] += 1
-            else:
-                self.devicesWaitingToConnect[device.id] = 1
-            # If the number of times we've waited to connect is greater than connectionRetryDelay, then reset the
-            # tryingToConnect property.
-            if self.devicesWaitingToConnect.get(device.id, -1) > CONNECTION_RETRY_DELAY:
-                connecting = False
-                dev_props['tryingToConnect'] = False
-                self.updateDeviceProps(device, dev_props)
-                # Remove the device ID from the list of devices waiting to connect.
-                waiting_count = self.devicesWaitingToConnect.get(device.id, -1)
-                if waiting_count > -1:
-                    del self.devicesWaitingToConnect[device.id]
-                    self.debugLog(
-                        "connect: Re-connect wait period over. Will try to connect next time the connect method is "
-                        "called."
-                    )
-                else:
-                    self.debugLog(
-                        f"connect: Attempt to connect to {device.name} skipped because we're still trying to connect "
-                        f"to it."
-                    )
+    # Batched State Updates
+    ########################################
+    def beginStateBatch(self, receiver=None):
+        """
+        Start collecting the state changes made by this thread so they can be written with one updateStatesOnServer
+        call per device instead of one server round-trip per state.
 
-        elif connected:
-            self.debugLog(
-                f"connect: Attempt to connect to {device.name} skipped because we're already connected to it."
-            )
-            connected = True
-            # Update the device to reflect this.
-            self.updateDeviceState(device, 'connected', True)
-            dev_props['tryingToConnect'] = False
-            self.updateDeviceProps(device, dev_props)
-            # Remove the device ID from the list of devices waiting to connect.
-            waiting_count = self.devicesWaitingToConnect.get(device.id, -1)
-            if waiting_count > -1:
-                del self.devicesWaitingToConnect[device.id]
+        :param receiver: ReceiverShadow whose server writer writes the batch (None to write it on this thread).
+        :return:
+        """
+        if getattr(self.state_batch, 'pending', None) is None:
+            self.state_batch.pending = {}
+            self.state_batch.receiver = receiver
 
-        # Display wait count in debug log.
-        if self.devicesWaitingToConnect.get(device.id, 0) % 50 == 0:
-            self.debugLog(f"connect: Connection wait count: {self.devicesWaitingToConnect.get(device.id, 0)}")
+    ########################################
+    def flushStateBatch(self):
+        """
+        Write the state changes collected by this thread to the server. The batch stays open.
 
-    # Disconnect from a Receiver Device
-    #########################################
-    def disconnect(self, device):
+        :return:
         """
-        Placeholder - fixme
-        :param device:
+        pending = getattr(self.state_batch, 'pending', None)
+        if not pending:
+            return
+        self.state_batch.pending = {}
+        for device, changes in pending.values():
+            key_value_list = []
+            for state, new_value in changes.items():
+                # Floats get the same 1 decimal place of precision updateDeviceState gives them.
+                if new_value.__class__.__name__ == 'float':
+                    key_value_list.append({'key': state, 'value': new_value, 'decimalPlaces': 1})
+                else:
+                    key_value_list.append({'key': state, 'value': new_value})
+            self.debugLog(f"flushStateBatch: Updating {len(key_value_list)} states for device {device.name}.")
+            self.writeToServer(self.state_batch.receiver, device.updateStatesOnServer, key_value_list)
+
+    ########################################
+    def endStateBatch(self):
+        """
+        Flush the state changes collected by this thread and go back to writing each change as it's made.
+
         :return:
         """
-        self.debugLog("disconnect method called.")
+        try:
+            self.flushStateBatch()
+        finally:
+            self.state_batch.pending = None
+            self.state_batch.receiver = None
 
-        connected = device.states['connected']
-        dev_props = device.pluginProps
-        connecting = dev_props.get('tryingToConnect', False)
+    ########################################
+    def writeToServer(self, receiver, write, *args, **kwargs):
+        """
+        Make a call that writes to the Indigo server (a state, properties or log write) for a receiver. On the I/O
+        thread, the call is handed to the receiver's server writer, so a slow server round-trip holds up neither the
+        I/O loop nor the other receivers; a receiver's writes are still made in order. Other threads make the call
+        themselves.
 
-        # Disconnect the telnet session.
+        :param receiver: ReceiverShadow instance, or None to make the call on this thread.
+        :param write: callable that writes to the server.
+        :param args: positional arguments for the call.
+        :param kwargs: keyword arguments for the call.
+        :return:
+        """
+        server_writer = self.server_writers.get(receiver.device_id) if receiver is not None else None
+        if server_writer is None or threading.current_thread() is not self.io_engine.poll_thread:
+            write(*args, **kwargs)
+            return
         try:
-            self.tn[device.id].close()
-            # Update the "status" device state.
-            self.updateDeviceState(device, 'status', "disconnected")
-            # Update the "connected" state on the server as well.
-            self.updateDeviceState(device, 'connected', False)
-            # Make sure the tryingToConnect device property is not on.
-            dev_props['tryingToConnect'] = False
-            self.updateDeviceProps(device, dev_props)
-            self.debugLog(f"disconnect: {device.name} telnet connection is now closed.")
-            # Remove the device ID from the list of devices waiting to connect (if it's in there).
-            waiting_count = self.devicesWaitingToConnect.get(device.id, -1)
-            if waiting_count > -1:
-                del self.devicesWaitingToConnect[device.id]
-        except EOFError:
-            self.debugLog(f"disconnect: Connection to {device.name} is already closed.")
-            self.updateDeviceState(device, 'status', "disconnected")
-            self.updateDeviceState(device, 'connected', False)
-            dev_props['tryingToConnect'] = False
-            self.updateDeviceProps(device, dev_props)
-            self.debugLog(f"disconnect: {device.name} connection is already closed.")
-            # Remove the device ID from the list of devices waiting to connect (if it's in there).
-            waiting_count = self.devicesWaitingToConnect.get(device.id, -1)
-            if waiting_count > -1:
-                del self.devicesWaitingToConnect[device.id]
-        except Exception as err:
-            self.errorLog(f"disconnect: Error disconnecting from {device.name}: {err}")
-            self.updateDeviceState(device, 'status', "error")
-            self.updateDeviceState(device, 'connected', False)
-            dev_props['tryingToConnect'] = False
-            self.updateDeviceProps(device, dev_props)
-            self.debugLog(f"disconnect: {device.name} is now disconnected (error while disconnecting).")
-            # Remove the device ID from the list of devices waiting to connect (if it's in there).
-            waiting_count = self.devicesWaitingToConnect.get(device.id, -1)
-            if waiting_count > -1:
-                del self.devicesWaitingToConnect[device.id]
+            server_writer.submit(self.runServerWrite, receiver.name, write, args, kwargs)
+        except RuntimeError:
+            # The receiver has just been stopped, so its writer takes no more work.
+            write(*args, **kwargs)
 
-    #########################################
-    # Send a Command
-    #########################################
-    def sendCommand(self, device, command):
+    ########################################
+    def receiverLog(self, device, message):
         """
-        Placeholder - fixme
+        Write a message about a receiver to the Indigo log, in order with the state changes it describes (see
+        writeToServer).
+
         :param device:
-        :param command:
+        :param message:
         :return:
         """
-        # Get the device type. Future versions of this plugin will support other receiver models.
-        dev_type = device.deviceTypeId
-
-        # Catch attempts to send a command to a Virtual Volume Controller device, which is not possible (but because
-        # it's not currently possible to prevent the user from selecting it as a destination device in the Indigo UI,
-        # we must check for it).
-        if dev_type == "virtualVolume":
-            self.errorLog(
-                f"Device \"{device.name}\" is a Virtual Volume Controller, not a Pioneer receiver. Modify the Indigo "
-                f"action to send the command \"{command}\" to a Pioneer receiver instead of this  device."
-            )
-            return None
+        self.writeToServer(self.receivers.get(device.id), indigo.server.log, message, device.name)
 
-        # Get the device current connection status.
-        connected = device.states['connected']
-        # Get the device properties.
-        dev_props = device.pluginProps
-        connecting = dev_props.get('tryingToConnect', False)
+    ########################################
+    def receiverError(self, device, message):
+        """
+        Write an error about a receiver to the Indigo log, in order with the state changes it describes (see
+        writeToServer).
 
-        # Make sure the command is a string.
-        command = str(command)
-        # Make sure there's only one set of a carriage return and line feed.
-        command = command.rstrip("\r\n")
-        # SPECIAL CIRCUMSTANCE:
-        #   The "TAC", "TFI" and "TFD" commands change the Tuner frequency. We need to clear the "tunerPreset" state
-        #   if either of these commands are being sent.
-        if command in ['TAC', 'TFI', 'TFD']:
-            self.updateDeviceState(device, "tunerPreset", "")
-        # Now send the command.
-        self.debugLog(f"sendCommand: Telling {device.name}: {command}")
+        :param device:
+        :param message:
+        :return:
+        """
+        self.writeToServer(self.receivers.get(device.id), self.errorLog, message)
 
-        command = f"{command}\r"
+    ########################################
+    def runServerWrite(self, name, write, args, kwargs):
+        """
+        Make a write handed over by writeToServer. Runs on the receiver's server writer thread.
 
-        # Only proceed if we're not trying to connect.
-        if connected:
-            try:
-                # self.tn[device.id].write(command)
-                self.tn[device.id].write(str.encode(command))
-            except EOFError:
-                # Connection is closed. Update status and try to re-open.
-                self.errorLog(f"Connection to {device.name} lost while trying to send data. Will attempt to connect.")
-                self.updateDeviceState(device, 'status', "disconnected")
-                self.updateDeviceState(device, 'connected', False)
-                self.connect(device)
-            except Exception as err:
-                # Unknown error.
-                self.errorLog(f"Failed to send data to {device.name}: {err}")
-                self.updateDeviceState(device, 'status', "error")
-                self.updateDeviceState(device, 'connected', False)
-        elif not connected and not connecting:
-            # Show an error and try to connect.
-            self.errorLog(f"Unable to send command to {device.name}. It is not connected. Attempting to re-connect.")
-            self.connect(device)
-        elif not connected and connecting:
-            # Show an error indicating that we're still trying to connect.
-            self.errorLog(f"Unable to send command to {device.name}. Still trying to connect to it.")
+        :param name: receiver name, for the log.
+        :param write: callable that writes to the server.
+        :param args: positional arguments for the call.
+        :param kwargs: keyword arguments for the call.
+        :return:
+        """
+        try:
+            write(*args, **kwargs)
+        except Exception as err:
+            self.errorLog(f"Unable to update {name} on the Indigo server: {err}")
 
-    #########################################
-    # Read Data from a Receiver Connection
-    #########################################
-    def readData(self, device):
+    # Update Device Properties
+    ########################################
+    def updateDeviceProps(self, device, new_props):
         """
         Placeholder - fixme
 
         :param device:
+        :param new_props:
         :return:
         """
-        response = ""
-
-        # Get the device connection state and properties.
-        connected = device.states['connected']
-        dev_props = device.pluginProps
-        connecting = dev_props.get('tryingToConnect', False)
-
-        # Only proceed if we're connected.
-        if connected:
-            try:
-                # Read the data and return it without blocking.
-                response = self.tn[device.id].read_very_eager().decode()
-                # Strip the CR and LF from the end of the response.
-                response = response.rstrip("\r\n")
-                # Force the response to be an ASCII string.
-                response = str(response)
-                if response != "":
-                    self.debugLog(f"readData: {device.name} said: {response}")
-            except EOFError:
-                # Connection is closed, try to re-open.
-                self.errorLog(
-                    f"Connection to {device.name} lost while trying to receive data. Trying to re-connect.")
-                self.updateDeviceState(device, 'status', "disconnected")
-                self.updateDeviceState(device, 'connected', False)
-                self.connect(device)
-            except Exception as err:
-                # Unknown error.
-                self.errorLog(f"Failed to receive data from {device.name}: {err}")
-                self.updateDeviceState(device, 'status', "error")
-                self.updateDeviceState(device, 'connected', False)
-        elif not connected and not connecting:
-            # Show an error and try to connect.
-            self.errorLog(f"Unable to read data from {device.name}. It is not connected. Attempting to re-connect.")
-            self.connect(device)
-        elif not connected and connecting:
-            # Show an error indicating that we're still trying to connect.
-            self.errorLog(f"Unable to read data from {device.name}. Still trying to connect to it.")
-
-        return response
+        # Change the properties for this device that are stored on the server. Changes staged by stageDeviceProps are
+        # already part of any copy made by getDeviceProps, so they are written along with it.
+        receiver = self.receivers.get(device.id)
+        if receiver is not None:
+            self.io_engine.cancel(receiver.props_timer)
+            receiver.props_timer = None
+            receiver.props_pending = {}
+        current_props = receiver.props if receiver is not None else device.pluginProps
+        if current_props != new_props:
+            self.debugLog(f"updateDeviceProps: Updating device {device.name} properties.")
+            self.writeToServer(receiver, device.replacePluginPropsOnServer, new_props)
+            if receiver is not None:
+                receiver.record_props(new_props)
 
-    #########################################
-    # Process a Command Response
-    #########################################
-    def processResponse(self, device, response):
+    ########################################
+    def getDeviceProps(self, device):
         """
-        Placeholder - fixme
+        Get a copy of a device's properties without fetching the device from the server (started receivers are read
+        from their in-memory copy). Changes to the copy can be written back with updateDeviceProps.
 
         :param device:
-        :param response:
         :return:
         """
-        # Update the Indigo receiver device based on the response from the receiver.
-        self.debugLog(f"processResponse: from: {device.name} response: {response}")
+        receiver = self.receivers.get(device.id)
+        if receiver is not None:
+            dev_props = dict(receiver.props)
+            dev_props.update(receiver.props_pending)
+            return dev_props
+        return device.pluginProps
 
-        # Get the type of device.  In the future, we'll support different receiver types.
-        dev_type = device.deviceTypeId
+    ########################################
+    def stageDeviceProps(self, device, changes):
+        """
+        Change some of a device's properties without writing them to the server straight away.
 
-        # Make a copy of the device properties, so we can change them if needed.
-        dev_props = device.pluginProps
+        Input source and tuner preset label sweeps change one property per response, and every properties write
+        replaces the whole dictionary on the server. Staged changes are collected and written together by
+        flushDeviceProps, either when the sweep that asked for them is finished or PROPS_WRITE_DELAY seconds after the
+        first one, whichever comes first. getDeviceProps includes them in the meantime.
 
-        result = ""
-        state = ""
-        new_value = ""
+        :param device:
+        :param changes: dictionary of property:new value.
+        :return:
+        """
+        receiver = self.receivers.get(device.id)
+        if receiver is None:
+            dev_props = self.getDeviceProps(device)
+            dev_props.update(changes)
+            self.updateDeviceProps(device, dev_props)
+            return
+        # Staged changes belong to the I/O thread.
+        if threading.current_thread() is not self.io_engine.poll_thread and self.io_engine.poll_thread is not None:
+            self.io_engine.call_later(0, self.stageDeviceProps, device, changes)
+            return
+        for prop_name, new_value in changes.items():
+            if receiver.props.get(prop_name) == new_value:
+                receiver.props_pending.pop(prop_name, None)
+            else:
+                receiver.props_pending[prop_name] = new_value
+        if receiver.props_pending and receiver.props_timer is None:
+            receiver.props_timer = self.io_engine.call_later(PROPS_WRITE_DELAY, self.flushDeviceProps, device.id)
+
+    ########################################
+    def flushDeviceProps(self, device_id):
+        """
+        Write the property changes held back by stageDeviceProps with a single properties write.
+
+        :param device_id:
+        :return:
+        """
+        receiver = self.receivers.get(device_id)
+        if receiver is None:
+            return
+        self.io_engine.cancel(receiver.props_timer)
+        receiver.props_timer = None
+        if receiver.props_pending:
+            self.debugLog(f"flushDeviceProps: Writing {len(receiver.props_pending)} staged properties.")
+            self.updateDeviceProps(receiver.device, self.getDeviceProps(receiver.device))
+
+    # Warm-Start Snapshot
+    #
+    #   The server keeps device states and properties (including the learned input source and tuner preset labels and
+    #   unsupported queries) across restarts, but not how recently each state group was refreshed. The snapshot file
+    #   keeps those refresh times, so the refresh after a restart can skip the groups that are still fresh.
+    ########################################
+    def loadSnapshot(self):
+        """
+        Read the snapshot file written by the last run, if there is one.
+
+        :return:
+        """
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as snapshot_file:
+                snapshot = json.load(snapshot_file)
+            self.snapshot = {int(device_id): entry['groups'] for device_id, entry in snapshot['receivers'].items()}
+        except FileNotFoundError:
+            self.snapshot = {}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as err:
+            self.debugLog(f"loadSnapshot: Ignoring unreadable snapshot file {self.snapshot_path}: {err}")
+            self.snapshot = {}
+
+    ########################################
+    def restoreSnapshot(self, receiver):
+        """
+        Give a newly started receiver the refresh times saved by the last run. They're held back until its first
+        session is ready.
+
+        :param receiver: ReceiverShadow instance.
+        :return:
+        """
+        groups = self.snapshot.pop(receiver.device_id, None)
+        if not groups:
+            return
+        # Refresh times are saved as wall clock times and kept as time.monotonic() times.
+        offset = time.monotonic() - time.time()
+        receiver.restored_groups = {
+            group: refreshed + offset for group, refreshed in groups.items()
+            if group in STATE_GROUP_TTLS and group not in WARM_START_VERIFY_GROUPS
+        }
+        self.debugLog(f"restoreSnapshot: Restored refresh times of {len(receiver.restored_groups)} state groups for "
+                      f"{receiver.name}.")
+
+    ########################################
+    def saveSnapshot(self):
+        """
+        Write the started receivers' state group refresh times to the snapshot file.
+
+        :return:
+        """
+        offset = time.time() - time.monotonic()
+        receivers = {}
+        for device_id, receiver in list(self.receivers.items()):
+            groups = receiver.group_refreshed or receiver.restored_groups or {}
+            receivers[str(device_id)] = {'groups': {group: refreshed + offset for group, refreshed in groups.items()}}
+        # Write a new file and move it into place, so a crash can't leave a half-written snapshot behind.
+        temp_path = f"{self.snapshot_path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as snapshot_file:
+                json.dump({'saved': time.time(), 'receivers': receivers}, snapshot_file)
+            os.replace(temp_path, self.snapshot_path)
+        except OSError as err:
+            self.errorLog(f"Unable to write the snapshot file {self.snapshot_path}: {err}")
+
+    ########################################
+    def checkpointSnapshot(self):
+        """
+        Periodic snapshot file update. Runs on the I/O thread.
+
+        :return:
+        """
+        self.saveSnapshot()
+        self.io_engine.call_later(SNAPSHOT_INTERVAL, self.checkpointSnapshot)
+
+    # Connect to a Receiver Device
+    ########################################
+    def connect(self, device):
+        """
+        Start setting up a session with a receiver unless one is already being set up or running. Safe to call from
+        any thread (the work is handed to the I/O thread).
+
+        :param device:
+        :return:
+        """
+        self.debugLog("connect method called.")
+
+        # Only started receivers have somewhere to keep a session.
+        receiver = self.receivers.get(device.id)
+        if receiver is None:
+            self.receiverError(
+                device, f"Unable to connect to {device.name}. Communication with it hasn't been started."
+            )
+            return
+        # Sessions are only ever set up on the I/O thread.
+        if threading.current_thread() is not self.io_engine.poll_thread:
+            self.io_engine.call_later(0, self.connect, device)
+            return
+        if receiver.session_state != SESSION_IDLE:
+            self.debugLog(
+                f"connect: Attempt to connect to {device.name} skipped because it's already connected or connecting."
+            )
+            return
+
+        # This attempt replaces any that was scheduled.
+        self.io_engine.cancel(receiver.reconnect_timer)
+        receiver.reconnect_timer = None
+        # Get the device address.
+        receiver_ip = self.getDeviceProps(device)['address']
+
+        # Start connecting to the receiver. The I/O loop finishes the job (see connectCompleted), so a receiver
+        # that's slow to answer (or isn't there) doesn't hold up the others.
+        self.debugLog(f"connect: Connecting to {device.name} at {receiver_ip}")
+        self.updateDeviceState(device, 'status', "connecting")
+        # Use the correct TCP port number based on device type. The VSX-1022-K only accepts connections on port
+        # 8102. All other receivers accept connections on the standard telnet port.
+        port = 8102 if device.deviceTypeId == "vsx1022k" else 23
+        try:
+            family, sock_type, proto, _, address = socket.getaddrinfo(receiver_ip, port, type=socket.SOCK_STREAM)[0]
+            sock = socket.socket(family, sock_type, proto)
+            sock.setblocking(False)
+            error = sock.connect_ex(address)
+            if error not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+                sock.close()
+                raise OSError(error, os.strerror(error))
+        except Exception as err:
+            self.connectFailed(receiver, err)
+            return
+        receiver.connection = sock
+        receiver.session_state = SESSION_CONNECTING
+        self.io_engine.watch_writable(sock, self.connectCompleted, device.id)
+        receiver.session_timer = self.io_engine.call_later(CONNECT_TIMEOUT, self.connectTimedOut, device.id)
+
+    ########################################
+    def connectCompleted(self, device_id):
+        """
+        Second stage of a connection attempt, run on the I/O thread once the TCP connect has finished (successfully or
+        not). Primes the connection and asks for the power status; the session is only ready once the receiver has
+        answered (see sessionSynced).
+
+        :param device_id:
+        :return:
+        """
+        receiver = self.receivers.get(device_id)
+        if receiver is None or receiver.session_state != SESSION_CONNECTING:
+            return
+        sock = receiver.connection
+        error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if error:
+            self.connectFailed(receiver, OSError(error, os.strerror(error)))
+            return
+
+        device = receiver.device
+        self.receiverLog(device, "Connection established.")
+        self.io_engine.cancel(receiver.session_timer)
+        receiver.session_timer = None
+        receiver.session_state = SESSION_SYNCING
+        # Reads only happen once the I/O loop reports data waiting, so a timeout only ever applies to writes.
+        sock.settimeout(SOCKET_WRITE_TIMEOUT)
+        # Hand the session to the I/O loop so it's woken up whenever the receiver sends something, and start the
+        # session with an empty line reassembly buffer.
+        receiver.framer = LineFramer(MAX_RESPONSE_LENGTH)
+        self.io_engine.register(device_id, sock)
+        try:
+            # Upon initial connection to a Pioneer receiver, it is necessary to "prime" the connection by simply
+            # sending a CR and LF.
+            sock.sendall(str.encode("\r\n"))
+        except OSError as err:
+            self.connectFailed(receiver, err)
+            return
+        reply = concurrent.futures.Future()
+        reply.add_done_callback(functools.partial(self.sessionSynced, device_id))
+        self.queueCommand(device, "?P", reply, SESSION_SYNC_TIMEOUT)
+
+    ########################################
+    def sessionSynced(self, device_id, reply):
+        """
+        Last stage of a connection attempt, run on the I/O thread once the first query has been answered (or not).
+
+        :param device_id:
+        :param reply: the first query's future.
+        :return:
+        """
+        receiver = self.receivers.get(device_id)
+        if receiver is None or receiver.session_state != SESSION_SYNCING:
+            return
+        err = reply.exception()
+        # An error response still shows the receiver is listening.
+        if err is not None and not isinstance(err, ReceiverError):
+            self.connectFailed(receiver, err)
+            return
+
+        device = receiver.device
+        receiver.session_state = SESSION_READY
+        # Update the device state on the server.
+        self.updateDeviceState(device, 'status', "connected")
+        self.updateDeviceState(device, 'connected', True)
+        # The next time the session is lost, start backing off from scratch.
+        receiver.reconnect_delay = 0.0
+        receiver.failed_connects = 0
+
+        # Now that we're connected, gather receiver status information. Right after a restart, the states the server
+        # kept are trusted for as long as the snapshot says they're still fresh, so only the rest is asked for. They
+        # stay unverified until the first refresh has checked that the power and source haven't changed since.
+        if receiver.restored_groups is not None:
+            receiver.group_refreshed.update(receiver.restored_groups)
+            receiver.unverified_groups = set(receiver.restored_groups)
+            receiver.restored_groups = None
+            self.getReceiverStatus(device, stale_only=True)
+        else:
+            self.getReceiverStatus(device)
+
+    ########################################
+    def connectTimedOut(self, device_id):
+        """
+        Give up on a TCP connect that's taking too long. Run on the I/O thread.
+
+        :param device_id:
+        :return:
+        """
+        receiver = self.receivers.get(device_id)
+        if receiver is None or receiver.session_state != SESSION_CONNECTING:
+            return
+        receiver.session_timer = None
+        self.connectFailed(receiver, f"no answer within {CONNECT_TIMEOUT:g} seconds")
+
+    ########################################
+    def connectFailed(self, receiver, err):
+        """
+        Abandon a connection attempt and schedule the next one.
+
+        :param receiver: ReceiverShadow instance.
+        :param err: exception or description of what went wrong.
+        :return:
+        """
+        device = receiver.device
+        self.closeSession(receiver)
+        delay = self.scheduleReconnect(receiver)
+        receiver.failed_connects += 1
+        # Only the first failure in a row is worth an error; a receiver that's switched off at the wall fails all night.
+        log = self.errorLog if receiver.failed_connects == 1 else self.debugLog
+        # If this was a connection refused error, report it.
+        if isinstance(err, ConnectionRefusedError):
+            log(f"Connection refused when trying to connect to {device.name}. Will try again in {delay:.1f} seconds.")
+        else:
+            log(f"Unable to establish a connection to {device.name}: {err}. Will try again in {delay:.1f} seconds.")
+
+    ########################################
+    def closeSession(self, receiver):
+        """
+        Close a receiver's socket at whatever stage the session is in and forget everything queued for it.
+
+        :param receiver: ReceiverShadow instance.
+        :return:
+        """
+        receiver.session_state = SESSION_IDLE
+        self.io_engine.cancel(receiver.session_timer)
+        receiver.session_timer = None
+        self.io_engine.unregister(receiver.device_id)
+        self.clearCommandQueue(receiver)
+        # Nothing is known to be current once the receiver stops reporting its changes.
+        receiver.group_refreshed.clear()
+        receiver.unverified_groups.clear()
+        # The next session starts with a refresh of its own.
+        receiver.refresh_sweep = None
+        receiver.refresh_follow_up = False
+        # So do volume fades.
+        for zone in VOLUME_COMMAND_UNITS:
+            self.stopVolumeFade(receiver.device, zone)
+        self.io_engine.cancel(receiver.av_settle_timer)
+        receiver.av_settle_timer = None
+        receiver.av_settle_reply = None
+        connection = receiver.connection
+        receiver.connection = None
+        receiver.framer = None
+        if connection is not None:
+            self.io_engine.unwatch(connection)
+            connection.close()
+
+    # Disconnect from a Receiver Device
+    #########################################
+    def disconnect(self, device):
+        """
+        Placeholder - fixme
+        :param device:
+        :return:
+        """
+        self.debugLog("disconnect method called.")
+        # Sessions are only ever closed on the I/O thread.
+        try:
+            self.io_engine.call_and_wait(self.closeDeviceSession, device, timeout=SESSION_HANDOFF_TIMEOUT)
+        except TimeoutError as err:
+            self.errorLog(f"{device.name} will be disconnected once the plugin is less busy. {err}")
+
+    ########################################
+    def closeDeviceSession(self, device):
+        """
+        Second half of disconnect, run on the I/O thread.
+
+        :param device:
+        :return:
+        """
+        # Stop watching the session and disconnect it.
+        try:
+            receiver = self.receivers[device.id]
+            self.io_engine.cancel(receiver.reconnect_timer)
+            receiver.reconnect_timer = None
+            self.closeSession(receiver)
+            # Update the "status" device state.
+            self.updateDeviceState(device, 'status', "disconnected")
+            # Update the "connected" state on the server as well.
+            self.updateDeviceState(device, 'connected', False)
+            self.debugLog(f"disconnect: {device.name} connection is now closed.")
+        except EOFError:
+            self.debugLog(f"disconnect: Connection to {device.name} is already closed.")
+            self.updateDeviceState(device, 'status', "disconnected")
+            self.updateDeviceState(device, 'connected', False)
+            self.debugLog(f"disconnect: {device.name} connection is already closed.")
+        except Exception as err:
+            self.receiverError(device, f"disconnect: Error disconnecting from {device.name}: {err}")
+            self.updateDeviceState(device, 'status', "error")
+            self.updateDeviceState(device, 'connected', False)
+            self.debugLog(f"disconnect: {device.name} is now disconnected (error while disconnecting).")
+
+    #########################################
+    # Send a Command
+    #########################################
+    def sendCommand(self, device, command):
+        """
+        Placeholder - fixme
+        :param device:
+        :param command:
+        :return:
+        """
+        # Get the device type. Future versions of this plugin will support other receiver models.
+        dev_type = device.deviceTypeId
+
+        # Catch attempts to send a command to a Virtual Volume Controller device, which is not possible (but because
+        # it's not currently possible to prevent the user from selecting it as a destination device in the Indigo UI,
+        # we must check for it).
+        if dev_type == "virtualVolume":
+            self.errorLog(
+                f"Device \"{device.name}\" is a Virtual Volume Controller, not a Pioneer receiver. Modify the Indigo "
+                f"action to send the command \"{command}\" to a Pioneer receiver instead of this  device."
+            )
+            return None
+
+        # Get the device current connection status. A session that's still waiting for the answer to its sync query
+        # is open, so commands sent in the meantime are queued behind that query.
+        receiver = self.receivers.get(device.id)
+        connected = self.getDeviceState(device, 'connected') or (
+            receiver is not None and receiver.session_state == SESSION_SYNCING
+        )
+        connecting = receiver is not None and receiver.connecting
+
+        # Make sure the command is a string.
+        command = str(command)
+        # Make sure there's only one set of a carriage return and line feed.
+        command = command.rstrip("\r\n")
+        # Refresh sweeps don't bother asking for information the receiver has said it doesn't support. Anything else
+        # (such as a raw command sent on purpose) always goes out.
+        if (receiver is not None and getattr(self.refreshing, 'active', False)
+                and command in receiver.unsupported_queries):
+            self.debugLog(f"sendCommand: {device.name} doesn't support {command}. Skipping it.")
+            return None
+        # SPECIAL CIRCUMSTANCE:
+        #   The "TAC", "TFI" and "TFD" commands change the Tuner frequency. We need to clear the "tunerPreset" state
+        #   if either of these commands are being sent.
+        if command in ['TAC', 'TFI', 'TFD']:
+            self.updateDeviceState(device, "tunerPreset", "")
+        # Only proceed if we're not trying to connect.
+        if connected:
+            # Queue the command. The I/O loop writes it as soon as the receiver has answered the commands ahead of it.
+            self.debugLog(f"sendCommand: Queueing for {device.name}: {command}")
+            self.queueCommand(device, command)
+        elif not connected and not connecting:
+            # Show an error and try to connect.
+            self.receiverError(
+                device, f"Unable to send command to {device.name}. It is not connected. Attempting to re-connect."
+            )
+            self.connect(device)
+        elif not connected and connecting:
+            # Show an error indicating that we're still trying to connect.
+            self.receiverError(device, f"Unable to send command to {device.name}. Still trying to connect to it.")
+
+    #########################################
+    # Outbound Command Queue
+    #
+    #   Each receiver has a FIFO queue of commands. The I/O loop writes a command once the receiver has answered the
+    #   commands ahead of it, so commands go out as fast as the receiver can take them. Status queries (see
+    #   QUERY_RESPONSES) are pipelined: up to QUERY_WINDOW of them can be waiting for their answers at once, and each
+    #   is matched to its answer by response prefix. Any other command is written on its own and is answered by its
+    #   echo (see COMMAND_RESPONSES), an "R" acknowledgement or an error; display updates and the like that arrive in
+    #   the meantime don't count. Anything not answered within COMMAND_REPLY_TIMEOUT seconds is given up on. The
+    #   VSX-1021-K gets one command at a time with a configurable minimum gap between them.
+    #
+    #   Code that needs the answer to a query (rather than just the state updates it causes) can use queryReceiver,
+    #   which returns a future resolved by the I/O loop with the answering response line.
+    #########################################
+    def queueCommand(self, device, command, reply=None, timeout=COMMAND_REPLY_TIMEOUT):
+        """
+        Add a command to the end of a receiver's command queue. Safe to call from any thread.
+
+        :param device:
+        :param command: the command without its terminating carriage return.
+        :param reply: concurrent.futures.Future to resolve with the answering response line, or None.
+        :param timeout: seconds to wait for the answer once the command has been written.
+        :return:
+        """
+        receiver = self.receivers.get(device.id)
+        if receiver is None:
+            self.receiverError(
+                device, f"Unable to send command to {device.name}. Communication with it hasn't been started."
+            )
+            if reply is not None:
+                reply.set_exception(ConnectionError(f"{device.name} is not connected."))
+            return
+        expected = expected_response(command, QUERY_RESPONSES)
+        query = expected is not None
+        if not query:
+            expected = command_response(command, COMMAND_RESPONSES)
+        receiver.command_queue.append((command, expected, reply, timeout, query))
+        self.scheduleCommandWriter(receiver)
+
+    ########################################
+    def queryReceiver(self, device, query, timeout=COMMAND_REPLY_TIMEOUT):
+        """
+        Send a status query and return a future for its answer. Safe to call from any thread.
+
+        The future's result is the answering response line, by which time the response has already been processed (so
+        the device states reflect it). It fails with ReceiverError if the receiver answers with an error, TimeoutError
+        if it doesn't answer within `timeout` seconds of the query being written, or ConnectionError if the receiver
+        isn't connected or the session ends first.
+
+        :param device:
+        :param query: a query listed in QUERY_RESPONSES, ?RGB## or ?###CLV.
+        :param timeout: seconds to wait for the answer once the query has been written.
+        :return: concurrent.futures.Future
+        """
+        reply = concurrent.futures.Future()
+        if expected_response(query, QUERY_RESPONSES) is None:
+            reply.set_exception(ValueError(f"{query} is not a status query."))
+        elif not self.getDeviceState(device, 'connected'):
+            reply.set_exception(ConnectionError(f"{device.name} is not connected."))
+        else:
+            self.debugLog(f"queryReceiver: Queueing for {device.name}: {query}")
+            self.queueCommand(device, query, reply, timeout)
+        return reply
+
+    ########################################
+    def waitForQuery(self, device, query, timeout=COMMAND_REPLY_TIMEOUT):
+        """
+        Send a status query and wait for its answer. Must not be called on the I/O thread (runConcurrentThread), which
+        is the thread that delivers the answer.
+
+        :param device:
+        :param query: a query listed in QUERY_RESPONSES, ?RGB## or ?###CLV.
+        :param timeout: seconds to wait for the answer once the query has been written.
+        :return: the answering response line, or None if there wasn't one.
+        """
+        reply = self.queryReceiver(device, query, timeout)
+        try:
+            return reply.result(QUERY_RESULT_TIMEOUT)
+        except (ReceiverError, ConnectionError, ValueError, TimeoutError, concurrent.futures.TimeoutError) as err:
+            self.debugLog(f"waitForQuery: No answer to {query} from {device.name}: {err}")
+            return None
+
+    ########################################
+    def queueCallback(self, device, callback):
+        """
+        Run a callback on the I/O thread once every command queued before it has been answered (or has timed out).
+        Callbacks still queued when the session is lost are run right away, so each one runs exactly once.
+
+        :param device:
+        :param callback: callable taking no arguments.
+        :return:
+        """
+        receiver = self.receivers.get(device.id)
+        if receiver is None:
+            callback()
+            return
+        receiver.command_queue.append(callback)
+        self.scheduleCommandWriter(receiver)
+
+    ########################################
+    def scheduleCommandWriter(self, receiver):
+        """
+        Make sure the I/O loop looks at a receiver's command queue. Safe to call from any thread.
+
+        :param receiver: ReceiverShadow instance.
+        :return:
+        """
+        if not receiver.writer_scheduled:
+            receiver.writer_scheduled = True
+            self.io_engine.call_later(0, self.writeQueuedCommands, receiver.device_id)
+
+    ########################################
+    def writeQueuedCommands(self, device_id):
+        """
+        Write as many queued commands for a receiver as it's ready for, running any callbacks whose turn has come.
+        Called on the I/O thread.
+
+        :param device_id:
+        :return:
+        """
+        receiver = self.receivers.get(device_id)
+        if receiver is None:
+            return
+        receiver.writer_scheduled = False
+        if receiver.connection is None:
+            # The session has just ended and the "connected" state hasn't caught up yet. Whatever is queued waits for
+            # the next session.
+            return
+        window = self.getQueryWindow(receiver)
+        in_flight = receiver.in_flight
+        while receiver.command_queue:
+            entry = receiver.command_queue[0]
+            if not isinstance(entry, tuple):
+                # Callbacks wait until everything ahead of them has been answered.
+                if in_flight:
+                    return
+                receiver.command_queue.popleft()
+                entry()
+                continue
+
+            command, expected, reply, timeout, query = entry
+            # Only queries are pipelined, and only behind other queries. A query the receiver has rejected is written
+            # on its own, so a repeat rejection can only be its own.
+            suspect = receiver.query_rejections
+            if in_flight and (not query or not in_flight[-1][4] or len(in_flight) >= window or command in suspect
+                              or in_flight[-1][3] in suspect):
+                return
+            # Respect the minimum gap between commands.
+            delay = receiver.next_write_time - time.monotonic()
+            if delay > 0:
+                receiver.writer_scheduled = True
+                self.io_engine.call_later(delay, self.writeQueuedCommands, device_id)
+                return
+
+            receiver.command_queue.popleft()
+            device = receiver.device
+            self.debugLog(f"writeQueuedCommands: Telling {device.name}: {command}")
+            try:
+                receiver.connection.sendall(str.encode(f"{command}\r"))
+            except (EOFError, ConnectionError):
+                # Connection is closed. Update status and try to re-open.
+                self.receiverError(
+                    device, f"Connection to {device.name} lost while trying to send data. Will attempt to connect."
+                )
+                self.closeSession(receiver)
+                self.updateDeviceState(device, 'status', "disconnected")
+                self.updateDeviceState(device, 'connected', False)
+                self.scheduleReconnect(receiver, 0)
+                return
+            except Exception as err:
+                # Unknown error.
+                self.receiverError(device, f"Failed to send data to {device.name}: {err}")
+                self.closeSession(receiver)
+                self.updateDeviceState(device, 'status', "error")
+                self.updateDeviceState(device, 'connected', False)
+                self.scheduleReconnect(receiver)
+                return
+            receiver.commands_sent += 1
+            in_flight.append([expected, time.monotonic() + timeout, reply, command, query])
+            self.restartReplyTimer(receiver)
+
+    ########################################
+    def commandAnswered(self, receiver, response):
+        """
+        Match a response line to the command it answers, if any, and write more commands if there's now room.
+        Called on the I/O thread.
+
+        :param receiver: ReceiverShadow instance.
+        :param response: a complete response line.
+        :return:
+        """
+        in_flight = receiver.in_flight
+        if not in_flight:
+            return
+        answered = None
+        if not in_flight[0][4]:
+            # A command is written on its own, and is answered by its echo, an acknowledgement or an error.
+            expected = in_flight[0][0]
+            if response == "R" or response in RECEIVER_ERRORS or (expected and response.startswith(expected)):
+                answered = 0
+        elif response in RECEIVER_ERRORS:
+            # Errors belong to the oldest unanswered query.
+            answered = 0
+        else:
+            for index, (expected, _, _, _, _) in enumerate(in_flight):
+                if response.startswith(expected):
+                    answered = index
+                    break
+        if answered is None:
+            # Something the receiver said on its own (display updates and the like).
+            return
+
+        alone = len(in_flight) == 1
+        expected, deadline, reply, command, query = in_flight[answered]
+        del in_flight[answered]
+        if reply is not None and not reply.done():
+            if response in RECEIVER_ERRORS:
+                reply.set_exception(ReceiverError(response, RECEIVER_ERRORS[response]))
+            else:
+                reply.set_result(response)
+        if query and response in UNSUPPORTED_QUERY_ERRORS:
+            self.recordUnsupportedQuery(receiver, command, response, alone)
+        elif query and response not in RECEIVER_ERRORS:
+            receiver.query_rejections.pop(command, None)
+        receiver.next_write_time = time.monotonic() + self.getCommandGap(receiver)
+        self.restartReplyTimer(receiver)
+        self.writeQueuedCommands(receiver.device_id)
+
+    ########################################
+    def commandReplyTimedOut(self, device_id):
+        """
+        Give up on the commands whose answers are overdue and move on. Called on the I/O thread.
+
+        :param device_id:
+        :return:
+        """
+        receiver = self.receivers.get(device_id)
+        if receiver is None:
+            return
+        receiver.reply_timer = None
+        now = time.monotonic()
+        for entry in [entry for entry in receiver.in_flight if entry[1] <= now]:
+            expected, _, reply, command, _ = entry
+            receiver.in_flight.remove(entry)
+            receiver.replies_timed_out += 1
+            self.debugLog(
+                f"commandReplyTimedOut: No answer from {receiver.name} to {command} (expected "
+                f"{expected or 'an acknowledgement'})."
+            )
+            if reply is not None and not reply.done():
+                reply.set_exception(TimeoutError(f"{receiver.name} didn't answer {command} in time."))
+            receiver.next_write_time = now + self.getCommandGap(receiver)
+        self.restartReplyTimer(receiver)
+        self.writeQueuedCommands(device_id)
+
+    ########################################
+    def restartReplyTimer(self, receiver):
+        """
+        Point the reply timer at the earliest reply deadline (or stop it if nothing is waiting for an answer).
+
+        :param receiver: ReceiverShadow instance.
+        :return:
+        """
+        self.io_engine.cancel(receiver.reply_timer)
+        receiver.reply_timer = None
+        if receiver.in_flight:
+            deadline = min(entry[1] for entry in receiver.in_flight)
+            receiver.reply_timer = self.io_engine.call_later(
+                deadline - time.monotonic(), self.commandReplyTimedOut, receiver.device_id
+            )
 
-        #
-        # Test for each type of command response.
-        #
+    ########################################
+    def recordUnsupportedQuery(self, receiver, query, response, alone):
+        """
+        Note that a receiver rejected a status query. Once it has been rejected UNSUPPORTED_QUERY_REJECTIONS times in a
+        row while it was the only query waiting for an answer, it's remembered as unsupported so status refreshes stop
+        asking it. The list is kept in the "unsupportedQueries" device property and can be cleared with the Re-probe
+        Supported Queries action.
 
-        #
-        # ERRORS
-        #
+        :param receiver: ReceiverShadow instance.
+        :param query: the rejected query.
+        :param response: the error response (see UNSUPPORTED_QUERY_ERRORS).
+        :param alone: whether it was the only query waiting for an answer.
+        :return:
+        """
+        if query in receiver.unsupported_queries:
+            return
+        # Until then it's written on its own (see writeQueuedCommands), so the next rejection is sure to be its own.
+        rejections = receiver.query_rejections.get(query, 0) + (1 if alone else 0)
+        if rejections < UNSUPPORTED_QUERY_REJECTIONS:
+            receiver.query_rejections[query] = rejections
+            return
+        del receiver.query_rejections[query]
+        receiver.unsupported_queries.add(query)
+        self.receiverLog(
+            receiver.device,
+            f"{query} is not supported ({RECEIVER_ERRORS[response]}) It will be skipped in future status refreshes."
+        )
+        self.stageDeviceProps(receiver.device, {'unsupportedQueries': ",".join(sorted(receiver.unsupported_queries))})
+
+    ########################################
+    def clearCommandQueue(self, receiver):
+        """
+        Forget the commands waiting to be sent to (or answered by) a receiver whose session has ended. Queued callbacks
+        are run, and queries made with queryReceiver fail with ConnectionError.
+
+        :param receiver: ReceiverShadow instance.
+        :return:
+        """
+        self.io_engine.cancel(receiver.reply_timer)
+        receiver.reply_timer = None
+        replies = [entry[2] for entry in receiver.in_flight]
+        receiver.in_flight.clear()
+        while receiver.command_queue:
+            entry = receiver.command_queue.popleft()
+            if isinstance(entry, tuple):
+                replies.append(entry[2])
+            else:
+                entry()
+        for reply in replies:
+            if reply is not None and not reply.done():
+                reply.set_exception(ConnectionError(f"The session with {receiver.name} ended."))
+
+    ########################################
+    @staticmethod
+    def getQueryWindow(receiver):
+        """
+        Most status queries that can be waiting for answers from a receiver at once.
+
+        :param receiver: ReceiverShadow instance.
+        :return:
+        """
+        if receiver.type_id == "vsx1021k":
+            return 1
+        return QUERY_WINDOW
+
+    ########################################
+    @staticmethod
+    def getCommandGap(receiver):
+        """
+        Minimum time (in seconds) between the reply to one command and the next command for a receiver.
+
+        :param receiver: ReceiverShadow instance.
+        :return:
+        """
+        if receiver.type_id != "vsx1021k":
+            return 0.0
+        try:
+            return int(receiver.props.get('commandGap', DEFAULT_COMMAND_GAP)) / 1000.0
+        except ValueError:
+            return DEFAULT_COMMAND_GAP / 1000.0
+
+    #########################################
+    # Read Data from a Receiver Connection
+    #########################################
+    def readData(self, device):
+        """
+        Placeholder - fixme
+
+        :param device:
+        :return:
+        """
+        response_lines = []
+
+        # Get the device connection state and properties. A session that's still waiting for its first answer isn't
+        # "connected" yet, but it does need reading.
+        receiver = self.receivers[device.id]
+        connected = self.getDeviceState(device, 'connected') or receiver.session_state == SESSION_SYNCING
+        connecting = receiver.connecting
+
+        # Only proceed if we're connected.
+        if connected:
+            try:
+                # Read the data (the I/O loop only calls this when some is waiting) and keep only complete lines. A line
+                # that was cut off in the middle stays in the reassembly buffer until the rest of it arrives.
+                framer = receiver.framer
+                dropped_frames = framer.dropped_frames
+                data = receiver.connection.recv(RECEIVE_BUFFER_SIZE)
+                if not data:
+                    raise EOFError
+                response_lines = framer.feed(data)
+                if framer.dropped_frames != dropped_frames:
+                    self.receiverError(
+                        device,
+                        f"{device.name} sent a response longer than {MAX_RESPONSE_LENGTH} characters. It was ignored."
+                    )
+                if response_lines:
+                    self.debugLog(f"readData: {device.name} said: {response_lines}")
+            except (EOFError, ConnectionError):
+                # Connection is closed, try to re-open.
+                self.receiverError(
+                    device, f"Connection to {device.name} lost while trying to receive data. Trying to re-connect."
+                )
+                self.closeSession(receiver)
+                self.updateDeviceState(device, 'status', "disconnected")
+                self.updateDeviceState(device, 'connected', False)
+                self.scheduleReconnect(receiver, 0)
+            except Exception as err:
+                # Unknown error.
+                self.receiverError(device, f"Failed to receive data from {device.name}: {err}")
+                self.closeSession(receiver)
+                self.updateDeviceState(device, 'status', "error")
+                self.updateDeviceState(device, 'connected', False)
+                self.scheduleReconnect(receiver)
+        elif not connected and not connecting:
+            # Show an error and try to connect.
+            self.receiverError(
+                device, f"Unable to read data from {device.name}. It is not connected. Attempting to re-connect."
+            )
+            self.connect(device)
+        elif not connected and connecting:
+            # Show an error indicating that we're still trying to connect.
+            self.receiverError(device, f"Unable to read data from {device.name}. Still trying to connect to it.")
+
+        return response_lines
+
+    #########################################
+    # Process a Command Response
+    #########################################
+    def processResponse(self, device, response):
+        """
+        Placeholder - fixme
+
+        :param device:
+        :param response:
+        :return:
+        """
+        # Update the Indigo receiver device based on the response from the receiver.
+        self.debugLog(f"processResponse: from: {device.name} response: {response}")
+
+        # Look up the handler for this type of response. Each handler returns the state to update (if any), its new
+        # value and the message (if any) to write to the log.
+        handler = find_response_handler(self.response_handlers, response)
+        if handler is not None:
+            state, new_value, result = handler(device, response)
+        else:
+            # Unrecognized response received.
+            self.debugLog(f"Unrecognized response received from {device.name}: {response}")
+            state = "status"
+            new_value = "unknown"
+            result = ""
+
+        get_status_update = False  # Should we perform a full status update?
+
+        # Only update the device if the state is not blank.
+        if state != "":
+            # If this is a zone power state change to True and the current zone power state is False, get more status
+            # information.
+            if (state == "zone1power" and new_value and not self.getDeviceState(device, 'zone1power')) or (
+                    state == "zone2power" and new_value and not self.getDeviceState(device, 'zone2power')):
+                get_status_update = True
+            # A zone turning off clears states that have to be asked for again when it comes back on.
+            elif state == "zone1power" and not new_value and self.getDeviceState(device, 'zone1power'):
+                self.invalidateStateGroups(device, ZONE1_OFF_STALE_GROUPS)
+            elif state == "zone2power" and not new_value and self.getDeviceState(device, 'zone2power'):
+                self.invalidateStateGroups(device, ZONE2_OFF_STALE_GROUPS)
+
+            # Update the state on the server.
+            self.updateDeviceState(device, state, new_value)
 
-        state = "status"
-        new_value = "error"
-        if response == "E02":
-            self.errorLog(device.name + ": not available now.")
-        elif response == "E03":
-            self.errorLog(device.name + ": invalid command.")
-        elif response == "E04":
-            self.errorLog(device.name + ": command error.")
-        elif response == "E06":
-            self.errorLog(device.name + ": parameter error.")
-        elif response == "B00":
-            new_value = "busy"
-            self.errorLog(device.name + ": system busy.")
-        #
-        # General Acknowledgement Response
-        #
-        elif response == "R":
-            self.debugLog(f"processResponse: {device.name}: command acknowledged.")
         #
-        # Zone 1 Specific Items
+        # CHECK IF ADDITIONAL PROCESSING IS NEEDED
         #
-        elif response.startswith("PWR"):
-            # Power (zone 1) status.
+
+        # If this is a zone source input change, request additional information. The audio/video I/O and tuner
+        # information the next refresh would otherwise trust is now out of date.
+        if state in ("zone1source", "zone2source"):
+            self.invalidateStateGroups(device, SOURCE_CHANGE_STALE_GROUPS)
+        if state == "zone1source":
+            # Get the specified input source name (just in case the user changed the input name since the last full
+            # status update).
+            self.sendCommand(device, f"?RGB{response[2:]}")
+            # Audio and video status, once the new signal has settled.
+            self.getAudioInOutStatus(device)
+            # If this is an input change to the Tuner, get the station preset info.
+            if response == "FN02":
+                self.getTunerPresetStatus(device)
+            else:
+                # Since zone 1 is not using the Tuner, as long as zone 2 isn't either, let's clear the Tuner statuses
+                # in the device.
+                if self.getDeviceState(device, 'zone2source') != 2:
+                    self.debugLog("processResponse: Neither zone is using the tuner. Clearing frequency info.")
+                    self.updateDeviceState(device, 'tunerFrequency', 0)
+                    self.updateDeviceState(device, 'tunerFrequencyText', "")
+                    self.updateDeviceState(device, 'tunerPreset', "")
+                    self.updateDeviceState(device, 'tunerBand', "")
+
+        elif state == "zone2source":
+            # Get the specified input source name (just in case the user changed the input name since the last full
+            # status update).
+            self.sendCommand(device, f"?RGB{response[3:]}")
+            # Audio and video status, once the new signal has settled.
+            self.getAudioInOutStatus(device)
+            # If this is an input change to the Tuner, get the band, frequency, and preset info.
+            if response == "Z2F02":
+                self.getTunerPresetStatus(device)
+            else:
+                # Since zone 2 is not using the Tuner, as long as zone 1 isn't either, let's clear the Tuner statuses
+                # in the device.
+                if self.getDeviceState(device, 'zone1source') != 2:
+                    self.debugLog("processResponse: Neither zone is using the tuner. Clearing frequency info.")
+                    self.updateDeviceState(device, 'tunerFrequency', 0)
+                    self.updateDeviceState(device, 'tunerFrequencyText', "")
+                    self.updateDeviceState(device, 'tunerPreset', "")
+                    self.updateDeviceState(device, 'tunerBand', "")
+
+        elif state == "tunerPreset":
+            # Tuner preset was changed. Get the new frequency.
+            self.getTunerFrequency(device)
+
+        # If both zones are off, clear some states that should have no value when the unit is off. Only the states set
+        # since they were last cleared need it, so this costs nothing while the unit sits in standby.
+        if not self.getDeviceState(device, 'zone1power') and not self.getDeviceState(device, 'zone2power'):
+            receiver = self.receivers.get(device.id)
+            dirty = receiver.zones_off_dirty if receiver is not None else set(ZONES_OFF_STATES)
+            for state in sorted(dirty):
+                self.updateDeviceState(device, state, ZONES_OFF_STATES[state])
+            dirty.clear()
+            self.invalidateStateGroups(device, ZONES_OFF_STALE_GROUPS)
+
+        # Now get the additional status info if needed, skipping whatever is still current. Write the changes made so
+        # far first, since the status update takes a while. While the session is still syncing, the power state is
+        # the answer to the sync query, and sessionSynced starts the session's own refresh once it's ready.
+        receiver = self.receivers.get(device.id)
+        if get_status_update and (receiver is None or receiver.session_state == SESSION_READY):
+            self.flushStateBatch()
+            self.getReceiverStatus(device, stale_only=True)
+
+        return result
+
+    #########################################
+    # Response Handlers
+    #
+    #   Called by processResponse through the response dispatch table. Each handler takes the device and the complete
+    #   response line, and returns a (state, new value, log message) tuple. A blank state means there's nothing more
+    #   for processResponse to update.
+    #########################################
+    #
+    # Errors
+    #
+    def handleErrorResponse(self, device, response):
+        """
+        Receiver error (E02, E03, E04, E06) or busy (B00) response.
+
+        :param device:
+        :param response:
+        :return:
+        """
+        receiver = self.receivers.get(device.id)
+        if (response in UNSUPPORTED_QUERY_ERRORS and receiver is not None and receiver.in_flight
+                and receiver.in_flight[0][4]):
+            # The receiver doesn't support the oldest unanswered status query. That's not a fault; commandAnswered
+            # makes a note of it so it isn't asked again.
+            self.debugLog(
+                f"processResponse: {device.name} rejected {receiver.in_flight[0][3]}: {RECEIVER_ERRORS[response]}"
+            )
+            return "", "", ""
+        self.receiverError(device, f"{device.name}: {RECEIVER_ERRORS[response]}")
+        if response == "B00":
+            return "status", "busy", ""
+        return "status", "error", ""
+
+    #
+    # General Acknowledgement
+    #
+    def handleAcknowledgementResponse(self, device, response):
+        """
+        General command acknowledgement (R).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        self.debugLog(f"processResponse: {device.name}: command acknowledged.")
+        return "", "", ""
+
+    #
+    # Enumerated Responses
+    #
+    def handleEnumeratedResponse(self, prefix, device, response):
+        """
+        Response whose value is one of a fixed set of codes, as described in ENUMERATED_RESPONSES.
+
+        :param prefix: the ENUMERATED_RESPONSES key the response matched.
+        :param device:
+        :param response:
+        :return:
+        """
+        state, values, result_format, ignore_unchanged = ENUMERATED_RESPONSES[prefix]
+        new_value = values.get(response)
+        if new_value is None:
+            # Not one of the codes we know about.
+            return "", "", ""
+        # Don't update the state if it's the same.
+        if ignore_unchanged and self.getDeviceState(device, state) == new_value:
+            return "", "", ""
+        if isinstance(new_value, bool):
+            result = result_format.format("on" if new_value else "off")
+        else:
+            result = result_format.format(new_value)
+        return state, new_value, result
+
+    #
+    # Power (Zone 1)
+    #
+    def handleZone1PowerResponse(self, device, response):
+        """
+        Zone 1 power status (PWR).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        state = ""
+        new_value = ""
+        result = ""
+        if response == "PWR0":
+            # Power (zone 1) is on.
             state = "zone1power"
-            if response == "PWR0":
-                # Power (zone 1) is on.
-                new_value = True
-                # Only set a result message if this is a change from the current state.
-                if not device.states['zone1power']:
-                    # Set the result to be logged.
-                    result = "power (zone 1): on"
+            new_value = True
+            # Only set a result message if this is a change from the current state.
+            if not self.getDeviceState(device, 'zone1power'):
+                # Set the result to be logged.
+                result = "power (zone 1): on"
+            # Update the onOffState.
+            self.updateDeviceState(device, 'onOffState', True)
+            # If zone 2 is also on, make sure the status reflects that.
+            if self.getDeviceState(device, 'zone2power'):
+                # Set the "status" state on the server.
+                self.updateDeviceState(device, "status", "on (zones 1+2)")
+            else:
+                self.updateDeviceState(device, "status", "on (zone 1)")
+        elif response in ["PWR1", "PWR2"]:
+            # Power (zone 1) is off (PWR2 is network standby mode, only VSX-1022-K reports this).
+            state = "zone1power"
+            new_value = False
+            if self.getDeviceState(device, 'zone1power'):
+                result = "power (zone 1): off"
+            # If zone 2 is on, make sure the status reflects that.
+            if self.getDeviceState(device, 'zone2power'):
+                self.updateDeviceState(device, "status", "on (zone 2)")
+            else:
+                self.updateDeviceState(device, "status", "off")
                 # Update the onOffState.
-                self.updateDeviceState(device, 'onOffState', True)
-                # If zone 2 is also on, make sure the status reflects that.
-                if device.states['zone2power']:
-                    # Set the "status" state on the server.
-                    self.updateDeviceState(device, "status", "on (zones 1+2)")
-                else:
-                    self.updateDeviceState(device, "status", "on (zone 1)")
-            elif response == "PWR1":
-                # Power (zone 1) is off.
-                new_value = False
-                if device.states['zone1power']:
-                    result = "power (zone 1): off"
-                # If zone 2 is on, make sure the status reflects that.
-                if device.states['zone2power']:
-                    self.updateDeviceState(device, "status", "on (zone 2)")
-                else:
-                    self.updateDeviceState(device, "status", "off")
-                    # Update the onOffState.
-                    self.updateDeviceState(device, 'onOffState', False)
-                # Clear all the state values.
-                #   Set "zone1volume" to -999.0 dB.
-                self.updateDeviceState(device, "zone1volume", -999.0)
-                #   Set "zone1source" to 0 (no source)
-                self.updateDeviceState(device, "zone1source", 0)
-                #   Set "zone1sourceName to (no source)
-                self.updateDeviceState(device, "zone1sourceName", "")
-                #   Set all channel levels to 0.
-                for the_channel, the_name in CHANNEL_VOLUMES.items():
-                    self.updateDeviceState(device, the_name, 0)
-                #   Set MCACC Memory number to 0.
-                self.updateDeviceState(device, "mcaccMemory", 0)
-                #   Clear the MCACC memory name.
-                self.updateDeviceState(device, "mcaccMemoryName", "")
-                # Look for Virtual Volume Controllers that might need setting to zero.
-                for this_id in self.volume_device_list:
-                    virtual_volume_device = indigo.devices[this_id]
-                    control_destination = virtual_volume_device.pluginProps.get('controlDestination', "")
-                    if (int(virtual_volume_device.pluginProps.get('receiverDeviceId', "")) == device.id
-                            and control_destination == "zone1volume"):
-                        self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 0)
-            elif response == "PWR2":
-                # Power (zone 1) is off (network standby mode, only VSX-1022-K reports this).
-                new_value = False
-                if device.states['zone1power']:
-                    result = "power (zone 1): off"
-                # If zone 2 is on, make sure the status reflects that.
-                if device.states['zone2power']:
-                    self.updateDeviceState(device, "status", "on (zone 2)")
-                else:
-                    self.updateDeviceState(device, "status", "off")
-                    # Update the onOffState.
-                    self.updateDeviceState(device, 'onOffState', False)
-                # Clear all the state values.
-                #   Set "zone1volume" to -999.0 dB.
-                self.updateDeviceState(device, "zone1volume", -999.0)
-                #   Set "zone1source" to 0 (no source)
-                self.updateDeviceState(device, "zone1source", 0)
-                #   Set "zone1sourceName to (no source)
-                self.updateDeviceState(device, "zone1sourceName", "")
-                #   Set all channel levels to 0.
-                for the_channel, the_name in CHANNEL_VOLUMES.items():
-                    self.updateDeviceState(device, the_name, 0)
-                #   Set MCACC Memory number to 0.
-                self.updateDeviceState(device, "mcaccMemory", 0)
-                #   Clear the MCACC memory name.
-                self.updateDeviceState(device, "mcaccMemoryName", "")
-                # Look for Virtual Volume Controllers that might need setting to zero.
-                for this_id in self.volume_device_list:
-                    virtual_volume_device = indigo.devices[this_id]
-                    control_destination = virtual_volume_device.pluginProps.get('controlDestination', "")
-                    if (int(virtual_volume_device.pluginProps.get('receiverDeviceId', "")) == device.id
-                            and control_destination == "zone1volume"):
-                        self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 0)
-        elif response.startswith("MUT"):
-            # Mute (zone 1) status.
+                self.updateDeviceState(device, 'onOffState', False)
+            # Clear all the state values.
+            #   Set "zone1volume" to -999.0 dB.
+            self.updateDeviceState(device, "zone1volume", -999.0)
+            #   Set "zone1source" to 0 (no source)
+            self.updateDeviceState(device, "zone1source", 0)
+            #   Set "zone1sourceName to (no source)
+            self.updateDeviceState(device, "zone1sourceName", "")
+            #   Set all channel levels to 0.
+            for the_channel, the_name in CHANNEL_VOLUMES.items():
+                self.updateDeviceState(device, the_name, 0)
+            #   Set MCACC Memory number to 0.
+            self.updateDeviceState(device, "mcaccMemory", 0)
+            #   Clear the MCACC memory name.
+            self.updateDeviceState(device, "mcaccMemoryName", "")
+            # Look for Virtual Volume Controllers that might need setting to zero.
+            for virtual_volume_device in self.getVolumeDevices(device, "zone1volume"):
+                self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 0)
+        return state, new_value, result
+
+    #
+    # Mute (Zone 1)
+    #
+    def handleZone1MuteResponse(self, device, response):
+        """
+        Zone 1 mute status (MUT).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        state = ""
+        new_value = ""
+        result = ""
+        if response == "MUT0":
+            # Mute is on.
+            state = "zone1mute"
+            new_value = True
+            self.stopVolumeFade(device, 1, "zone 1 was muted")
+            if not self.getDeviceState(device, 'zone1mute'):
+                result = "mute (zone 1): on"
+            # Look for Virtual Volume Controllers that might need updating.
+            for virtual_volume_device in self.getVolumeDevices(device, "zone1volume"):
+                self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 0)
+        elif response == "MUT1":
+            # Mute is off.
             state = "zone1mute"
-            if response == "MUT0":
+            new_value = False
+            if self.getDeviceState(device, 'zone1mute'):
+                result = "mute (zone 1): off"
+            # Look for Virtual Volume Controllers that might need updating.
+            for virtual_volume_device in self.getVolumeDevices(device, "zone1volume"):
+                # Update the Virtual Volume Controller to match current volume. Get the receiver's volume.
+                the_volume = float(self.getDeviceState(device, "zone1volume"))
+                # Convert the current volume of the receiver to a percentage to be displayed as a brightness
+                # level. If the volume is less than -80.5, the receiver is off and the brightness should be 0.
+                if float(the_volume) < -80.5:
+                    the_volume = -80.5
+                the_volume = int(100 - round(the_volume / -80.5 * 100, 0))
+                self.updateDeviceState(virtual_volume_device, 'brightnessLevel', the_volume)
+        return state, new_value, result
+
+    #
+    # Input Source (Zone 1)
+    #
+    def handleZone1SourceResponse(self, device, response):
+        """
+        Zone 1 input source (FN).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = int(response[2:])
+        # Check to see if zone 1 is already set to this input or if zone 1 power is off.  In either case, ignore this
+        # update.
+        if self.getDeviceState(device, 'zone1source') == new_value or not self.getDeviceState(device, 'zone1power'):
+            return "", "", ""
+        return "zone1source", new_value, ""
+
+    #
+    # Volume (Zone 1)
+    #
+    def handleZone1VolumeResponse(self, device, response):
+        """
+        Zone 1 volume (VOL).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        # A volume change the current fade didn't make stops it.
+        self.checkVolumeFade(device, 1, int(response[3:]))
+        # Convert to dB.
+        new_value = float(response[3:]) * 1.0
+        new_value = -80.5 + 0.5 * new_value
+        # Volume is at minimum or zone 1 power is off, volume is meaningless, so set it to minimum.
+        if (new_value < -80.0) or (not self.getDeviceState(device, 'zone1power')):
+            new_value = -999.0
+            result = "volume (zone 1): minimum."
+        else:
+            result = f"volume (zone 1): {new_value} dB"
+        # Update the Virtual Volume Controllers connected to zone 1 volume to match the new volume.
+        for virtual_volume_device in self.getVolumeDevices(device, "zone1volume"):
+            the_volume = new_value
+            # Convert the current volume of the receiver to a percentage to be displayed as a brightness level.
+            # If the volume is less than -80.5, the receiver is off and the brightness should be 0.
+            if the_volume < -80.0:
+                the_volume = -80.5
+            the_volume = int(100 - round(the_volume / -80.5 * 100, 0))
+            self.debugLog(
+                f"processResponse: updating Virtual Volume Device ID {virtual_volume_device.id} brightness level to "
+                f"{the_volume}."
+            )
+            self.updateDeviceState(virtual_volume_device, 'brightnessLevel', the_volume)
+        return "zone1volume", new_value, result
+
+    #
+    # Power (Zone 2)
+    #
+    def handleZone2PowerResponse(self, device, response):
+        """
+        Zone 2 power status (APR).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        state = ""
+        new_value = ""
+        result = ""
+        if response == "APR0":
+            # Power (zone 2) is on.
+            state = "zone2power"
+            new_value = True
+            if not self.getDeviceState(device, 'zone2power'):
+                result = "power (zone 2): on"
+            # Update the onOffState.
+            self.updateDeviceState(device, 'onOffState', True)
+            # If main power (zone 1) is on, set the status to reflect that.
+            if self.getDeviceState(device, 'zone1power'):
+                self.updateDeviceState(device, "status", "on (zones 1+2)")
+            else:
+                self.updateDeviceState(device, "status", "on (zone 2)")
+        elif response == "APR1":
+            # Power (zone 2) is off.
+            state = "zone2power"
+            new_value = False
+            if self.getDeviceState(device, 'zone2power'):
+                result = "power (zone 2): off"
+            # If main power (zone 1) is on, make sure the status reflects that.
+            if self.getDeviceState(device, 'zone1power'):
+                self.updateDeviceState(device, "status", "on (zone 1)")
+            else:
+                self.updateDeviceState(device, "status", "off")
+                # Update the onOffState.
+                self.updateDeviceState(device, 'onOffState', False)
+            # Clear all the state values.
+            #   Set "zone1volume" to -999 dB.
+            self.updateDeviceState(device, "zone2volume", -999)
+            #   Set "zone1source" to 0 (no source)
+            self.updateDeviceState(device, "zone2source", 0)
+            #   Set "zone1sourceName to (no source)
+            self.updateDeviceState(device, "zone2sourceName", "")
+            # Clear the tuner settings if zone 1 isn't using it.
+            if self.getDeviceState(device, 'zone1source') != 2:
+                self.updateDeviceState(device, 'tunerPreset', "")
+                self.updateDeviceState(device, 'tunerFrequency', 0)
+                self.updateDeviceState(device, 'tunerFrequencyText', "")
+                self.updateDeviceState(device, 'tunerBand', "")
+            # Look for Virtual Volume Controllers that might need setting to zero.
+            for virtual_volume_device in self.getVolumeDevices(device, "zone2volume"):
+                self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 0)
+        return state, new_value, result
+
+    #
+    # Input Source (Zone 2)
+    #
+    def handleZone2SourceResponse(self, device, response):
+        """
+        Zone 2 input source (Z2F).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = int(response[3:])
+        # Check to see if zone 2 is already set to this input or if zone 2 power is off.  If either is the case, ignore
+        # this update.
+        if self.getDeviceState(device, 'zone2source') == new_value or not self.getDeviceState(device, 'zone2power'):
+            return "", "", ""
+        return "zone2source", new_value, ""
+
+    #
+    # Mute (Zone 2)
+    #
+    def handleZone2MuteResponse(self, device, response):
+        """
+        Zone 2 mute status (Z2MUT).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        state = "zone2mute"
+        new_value = ""
+        result = ""
+        # If the speaker system arrangement is not set to A + Zone 2, zone mute and volume settings returned by the
+        # receiver are meaningless. Set the state on the server to properly reflect this.
+        if self.getDeviceState(device, 'speakerSystem') == "A + Zone 2":
+            if response == "Z2MUT0":
                 # Mute is on.
                 new_value = True
-                if not device.states['zone1mute']:
-                    result = "mute (zone 1): on"
+                self.stopVolumeFade(device, 2, "zone 2 was muted")
+                result = "mute (zone 2): on"
                 # Look for Virtual Volume Controllers that might need updating.
-                for this_id in self.volume_device_list:
-                    virtual_volume_device = indigo.devices[this_id]
-                    control_destination = virtual_volume_device.pluginProps.get('controlDestination', "")
-                    if (int(virtual_volume_device.pluginProps.get('receiverDeviceId', "")) == device.id
-                            and control_destination == "zone1volume"):
-                        self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 0)
-            elif response == "MUT1":
+                for virtual_volume_device in self.getVolumeDevices(device, "zone2volume"):
+                    self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 0)
+            elif response == "Z2MUT1":
                 # Mute is off.
                 new_value = False
-                if device.states['zone1mute']:
-                    result = "mute (zone 1): off"
+                result = "mute (zone 2): off"
                 # Look for Virtual Volume Controllers that might need updating.
-                for this_id in self.volume_device_list:
-                    virtual_volume_device = indigo.devices[this_id]
-                    control_destination = virtual_volume_device.pluginProps.get('controlDestination', "")
-                    if (int(virtual_volume_device.pluginProps.get('receiverDeviceId', "")) == device.id
-                            and control_destination == "zone1volume"):
-                        # Update the Virtual Volume Controller to match current volume. Get the receiver's volume.
-                        the_volume = float(device.states[control_destination])
-                        # Convert the current volume of the receiver to a percentage to be displayed as a brightness
-                        # level. If the volume is less than -80.5, the receiver is off and the brightness should be 0.
-                        if float(the_volume) < -80.5:
-                            the_volume = -80.5
-                        the_volume = int(100 - round(the_volume / -80.5 * 100, 0))
-                        self.updateDeviceState(virtual_volume_device, 'brightnessLevel', the_volume)
-        elif response.startswith("FN"):
-            # Source/function (zone 1) status.
-            state = "zone1source"
-            new_value = int(response[2:])
-            # Check to see if zone 1 is already set to this input or if zone 1 power is off.  In either case, ignore
-            # this update.
-            if device.states[state] == new_value or not device.states['zone1power']:
-                state = ""
-                new_value = ""
-        elif response.startswith("VOL"):
-            # Volume (zone 1) status.
-            state = "zone1volume"
-            # Convert to dB.
-            new_value = float(response[3:]) * 1.0
-            new_value = -80.5 + 0.5 * new_value
-            # Volume is at minimum or zone 1 power is off, volume is meaningless, so set it to minimum.
-            if (new_value < -80.0) or (not device.states['zone1power']):
-                new_value = -999.0
-                result = "volume (zone 1): minimum."
-            else:
-                result = f"volume (zone 1): {new_value} dB"
-            # Look for Virtual Volume Controllers that might need updating.
-            self.debugLog(
-                f"processResponse: Looking for connected Virtual Volume Controllers. volumeDeviceList: "
-                f"{self.volume_device_list}"
-            )
-            for this_id in self.volume_device_list:
-                virtual_volume_device = indigo.devices[this_id]
-                self.debugLog(f"processResponse: Examining Virtual Volume Controller ID {this_id}")
-                self.debugLog(f"processResponse: {virtual_volume_device}")
-                control_destination = virtual_volume_device.pluginProps.get('controlDestination', "")
-                if int(virtual_volume_device.pluginProps.get('receiverDeviceId', "")) == device.id \
-                        and control_destination == "zone1volume":
-                    self.debugLog(f"processResponse: Virtual Volume Controller ID {this_id} is connected.")
-                    # Update the Virtual Volume Controller to match new volume.
-                    the_volume = new_value
-                    # Convert the current volume of the receiver to a percentage to be displayed as a brightness level.
-                    # If the volume is less than -80.5, the receiver is off and the brightness should be 0.
-                    if the_volume < -80.0:
-                        the_volume = -80.5
-                    the_volume = int(100 - round(the_volume / -80.5 * 100, 0))
-                    self.debugLog(
-                        f"processResponse: updating Virtual Volume Device ID {this_id} brightness level to "
-                        f"{the_volume}."
-                    )
+                for virtual_volume_device in self.getVolumeDevices(device, "zone2volume"):
+                    # Update the Virtual Volume Controller to match current volume. Get the receiver's volume.
+                    the_volume = float(self.getDeviceState(device, "zone2volume"))
+                    # Convert the current volume of the receiver to a percentage to be displayed as a
+                    # brightness level. If the volume is less than -80.5, the receiver is off and the
+                    # brightness should be 0.
+                    if float(the_volume) < -81:
+                        the_volume = -81
+                    the_volume = int(100 - round(the_volume / -81 * 100, 0))
                     self.updateDeviceState(virtual_volume_device, 'brightnessLevel', the_volume)
-        #
-        # Zone 2 Specific Items
-        #
-        elif response.startswith("APR"):
-            # Power (zone 2) status.
-            state = "zone2power"
-            if response == "APR0":
-                # Power (zone 2) is on.
-                new_value = True
-                if not device.states['zone2power']:
-                    result = "power (zone 2): on"
-                # Update the onOffState.
-                self.updateDeviceState(device, 'onOffState', True)
-                # If main power (zone 1) is on, set the status to reflect that.
-                if device.states['zone1power']:
-                    self.updateDeviceState(device, "status", "on (zones 1+2)")
-                else:
-                    self.updateDeviceState(device, "status", "on (zone 2)")
-            elif response == "APR1":
-                # Power (zone 2) is off.
-                new_value = False
-                if device.states['zone2power']:
-                    result = "power (zone 2): off"
-                # If main power (zone 1) is on, make sure the status reflects that.
-                if device.states['zone1power']:
-                    self.updateDeviceState(device, "status", "on (zone 1)")
-                else:
-                    self.updateDeviceState(device, "status", "off")
-                    # Update the onOffState.
-                    self.updateDeviceState(device, 'onOffState', False)
-                # Clear all the state values.
-                #   Set "zone1volume" to -999 dB.
-                self.updateDeviceState(device, "zone2volume", -999)
-                #   Set "zone1source" to 0 (no source)
-                self.updateDeviceState(device, "zone2source", 0)
-                #   Set "zone1sourceName to (no source)
-                self.updateDeviceState(device, "zone2sourceName", "")
-                # Clear the tuner settings if zone 1 isn't using it.
-                if device.states['zone1source'] != 2:
-                    self.updateDeviceState(device, 'tunerPreset', "")
-                    self.updateDeviceState(device, 'tunerFrequency', 0)
-                    self.updateDeviceState(device, 'tunerFrequencyText', "")
-                    self.updateDeviceState(device, 'tunerBand', "")
-                # Look for Virtual Volume Controllers that might need setting to zero.
-                for this_id in self.volume_device_list:
-                    virtual_volume_device = indigo.devices[this_id]
-                    control_destination = virtual_volume_device.pluginProps.get('controlDestination', "")
-                    if (int(virtual_volume_device.pluginProps.get('receiverDeviceId', "")) == device.id
-                            and control_destination == "zone2volume"):
-                        self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 0)
-        elif response.startswith("Z2F"):
-            # Source/function (zone 2) status.
-            state = "zone2source"
-            new_value = int(response[3:])
-            # Check to see if zone 2 is already set to this input or if zone 2 power is off.  If either is the case,
-            # ignore this update.
-            if device.states[state] == new_value or not device.states['zone2power']:
-                state = ""
-                new_value = ""
-        elif response.startswith("Z2MUT"):
-            # Mute (zone 2) status.
-            state = "zone2mute"
-            # If the speaker system arrangement is not set to A + Zone 2, zone mute and volume settings returned by
-            # the receiver are meaningless. Set the state on the server to properly reflect this.
-            if device.states['speakerSystem'] == "A + Zone 2":
-                if response == "Z2MUT0":
-                    # Mute is on.
-                    new_value = True
-                    result = "mute (zone 2): on"
-                    # Look for Virtual Volume Controllers that might need updating.
-                    for this_id in self.volume_device_list:
-                        virtual_volume_device = indigo.devices[this_id]
-                        control_destination = virtual_volume_device.pluginProps.get('controlDestination', "")
-                        if (int(virtual_volume_device.pluginProps.get('receiverDeviceId', "")) == device.id
-                                and control_destination == "zone2volume"):
-                            self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 0)
-                elif response == "Z2MUT1":
-                    # Mute is off.
-                    new_value = False
-                    result = "mute (zone 2): off"
-                    # Look for Virtual Volume Controllers that might need updating.
-                    for this_id in self.volume_device_list:
-                        virtual_volume_device = indigo.devices[this_id]
-                        control_destination = virtual_volume_device.pluginProps.get('controlDestination', "")
-                        if (int(virtual_volume_device.pluginProps.get('receiverDeviceId', "")) == device.id
-                                and control_destination == "zone2volume"):
-                            # Update the Virtual Volume Controller to match current volume. Get the receiver's volume.
-                            the_volume = float(device.states[control_destination])
-                            # Convert the current volume of the receiver to a percentage to be displayed as a
-                            # brightness level. If the volume is less than -80.5, the receiver is off and the
-                            # brightness should be 0.
-                            if float(the_volume) < -81:
-                                the_volume = -81
-                            the_volume = int(100 - round(the_volume / -81 * 100, 0))
-                            self.updateDeviceState(virtual_volume_device, 'brightnessLevel', the_volume)
             else:
-                new_value = False
-                result = ""
-                # Zone 2 mute is meaningless when using the RCA line outputs, so look for Virtual Volume Controllers
-                # that might need updating. If zone 2 power is on, the zone 2 line output will always be at 100% volume.
-                if device.states['zone2power']:
-                    for this_id in self.volume_device_list:
-                        virtual_volume_device = indigo.devices[this_id]
-                        control_destination = virtual_volume_device.pluginProps.get('controlDestination', "")
-                        if (int(virtual_volume_device.pluginProps.get('receiverDeviceId', "")) == device.id
-                                and control_destination == "zone2volume"):
-                            self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 100)
-                else:
-                    # If zone 2 power is off, the zone 2 line output will always be at 0% volume.
-                    for this_id in self.volume_device_list:
-                        virtual_volume_device = indigo.devices[this_id]
-                        control_destination = virtual_volume_device.pluginProps.get('controlDestination', "")
-                        if (int(virtual_volume_device.pluginProps.get('receiverDeviceId', "")) == device.id
-                                and control_destination == "zone2volume"):
-                            self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 0)
-        elif response.startswith("ZV"):
-            # Volume (zone 2) status.
-            state = "zone2volume"
-            # Convert to dB.
-            new_value = int(response[2:])
-            # new_value = -81 + new_value
-            new_value += -81
-            if new_value < -80 or not device.states['zone2power']:
-                new_value = -999
-                result = "volume (zone 2): minimum."
+                state = ""
+        else:
+            new_value = False
+            # Zone 2 mute is meaningless when using the RCA line outputs, so look for Virtual Volume Controllers that
+            # might need updating. If zone 2 power is on, the zone 2 line output will always be at 100% volume.
+            if self.getDeviceState(device, 'zone2power'):
+                for virtual_volume_device in self.getVolumeDevices(device, "zone2volume"):
+                    self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 100)
             else:
-                result = f"volume (zone 2): {new_value} dB"
-            # If the speaker system arrangement is not set to A + Zone 2, zone mute and volume settings returned by the
-            # receiver are meaningless. Set the state on the server to properly reflect this.
-            if device.states['speakerSystem'] == "A + Zone 2":
-                # Look for Virtual Volume Controllers that might need updating.
+                # If zone 2 power is off, the zone 2 line output will always be at 0% volume.
+                for virtual_volume_device in self.getVolumeDevices(device, "zone2volume"):
+                    self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 0)
+        return state, new_value, result
+
+    #
+    # Volume (Zone 2)
+    #
+    def handleZone2VolumeResponse(self, device, response):
+        """
+        Zone 2 volume (ZV).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        # A volume change the current fade didn't make stops it.
+        self.checkVolumeFade(device, 2, int(response[2:]))
+        # Convert to dB.
+        new_value = int(response[2:])
+        new_value += -81
+        if new_value < -80 or not self.getDeviceState(device, 'zone2power'):
+            new_value = -999
+            result = "volume (zone 2): minimum."
+        else:
+            result = f"volume (zone 2): {new_value} dB"
+        # If the speaker system arrangement is not set to A + Zone 2, zone mute and volume settings returned by the
+        # receiver are meaningless. Set the state on the server to properly reflect this.
+        if self.getDeviceState(device, 'speakerSystem') == "A + Zone 2":
+            # Update the Virtual Volume Controllers connected to zone 2 volume to match the new volume.
+            for virtual_volume_device in self.getVolumeDevices(device, "zone2volume"):
+                the_volume = new_value
+                # Convert the current volume of the receiver to a percentage to be displayed as a brightness
+                # level. If the volume is less than -81, the receiver is off and the brightness should be 0.
+                if the_volume < -81:
+                    the_volume = -81
+                the_volume = 100 - int(round(the_volume / -81.0 * 100, 0))
+                # If zone 2 power is on, use theVolume. If not, use zero.
+                if not self.getDeviceState(device, 'zone2power'):
+                    the_volume = 0
                 self.debugLog(
-                    f"processResponse: Looking for zone 2 connected Virtual Volume Controllers. volumeDeviceList: "
-                    f"{self.volume_device_list}"
+                    f"processResponse: updating Virtual Volume Device ID {virtual_volume_device.id} brightness "
+                    f"level to {the_volume}"
                 )
-                for this_id in self.volume_device_list:
-                    virtual_volume_device = indigo.devices[this_id]
-                    self.debugLog(f"processResponse: Examining Virtual Volume Controller ID {this_id}")
-                    self.debugLog(f"processResponse: {virtual_volume_device}")
-                    control_destination = virtual_volume_device.pluginProps.get('controlDestination', "")
-                    if (int(virtual_volume_device.pluginProps.get('receiverDeviceId', "")) == device.id
-                            and control_destination == "zone2volume"):
-                        self.debugLog(
-                            f"processResponse: Virtual Volume Controller ID {this_id} is connected to zone 2 volume."
-                        )
-                        # Update the Virtual Volume Controller to match current volume. Get the receiver's volume.
-                        the_volume = new_value
-                        # Convert the current volume of the receiver to a percentage to be displayed as a brightness
-                        # level. If the volume is less than -81, the receiver is off and the brightness should be 0.
-                        if the_volume < -81:
-                            the_volume = -81
-                        the_volume = 100 - int(round(the_volume / -81.0 * 100, 0))
-                        # If zone 2 power is on, use theVolume. If not, use zero.
-                        if device.states['zone2power']:
-                            self.debugLog(
-                                f"processResponse: updating Virtual Volume Device ID {this_id} brightness level to "
-                                f"{the_volume}"
-                            )
-                            self.updateDeviceState(virtual_volume_device, 'brightnessLevel', the_volume)
-                        else:
-                            self.debugLog(
-                                f"processResponse: updating Virtual Volume Device ID {this_id} brightness level to 0"
-                            )
-                            self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 0)
-            else:
-                new_value = 0
-                result = ""
-                # Zone 2 volume is meaningless when using the RCA line outputs, so look for Virtual Volume Controllers
-                # that might need updating. If zone 2 power is on, the zone 2 line output will always be at 100% volume.
-                if device.states['zone2power']:
-                    for this_id in self.volume_device_list:
-                        virtual_volume_device = indigo.devices[this_id]
-                        control_destination = virtual_volume_device.pluginProps.get('controlDestination', "")
-                        if (int(virtual_volume_device.pluginProps.get('receiverDeviceId', "")) == device.id
-                                and control_destination == "zone2volume"):
-                            self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 100)
-                else:
-                    # If zone 2 power is off, the zone 2 line output will always be at 0% volume.
-                    for this_id in self.volume_device_list:
-                        virtual_volume_device = indigo.devices[this_id]
-                        control_destination = virtual_volume_device.pluginProps.get('controlDestination', "")
-                        if (int(virtual_volume_device.pluginProps.get('receiverDeviceId', "")) == device.id
-                                and control_destination == "zone2volume"):
-                            self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 0)
-        #
-        # System-Wide Items
-        #
-        elif response.startswith("RGB"):
-            # Source name update.
-            new_value = response[6:]
-            # Define the device property to update and make the change to the local copy.
-            prop_name = f"source{response[3:5]}label"
-            dev_props[prop_name] = new_value
-            # Update the source name in the device properties on the server.
-            self.updateDeviceProps(device, dev_props)
-            # If the input source name update is for the currently selected zone 1 input source or zone 2 input source,
-            # change the appropriate state in the device.
-            if device.states['zone1source'] == int(response[3:5]):
-                state = "zone1sourceName"
-                result = f"input source (zone 1): {new_value}"
-                self.updateDeviceState(device, state, new_value)
-            if device.states['zone2source'] == int(response[3:5]):
-                state = "zone2sourceName"
-                result = f"input source (zone 2): {new_value}"
-                self.updateDeviceState(device, state, new_value)
-        elif response.startswith("FL"):
-            # Display update.
-            state = "display"
-            new_value = ""
-            # All characters after character 4 are ASCII representations of HEX numbers that represent ASCII characters
-            # (!?)
-            the_string = response[4:]
-            index = 0
-            while index < 28:
-                # Convert the 2-character HEX representations to actual ASCII values.
-                #   -- Add "0x" to the front of the 2-character representation to indicate that it should be a HEX
-                #      number.
-                #   -- Use the "int" builtin to convert from ASCII base 16 to an integer.
-                ascii_val = int(f"0x{the_string[index:index + 2]}", 16)
-                # Check for special characters.
-                if ascii_val < 32 or ascii_val > 126:
-                    # Add the special character to the new_value string from the character map dictionary defined at the
-                    # top.
-                    new_value += CHARACTER_MAP[ascii_val]
-                else:
-                    # Use the "chr" builtin to convert from integer to an ASCII character then add that to the existing
-                    # new_value string.
-                    # new_value += unicode(str(chr(asciiVal)))
-                    new_value += f"{chr(ascii_val)}"
-                # Increment the index by 2
-                index += 2
-        elif response.startswith("MC"):
-            # MCACC Memory update.
-            state = "mcaccMemory"
-            new_value = int(response[2:])
-            prop_name = f'mcaccMemory{new_value}label'
-            mcacc_name = dev_props.get(prop_name, "")
-            result = f"MCACC memory: {new_value}: {mcacc_name}"
-        elif response.startswith("IS"):
-            # Phase Control update.
-            state = "phaseControl"
-            if response == "IS0":
-                # Phase Control Off.
-                new_value = "off"
-            elif response == "IS1":
-                # Phase Control On.
-                new_value = "on"
-            elif response == "IS2":
-                # Full Band Phase Control On.
-                new_value = "on - full band"
-            result = f"Phase Control: {new_value}"
-        elif response.startswith("VSP"):
-            # Virtual Speakers.
-            state = "vsp"
-            if response == "VSP0":
-                # Virtual Speakers Auto.
-                new_value = "auto"
-                result = "Virtual Speakers: auto"
-            elif response == "VSP1":
-                # Virtual Speakers Manual.
-                new_value = "manual"
-                result = "Virtual Speakers: manual"
-        elif response.startswith("VSB"):
-            # Virtual Surround Back update.
-            state = "vsb"
-            if response == "VSB0":
-                # Virtual Surround Back Off.
-                new_value = False
-                result = "Virtual Surround Back: off"
-            elif response == "VSB1":
-                # Virtual Surround Back On.
-                new_value = True
-                result = "Virtual Surround Back: on"
-        elif response.startswith("VHT"):
-            # Virtual Surround Height update.
-            state = "vht"
-            if response == "VHT0":
-                # Virtual Surround Height Off.
-                new_value = False
-                result = "Virtual Surround Height: off"
-            elif response == "VSB1":
-                # Virtual Surround Height On.
-                new_value = True
-                result = "Virtual Surround Height: on"
-        elif response.startswith("CLV"):
-            # Channel Volume Level update.
-            channel = response[3:6]
-            # Get the state name from the global dictionary defined at the top.
-            state = CHANNEL_VOLUMES[channel]
-            level = float(response[6:]) * 1.0
-            # convert the level to decibels.
-            new_value = -12 + 0.5 * (level - 26.0)
-            result = f"{channel.strip('_')} channel level: {new_value} dB."
-        elif response.startswith("SPK"):
-            # Speaker mode update.
-            state = "speakers"
-            if response == "SPK0":
-                # Speakers off.
-                new_value = "off"
-            elif response == "SPK1":
-                # Speaker group A on.
-                new_value = "on - A"
-            elif response == "SPK2":
-                # Speaker group B on.
-                new_value = "on - B"
-            elif response == "SPK3":
-                # Both speaker groups A and B on.
-                new_value = "on - A+B"
-            result = f"speaker mode: {new_value}"
-        elif response.startswith("HA"):
-            # HDMI Audio Pass-through update.
-            state = "hdmiAudio"
-            if response == "HA0":
-                # HDMI Audio processed by amp.
-                new_value = False
-                result = "HDMI Audio Pass-Through: off"
-            elif response == "HA1":
-                # HDMI Audio passed through unaltered.
-                new_value = True
-                result = "HDMI Audio Pass-Through: on"
-        elif response.startswith("PQ"):
-            # PQLS status update.
-            state = "pqls"
-            if response == "PQ0":
-                # PQLS off.
-                new_value = False
-                result = "PQLS: off"
-            elif response == "PQ1":
-                # PQLS auto.
-                new_value = True
-                result = "PQLS: on"
-        elif response.startswith("SSA"):
-            # Operating Mode.
-            state = "operatingMode"
-            if response == "SSA0":
-                # Expert Mode.
-                new_value = "Expert"
-            elif response == "SSA1":
-                # reserved mode.
-                new_value = "(factory reserved)"
-            elif response == "SSA2":
-                # Basic Mode.
-                new_value = "Basic"
-            result = f"operating mode: {new_value}"
-        elif response.startswith("SSE"):
-            # OSD Language setting.
-            if response == "SSE00":
-                new_value = "English"
-            else:
-                new_value = "non-English"
-            # Define the device property to update and make the change to the local copy.
-            prop_name = 'osdLanguage'
-            dev_props[prop_name] = new_value
-            # Update the source name in the device properties on the server.
-            self.updateDeviceProps(device, dev_props)
-        elif response.startswith("SSF"):
-            # Speaker System status.
-            state = "speakerSystem"
-            if response == "SSF00":
-                new_value = "A + Surround Height"
-            if response == "SSF01":
-                new_value = "A + Surround Width"
-            if response == "SSF02":
-                new_value = "A Bi-Amped"
-            if response == "SSF03":
-                new_value = "A + B 2-Channel"
-            if response == "SSF04":
-                new_value = "A + Zone 2"
-            result = f"speaker system layout: {new_value}"
-        elif response.startswith("SAA"):
-            # Dimmer Brightness change.
-            if response == "SAA0":
-                new_value = "bright"
-            elif response == "SAA1":
-                new_value = "medium"
-            elif response == "SAA2":
-                new_value = "dim"
-            elif response == "SAA3":
-                new_value = "off"
-        elif response.startswith("SAB"):
-            # Sleep Timer time remaining.
-            state = "sleepTime"
-            new_value = int(response[3:])
-            if new_value == 0:
-                # Sleep timer is off
-                self.updateDeviceState(device, "sleepMode", False)
-                result = "sleep timer: off"
-            else:
-                # Sleep timer is on
-                self.updateDeviceState(device, "sleepMode", True)
-                result = f"sleep timer: {new_value} minutes remaining."
-        elif response.startswith("PKL"):
-            # Panel Key Lock status.
-            state = "panelKeyLockMode"
-            if response == "PKL0":
-                # Unlocked.
-                new_value = "off"
-            elif response == "PKL1":
-                # Panel locked.
-                new_value = "on - panel"
-            elif response == "PKL2":
-                # Panel and volume locked.
-                new_value = "on - panel+volume"
-            result = f"front panel lock: {new_value}"
-        elif response.startswith("RML"):
-            # Remote Lock Mode status.
-            state = "remoteLock"
-            if response == "RML0":
-                new_value = False
-                result = "remote control lock: off"
-            elif response == "RML1":
-                new_value = True
-                result = "remote control lock: on"
-        elif response.startswith("FR"):
-            # Tuner Frequency update. Only update the state if either zone 1 or 2 is actually using the Tuner.
-            if device.states['zone1source'] == 2 or device.states['zone2source'] == 2:
-                state = "tunerFrequency"
-                # Extract the band (AM or FM)
-                band = response[2:3] + "M"
-                # Set the tuner band on the server.
-                self.updateDeviceState(device, "tunerBand", str(band))
-                # Extract the frequency.
-                frequency = response[3:]
-                frequency_text = frequency
-                if band == "FM":
-                    # If the band is FM, put the decimal in the right place.
-                    frequency_text = f"{frequency[0:3]}.{frequency[3:]} MHz"
-                    frequency_text = frequency_text.lstrip("0")  # Eliminate leading zeros.
-                    frequency = float(f"{frequency[0:3]}.{frequency[3:]}")
-                elif band == "AM":
-                    # If the band is AM, convert the text to an integer.
-                    frequency = int(frequency)  # Eliminates leading zeros.
-                    frequency_text = f"{frequency} kHz"
-                # Only log the change if the frequency is actually different.
-                if frequency != device.states['tunerFrequency'] or band != device.states['tunerBand']:
-                    result = f"tuner frequency: {frequency_text} {band}"
-                # Set the tuner frequency on the server
-                new_value = frequency
-        elif response.startswith("PR"):
-            # Tuner Preset update. Only update the state if either zone 1 or 2 is actually using the Tuner.
-            if device.states['zone1source'] == 2 or device.states['zone2source'] == 2:
-                state = "tunerPreset"
-                # Get the preset letter plus the non-leading-zero number.
-                new_value = response[2:3] + str(int(response[3:]))
-                # Now add the custom name (if set) for the preset.
-                prop_name = f"tunerPreset{new_value}label"
-                new_value += f": {device.pluginProps[prop_name]}"
-                # Ignore this information if the state is already set to this setting.
-                if device.states[state] == new_value:
-                    state = ""
-                    new_value = ""
-                else:
-                    result = f"tuner preset: {new_value}"
-        elif response.startswith("TQ"):
-            # Tuner Preset Label update.
-            new_value = response[4:]  # Strip off the "TQ"
-            new_value = new_value.strip('"')  # Remove the enclosing quotes.
-            new_value = new_value.strip()  # Remove the white space.
-            # Define the device property to update and make the change to the local copy.
-            prop_name = f"tunerPreset{response[2:4]}label"
-            dev_props[prop_name] = new_value
-            # Update the source name in the device properties on the server.
-            self.updateDeviceProps(device, dev_props)
-        elif response.startswith("SR"):
-            # Listening Mode update.
-            state = "listeningMode"
-            new_value = LISTENING_MODES[response[2:]]
-            # Ignore this information if the state is already set to this setting.
-            if device.states[state] == new_value:
-                state = ""
-                new_value = ""
-            else:
-                result = f"listening mode: {new_value}"
-        elif response.startswith("LM"):
-            # Playback Listening Mode update.
-            state = "displayListeningMode"
-            new_value = DISPLAY_LISTENING_MODES[response[2:]]
-            # Ignore this information if the state is already set to this setting.
-            if device.states[state] == new_value:
-                state = ""
-                new_value = ""
-            else:
-                result = f"displayed listening mode: {new_value}"
-        elif response.startswith("TO"):
-            # Tone Control on/off change.
-            state = "toneControl"
-            if response == "TO0":
-                new_value = False
-                result = "tone control: off"
-            elif response == "TO1":
-                new_value = True
-                result = "tone control: on"
-        elif response.startswith("BA"):
-            # Bass Tone Control change.
-            state = "toneBass"
-            new_value = (6 - int(response[2:]))
-            result = f"bass tone level: {new_value} dB"
-        elif response.startswith("TR"):
-            # Treble Tone Control change.
-            state = "toneTreble"
-            new_value = (6 - int(response[2:]))
-            result = f"bass tone level: {new_value} dB"
-        elif response.startswith("ATA"):
-            # Sound Retriever status change.
-            state = "soundRetriever"
-            if response == "ATA0":
-                new_value = False
-                result = "Sound Retriever: off"
-            elif response == "ATA1":
-                new_value = True
-                result = "Sound Retriever: on"
-        elif response.startswith("SDA"):
-            # Signal Source selection.
-            state = "signalSource"
-            if response == "SDA0":
-                new_value = "AUTO"
-            elif response == "SDA1":
-                new_value = "ANALOG"
-            elif response == "SDA2":
-                new_value = "DIGITAL"
-            elif response == "SDA3":
-                new_value = "HDMI"
-            result = f"audio signal source: {new_value}"
-        elif response.startswith("SDB"):
-            # Analog Input Attenuator status.
-            state = "analogInputAttenuator"
-            if response == "SDB0":
-                new_value = False
-                result = "analog input attenuator: off"
-            elif response == "SDB1":
-                new_value = True
-                result = "analog input attenuator: on"
-        elif response.startswith("ATC"):
-            # Equalizer status.
-            state = "equalizer"
-            if response == "ATC0":
-                new_value = False
-                result = "equalizer: off"
-            elif response == "ATC1":
-                new_value = True
-                result = "equalizer: on"
-            # Don't update the state if it's the same.
-            if device.states[state] == new_value:
-                state = ""
-                new_value = ""
-                result = ""
-        elif response.startswith("ATD"):
-            # Standing Wave compensation status.
-            state = "standingWave"
-            if response == "ATD0":
-                new_value = False
-                result = "standing wave compensation: off"
-            elif response == "ATD1":
-                new_value = True
-                result = "standing wave compensation: on"
-            # Don't update the state if it's the same.
-            if device.states[state] == new_value:
-                state = ""
-                new_value = ""
-                result = ""
-        elif response.startswith("ATE"):
-            # Phase Control Plus delay time (ms) change.
-            state = "phaseControlPlusTime"
-            new_value = int(response[3:])
-            result = f"Phase Control Plus time: {new_value} ms"
-        elif response.startswith("ATF"):
-            # Sound Delay time (fractional sample frames) change.
-            state = "soundDelay"
-            new_value = (float(response[3:]) / 10.0)
-            result = f"sound delay: {new_value} sample frames"
-        elif response.startswith("ATG"):
-            # Digital Noise Reduction status.
-            state = "digitalNR"
-            if response == "ATG0":
-                new_value = False
-                result = "Digital Noise Reduction: off"
-            elif response == "ATG1":
-                new_value = True
-                result = "Digital Noise Reduction: on"
-        elif response.startswith("ATH"):
-            # Dialog Enhancement change.
-            state = "dialogEnhancement"
-            if response == "ATH0":
-                new_value = "off"
-            elif response == "ATH1":
-                new_value = "flat"
-            elif response == "ATH2":
-                new_value = "up1"
-            elif response == "ATH3":
-                new_value = "up2"
-            elif response == "ATH4":
-                new_value = "up3"
-            elif response == "AHT5":
-                new_value = "up4"
-            result = f"Dialog Enhancement mode: {new_value}"
-        elif response.startswith("ATI"):
-            # Hi-bit 24 status.
-            state = "hiBit24"
-            if response == "ATI0":
-                new_value = False
-                result = "Hi-bit 24: off"
-            elif response == "ATI1":
-                new_value = True
-                result = "Hi-bit 24: on"
-        elif response.startswith("ATJ"):
-            # Dual Mono processing change.
-            state = "dualMono"
-            if response == "ATJ0":
-                new_value = False
-                result = "Dual Mono sound processing: off"
-            elif response == "ATJ1":
-                new_value = True
-                result = "Dual Mono sound processing: on"
-        elif response.startswith("ATK"):
-            # Fixed PCM rate processing change.
-            state = "fixedPCM"
-            if response == "ATK0":
-                new_value = False
-                result = "fixed rate PCM: off"
-            elif response == "ATK1":
-                new_value = True
-                result = "fixed rate PCM: on"
-        elif response.startswith("ATL"):
-            # Dynamic Range Compression mode change.
-            state = "dynamicRangeCompression"
-            if response == "ATL0":
-                new_value = "off"
-            elif response == "ATL1":
-                new_value = "auto"
-            elif response == "ATL2":
-                new_value = "mid"
-            elif response == "ATL3":
-                new_value = "max"
-            result = f"Dynamic Range Compression: {new_value}"
-        elif response.startswith("ATM"):
-            # LFE Attenuation change.
-            state = "lfeAttenuatorAmount"
-            new_value = (-5 * int(response[3:]))
-            result = f"LFE attenuation amount: {new_value} dB"
-            if new_value < -20:
-                # A response of ATM5 translates to the attenuator being turned off.
-                self.updateDeviceState(device, "lfeAttenuator", False)
-                result = "LFE attenuation: off"
+                self.updateDeviceState(virtual_volume_device, 'brightnessLevel', the_volume)
+        else:
+            new_value = 0
+            result = ""
+            # Zone 2 volume is meaningless when using the RCA line outputs, so look for Virtual Volume Controllers that
+            # might need updating. If zone 2 power is on, the zone 2 line output will always be at 100% volume.
+            if self.getDeviceState(device, 'zone2power'):
+                for virtual_volume_device in self.getVolumeDevices(device, "zone2volume"):
+                    self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 100)
             else:
-                self.updateDeviceState(device, "lfeAttenuator", True)
-        elif response.startswith("ATN"):
-            # SACD Gain change.
-            state = "sacdGain"
-            if response == "ATN0":
-                new_value = 0
-            elif response == "ATN1":
-                new_value = 6
-            result = f"SACD gain: {new_value} dB"
-        elif response.startswith("ATO"):
-            # Auto Sound Delay status update.
-            state = "autoDelay"
-            if response == "ATO0":
-                new_value = False
-                result = "Auto Sound Delay: off"
-            elif response == "ATO1":
-                new_value = True
-                result = "Auto Sound Delay: on"
-        elif response.startswith("ATP"):
-            # Dolby Pro Logic II Music Center Width change.
-            state = "pl2musicCenterWidth"
-            new_value = int(response[3:])
-            result = f"Dolby Pro Logic II Music center width: {new_value}"
-        elif response.startswith("ATQ"):
-            # Dolby Pro Logic II Music Panorama status.
-            state = "pl2musicPanorama"
-            if response == "ATQ0":
-                new_value = False
-                result = "Dolby Pro Logic II Music panorama: off"
-            elif response == "ATQ1":
-                new_value = True
-                result = "Dolby Pro Logic II Music panorama: on"
-        elif response.startswith("ATR"):
-            # Dolby Pro Logic II Music Dimension level change.
-            state = "pl2musicDimension"
-            new_value = (int(response[3:]) - 50)
-            result = f"Dolby Pro Logic II Music dimension: {new_value}"
-        elif response.startswith("ATS"):
-            # Neo:6 Center Image change.
-            state = "neo6centerImage"
-            new_value = (float(response[3:]) / 10.0)
-            result = f"Neo:6 center image: {new_value}"
-        elif response.startswith("ATT"):
-            # Effect amount change.
-            state = "effectAmount"
-            new_value = (int(response[3:]) * 10)
-            result = f"effect level: {new_value}"
-        elif response.startswith("ATU"):
-            # Dolby Pro Logic IIz Height Gain change.
-            state = "pl2zHeightGain"
-            if response == "ATU0":
-                new_value = "LOW"
-            elif response == "ATU1":
-                new_value = "MID"
-            elif response == "ATU2":
-                new_value = "HIGH"
-            result = f"Dolby Pro Logic IIz height gain: {new_value}"
-        elif response.startswith("VTB"):
-            # Video Converter update.
-            state = "videoConverter"
-            if response == "VTB0":
-                # Video Converter Off.
-                new_value = False
-                result = "video converter: off"
-            elif response == "VTB1":
-                # Video Converter On.
-                new_value = True
-                result = "video converter: on"
-        elif response.startswith("VTC"):
-            # Video Resolution update.
-            state = "videoResolution"
-            new_value = VIDEO_RESOLUTION_PREFS[response[3:]]
-            result = f"preferred video resolution: {new_value}"
-        elif response.startswith("VTD"):
-            # Video Pure Cinema mode update.
-            state = "videoPureCinema"
-            if response == "VTD0":
-                # Pure Cinema Auto.
-                new_value = "auto"
-            elif response == "VTD1":
-                # Pure Cinema On.
-                new_value = "on"
-            elif response == "VTD2":
-                # Pure Cinema Off.
-                new_value = "off"
-            result = f"Pure Cinema mode: {new_value}"
-        elif response.startswith("VTE"):
-            # Video Progressive Motion Quality update.
-            state = "videoProgressiveQuality"
-            new_value = -4 + (int(response[3:]) - 46)
-            result = f"video progressive scan motion quality: {new_value}"
-        elif response.startswith("VTG"):
-            # Video Advanced Adjustment update.
-            state = "videoAdvancedAdjust"
-            if response == "VTG0":
-                # PDP (Plasma Display Panel)
-                new_value = "PDP (Plasma)"
-            elif response == "VTG1":
-                # LCD (Liquid Crystal Display)
-                new_value = "LCD"
-            elif response == "VTG2":
-                # FPJ (Front Projection)
-                new_value = "FPJ (Front Projection)"
-            elif response == "VTG3":
-                # Professional
-                new_value = "Professional"
-            elif response == "VTG4":
-                # Memory
-                new_value = "Memory"
-            result = f"Advanced Video Adjustment: {new_value}"
-        elif response.startswith("VTH"):
-            # Video YNR (Luminance Noise Reduction) update.
-            state = "videoYNR"
-            new_value = int(response[3:]) - 50
-            result = f"video YNR: {new_value}"
-        elif response.startswith("VTL"):
-            # Video Detail Adjustment update.
-            state = "videoDetail"
-            new_value = 50 - int(response[3:])
-            result = f"video detail amount: {new_value}"
-        elif response.startswith("AST"):
-            # Audio Status information update. Multiple data are provided in this response (43 bytes, or 55 for
-            # VSX-1123-K).
-            state = ""
-            new_value = ""
-            data = response[3:]  # strip the AST text.
-
-            # == Data Common to All Models ==
-            audio_input_format = data[0:2]  # 2-byte signal format code.
-            # Convert signal format code to a named format.
-            audio_input_format = AUDIO_INPUT_FORMATS[audio_input_format]
-            state = "audioInputFormat"
-            new_value = audio_input_format
-            self.updateDeviceState(device, state, new_value)
+                # If zone 2 power is off, the zone 2 line output will always be at 0% volume.
+                for virtual_volume_device in self.getVolumeDevices(device, "zone2volume"):
+                    self.updateDeviceState(virtual_volume_device, 'brightnessLevel', 0)
+        return "zone2volume", new_value, result
 
-            audio_input_frequency = data[2:4]  # 2-byte sample frequency code.
-            # Convert sample frequency code to a value.
-            audio_input_frequency = AUDIO_INPUT_FREQUENCIES[audio_input_frequency]
-            state = "audioInputFrequency"
-            new_value = audio_input_frequency
-            self.updateDeviceState(device, state, new_value)
+    #
+    # Input Source Name
+    #
+    def handleSourceNameResponse(self, device, response):
+        """
+        Input source name (RGB).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        # Source name update.
+        new_value = response[6:]
+        result = ""
+        # Stage the source name change; the whole sweep of names is written to the device properties at once.
+        self.stageDeviceProps(device, {f"source{response[3:5]}label": new_value})
+        # If the input source name update is for the currently selected zone 1 input source or zone 2 input source,
+        # change the appropriate state in the device.
+        if self.getDeviceState(device, 'zone1source') == int(response[3:5]):
+            result = f"input source (zone 1): {new_value}"
+            self.updateDeviceState(device, "zone1sourceName", new_value)
+        if self.getDeviceState(device, 'zone2source') == int(response[3:5]):
+            result = f"input source (zone 2): {new_value}"
+            self.updateDeviceState(device, "zone2sourceName", new_value)
+        return "", "", result
+
+    #
+    # Display Content
+    #
+    def handleDisplayResponse(self, device, response):
+        """
+        Front panel display content (FL).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        # All characters after character 4 are HEX representations of the display's character codes. Special
+        # characters (outside printable ASCII) come from the character map.
+        self.publishDisplay(device, decode_display(response, DISPLAY_CHARACTERS))
+        return "", "", ""
+
+    ########################################
+    def publishDisplay(self, device, text):
+        """
+        Update the "display" state, at most once every display update interval.
+
+        Scrolling text produces a steady stream of display frames. Frames that don't change the text are dropped, and
+        frames that arrive before the interval is up only replace the text waiting to be written, so a burst costs one
+        state update per interval and the last frame is always the one that ends up in the state.
+
+        :param device:
+        :param text: the decoded display text.
+        :return:
+        """
+        receiver = self.receivers.get(device.id)
+        if receiver is None:
+            self.updateDeviceState(device, "display", text)
+            return
+        if receiver.display_timer is not None:
+            # An update is already scheduled; it will write the latest text.
+            receiver.display_pending = text
+            return
+        if text == self.getDeviceState(device, "display"):
+            return
+        wait = receiver.display_written + self.display_update_interval - time.monotonic()
+        if wait <= 0:
+            receiver.display_written = time.monotonic()
+            self.updateDeviceState(device, "display", text)
+        else:
+            receiver.display_pending = text
+            receiver.display_timer = self.io_engine.call_later(wait, self.flushDisplay, device.id)
+
+    ########################################
+    def flushDisplay(self, device_id):
+        """
+        Write the display text held back by publishDisplay. Runs on the I/O thread.
+
+        :param device_id:
+        :return:
+        """
+        receiver = self.receivers.get(device_id)
+        if receiver is None:
+            return
+        receiver.display_timer = None
+        text, receiver.display_pending = receiver.display_pending, None
+        if text is not None:
+            receiver.display_written = time.monotonic()
+            self.updateDeviceState(receiver.device, "display", text)
+
+    ########################################
+    @staticmethod
+    def getDisplayUpdateInterval(prefs):
+        """
+        Shortest time (in seconds) between "display" state updates, from the plugin preferences.
+
+        :param prefs: plugin preferences (or the preferences dialog values).
+        :return:
+        """
+        try:
+            rate = int(prefs.get('displayUpdateRate', DEFAULT_DISPLAY_UPDATE_RATE))
+        except ValueError:
+            rate = DEFAULT_DISPLAY_UPDATE_RATE
+        return 1.0 / rate if rate > 0 else 0.0
+
+    #
+    # MCACC Memory
+    #
+    def handleMcaccMemoryResponse(self, device, response):
+        """
+        MCACC memory selection (MC).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = int(response[2:])
+        mcacc_name = self.getDeviceProps(device).get(f'mcaccMemory{new_value}label', "")
+        # Set the mcaccMemory#label value as well.
+        self.updateDeviceState(device, 'mcaccMemoryName', mcacc_name)
+        return "mcaccMemory", new_value, f"MCACC memory: {new_value}: {mcacc_name}"
+
+    #
+    # Channel Volume Level
+    #
+    def handleChannelLevelResponse(self, device, response):
+        """
+        Individual channel volume level (CLV).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        channel = response[3:6]
+        level = float(response[6:]) * 1.0
+        # convert the level to decibels.
+        new_value = -12 + 0.5 * (level - 26.0)
+        # Get the state name from the global dictionary.
+        return CHANNEL_VOLUMES[channel], new_value, f"{channel.strip('_')} channel level: {new_value} dB."
+
+    #
+    # OSD Language
+    #
+    def handleOsdLanguageResponse(self, device, response):
+        """
+        On-screen display language setting (SSE). Stored as a device property rather than a state.
+
+        :param device:
+        :param response:
+        :return:
+        """
+        if response == "SSE00":
+            new_value = "English"
+        else:
+            new_value = "non-English"
+        # Make a copy of the device properties, make the change to the local copy and update the properties on the
+        # server.
+        dev_props = self.getDeviceProps(device)
+        dev_props['osdLanguage'] = new_value
+        self.updateDeviceProps(device, dev_props)
+        return "", "", ""
+
+    #
+    # Display Brightness
+    #
+    def handleDisplayBrightnessResponse(self, device, response):
+        """
+        Front panel display brightness (SAA). There's no state for this setting, so the response is only noted.
+
+        :param device:
+        :param response:
+        :return:
+        """
+        self.debugLog(f"processResponse: {device.name}: display brightness changed ({response}).")
+        return "", "", ""
+
+    #
+    # Sleep Timer
+    #
+    def handleSleepTimerResponse(self, device, response):
+        """
+        Sleep timer time remaining (SAB).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = int(response[3:])
+        if new_value == 0:
+            # Sleep timer is off
+            self.updateDeviceState(device, "sleepMode", False)
+            result = "sleep timer: off"
+        else:
+            # Sleep timer is on
+            self.updateDeviceState(device, "sleepMode", True)
+            result = f"sleep timer: {new_value} minutes remaining."
+        return "sleepTime", new_value, result
+
+    #
+    # Tuner Frequency
+    #
+    def handleTunerFrequencyResponse(self, device, response):
+        """
+        Tuner band and frequency (FR). Only used if either zone 1 or 2 is actually using the Tuner.
+
+        :param device:
+        :param response:
+        :return:
+        """
+        if self.getDeviceState(device, 'zone1source') != 2 and self.getDeviceState(device, 'zone2source') != 2:
+            return "", "", ""
+        result = ""
+        # Extract the band (AM or FM)
+        band = response[2:3] + "M"
+        # Extract the frequency.
+        frequency = response[3:]
+        frequency_text = frequency
+        if band == "FM":
+            # If the band is FM, put the decimal in the right place.
+            frequency_text = f"{frequency[0:3]}.{frequency[3:]} MHz"
+            frequency_text = frequency_text.lstrip("0")  # Eliminate leading zeros.
+            frequency = float(f"{frequency[0:3]}.{frequency[3:]}")
+        elif band == "AM":
+            # If the band is AM, convert the text to an integer.
+            frequency = int(frequency)  # Eliminates leading zeros.
+            frequency_text = f"{frequency} kHz"
+        # Only log the change if the frequency is actually different.
+        if (frequency != self.getDeviceState(device, 'tunerFrequency')
+                or band != self.getDeviceState(device, 'tunerBand')):
+            result = f"tuner frequency: {frequency_text} {band}"
+        # Set the tuner band and frequency text on the server. The frequency itself is returned for processResponse.
+        self.updateDeviceState(device, "tunerBand", str(band))
+        self.updateDeviceState(device, 'tunerFrequencyText', frequency_text)
+        return "tunerFrequency", frequency, result
+
+    #
+    # Tuner Preset
+    #
+    def handleTunerPresetResponse(self, device, response):
+        """
+        Tuner preset selection (PR). Only used if either zone 1 or 2 is actually using the Tuner.
+
+        :param device:
+        :param response:
+        :return:
+        """
+        if self.getDeviceState(device, 'zone1source') != 2 and self.getDeviceState(device, 'zone2source') != 2:
+            return "", "", ""
+        # Get the preset letter plus the non-leading-zero number.
+        new_value = response[2:3] + str(int(response[3:]))
+        # Now add the custom name (if set) for the preset.
+        prop_name = f"tunerPreset{new_value}label"
+        new_value += f": {self.getDeviceProps(device)[prop_name]}"
+        # Ignore this information if the state is already set to this setting.
+        if self.getDeviceState(device, 'tunerPreset') == new_value:
+            return "", "", ""
+        return "tunerPreset", new_value, f"tuner preset: {new_value}"
+
+    #
+    # Tuner Preset Label
+    #
+    def handleTunerPresetLabelResponse(self, device, response):
+        """
+        Tuner preset name (TQ). Stored as a device property rather than a state.
+
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = response[4:]  # Strip off the "TQ"
+        new_value = new_value.strip('"')  # Remove the enclosing quotes.
+        new_value = new_value.strip()  # Remove the white space.
+        # Stage the preset name change; the whole sweep of names is written to the device properties at once.
+        self.stageDeviceProps(device, {f"tunerPreset{response[2:4]}label": new_value})
+        return "", "", ""
+
+    #
+    # Listening Mode
+    #
+    def handleListeningModeResponse(self, device, response):
+        """
+        Listening mode (SR).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = LISTENING_MODES[response[2:]]
+        # Ignore this information if the state is already set to this setting.
+        if self.getDeviceState(device, 'listeningMode') == new_value:
+            return "", "", ""
+        return "listeningMode", new_value, f"listening mode: {new_value}"
+
+    #
+    # Playback Listening Mode
+    #
+    def handleDisplayListeningModeResponse(self, device, response):
+        """
+        Playback (displayed) listening mode (LM).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = DISPLAY_LISTENING_MODES[response[2:]]
+        # Ignore this information if the state is already set to this setting.
+        if self.getDeviceState(device, 'displayListeningMode') == new_value:
+            return "", "", ""
+        return "displayListeningMode", new_value, f"displayed listening mode: {new_value}"
+
+    #
+    # Bass Tone Level
+    #
+    def handleBassResponse(self, device, response):
+        """
+        Bass tone control level (BA).
+
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = (6 - int(response[2:]))
+        return "toneBass", new_value, f"bass tone level: {new_value} dB"
+
+    #
+    # Treble Tone Level
+    #
+    def handleTrebleResponse(self, device, response):
+        """
+        Treble tone control level (TR).
 
-            state = "inputChannels"
-            new_value = ""
-            # Convert data bytes 5-25 into an input channel format string. Loop through data bytes and add channels
-            # that are enabled.
-            state = "inputChannels"
-            new_value = ""
-            for i in range(5, 26):
-                if data[(i - 1):i] == "1":
-                    # Add a comma if this is not the first item.
-                    # if new_value is not "": fixme
-                    if new_value != "":
-                        new_value += ", "
-                    new_value += AUDIO_CHANNELS[(i - 5)]
-            self.updateDeviceState(device, state, new_value)
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = (6 - int(response[2:]))
+        return "toneTreble", new_value, f"treble tone level: {new_value} dB"
 
-            # Convert data bytes 26-43 into an output channel format string. Loop through data bytes and add channels
-            # that are enabled.
-            state = "outputChannels"
-            new_value = ""
-            for i in range(26, 44):
-                if data[(i - 1):i] == "1":
-                    # Add a comma if this is not the first item.
-                    # if new_value is not "": fixme
-                    if new_value != "":
-                        new_value += ", "
-                    new_value += AUDIO_CHANNELS[(i - 26)]
-            self.updateDeviceState(device, state, new_value)
+    #
+    # Phase Control Plus Delay
+    #
+    def handlePhaseControlPlusTimeResponse(self, device, response):
+        """
+        Phase Control Plus delay time in ms (ATE).
 
-            # The VSX-1123-K responds with a 55 instead of 43 characters. These extra data represent features found
-            # only in this and other 2014 models.
-            if device.deviceTypeId == "vsx1123k":
-                audio_output_frequency = data[43:45]  # 2-byte sample frequency code.
-                # Convert sample frequency code to a value.
-                audio_output_frequency = AUDIO_OUTPUT_FREQUENCIES[audio_output_frequency]
-                state = "audioOutputFrequency"
-                new_value = audio_output_frequency
-                self.updateDeviceState(device, state, new_value)
-
-                audio_output_bit_depth = data[45:47]  # 2-byte sample bit depth value.
-                # Convert sample bit depth from a string to a number.
-                audio_output_bit_depth = int(audio_output_bit_depth)
-                state = "audioOutputBitDepth"
-                new_value = audio_output_bit_depth
-                self.updateDeviceState(device, state, new_value)
-
-                # Bytes 48 through 51 are reserved.
-
-                pqls_mode = data[51:52]  # 1-byte PQLS working mode code.
-                # Convert PQLS code to working state.
-                if pqls_mode == "0":
-                    pqls_mode = "off"
-                elif pqls_mode == "1":
-                    pqls_mode = "2-channel"
-                elif pqls_mode == "2":
-                    pqls_mode = "multi-channel"
-                elif pqls_mode == "3":
-                    pqls_mode = "bitstream"
-                state = "pqlsMode"
-                new_value = pqls_mode
-                self.updateDeviceState(device, state, new_value)
-
-                phase_control_plus_working_delay = data[52:54]  # 2-byte Phase Control Plus working delay (ms).
-                # Convert Phase Control Plus string to number.
-                phase_control_plus_working_delay = int(phase_control_plus_working_delay)
-                state = "phaseControlPlusWorkingTime"
-                new_value = phase_control_plus_working_delay
-                self.updateDeviceState(device, state, new_value)
-
-                phase_control_plus_reversed = data[54:55]  # 1-byte Phase Control Plus reversed phase.
-                # Translate Phase Control Plus reversed state.
-                if phase_control_plus_reversed == "0":
-                    phase_control_plus_reversed = True
-                elif phase_control_plus_reversed == "1":
-                    phase_control_plus_reversed = False
-                state = "phaseControlPlusReversed"
-                new_value = phase_control_plus_reversed
-                self.updateDeviceState(device, state, new_value)
-
-            result = "audio input/output information updated"
-
-        elif response.startswith("VST"):
-            # Video Status information update. Multiple data are provided in this response.
-            state = ""
-            new_value = ""
-            data = response[3:]  # Strip off the leading "VST".
-
-            # Video Input Terminal
-            state = "videoInputTerminal"
-            new_value = int(data[0:1])
-            if new_value == 0:
-                new_value = ""
-            elif new_value == 1:
-                new_value = "Video"
-            elif new_value == 2:
-                new_value = "S-Video"
-            elif new_value == 3:
-                new_value = "Component"
-            elif new_value == 4:
-                new_value = "HDMI"
-            elif new_value == 5:
-                new_value = "Self (OSD/JPEG)"
-            self.updateDeviceState(device, state, new_value)
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = int(response[3:])
+        return "phaseControlPlusTime", new_value, f"Phase Control Plus time: {new_value} ms"
 
-            # Video Input Resolution
-            state = "videoInputResolution"
-            new_value = VIDEO_RESOLUTIONS[data[1:3]]
-            self.updateDeviceState(device, state, new_value)
+    #
+    # Sound Delay
+    #
+    def handleSoundDelayResponse(self, device, response):
+        """
+        Sound delay time in fractional sample frames (ATF).
 
-            # Video Input Aspect Ratio
-            state = "videoInputAspect"
-            new_value = int(data[3:4])
-            if new_value == 0:
-                new_value = ""
-            elif new_value == 1:
-                new_value = "4:3"
-            elif new_value == 2:
-                new_value = "16:9"
-            elif new_value == 3:
-                new_value = "14:9"
-            self.updateDeviceState(device, state, new_value)
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = (float(response[3:]) / 10.0)
+        return "soundDelay", new_value, f"sound delay: {new_value} sample frames"
 
-            # Video Input Color Format
-            state = "videoInputColorFormat"
-            new_value = int(data[4:5])
-            if new_value == 0:
-                new_value = ""
-            elif new_value == 1:
-                new_value = "RGB Limited"
-            elif new_value == 2:
-                new_value = "RGB Full"
-            elif new_value == 3:
-                new_value = "YCbCr 4:4:4"
-            elif new_value == 4:
-                new_value = "YCbCr 4:2:2"
-            self.updateDeviceState(device, state, new_value)
+    #
+    # LFE Attenuation
+    #
+    def handleLfeAttenuationResponse(self, device, response):
+        """
+        LFE attenuation amount (ATM).
 
-            # Video Input Bit Depth
-            state = "videoInputBitDepth"
-            new_value = int(data[5:6])
-            if new_value == 0:
-                new_value = ""
-            elif new_value == 1:
-                new_value = "24-bit (8-bit per pixel)"
-            elif new_value == 2:
-                new_value = "30-bit (10-bit per pixel)"
-            elif new_value == 3:
-                new_value = "36-bit (12-bit per pixel)"
-            elif new_value == 4:
-                new_value = "48-bit (16-bit per pixel)"
-            self.updateDeviceState(device, state, new_value)
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = (-5 * int(response[3:]))
+        result = f"LFE attenuation amount: {new_value} dB"
+        if new_value < -20:
+            # A response of ATM5 translates to the attenuator being turned off.
+            self.updateDeviceState(device, "lfeAttenuator", False)
+            result = "LFE attenuation: off"
+        else:
+            self.updateDeviceState(device, "lfeAttenuator", True)
+        return "lfeAttenuatorAmount", new_value, result
 
-            # Video Input Color Space
-            state = "videoInputColorSpace"
-            new_value = int(data[6:7])
-            if new_value == 0:
-                new_value = ""
-            elif new_value == 1:
-                new_value = "Standard"
-            elif new_value == 2:
-                new_value = "xv.Color YCC 601"
-            elif new_value == 3:
-                new_value = "xv.Color YCC 709"
-            elif new_value == 4:
-                new_value = "sYCC"
-            elif new_value == 5:
-                new_value = "Adobe YCC 601"
-            elif new_value == 6:
-                new_value = "Adobe RGB"
-            self.updateDeviceState(device, state, new_value)
+    #
+    # Dolby Pro Logic II Music Center Width
+    #
+    def handlePl2MusicCenterWidthResponse(self, device, response):
+        """
+        Dolby Pro Logic II Music center width (ATP).
 
-            # Video Output Resolution
-            state = "videoOutputResolution"
-            new_value = VIDEO_RESOLUTIONS[data[7:9]]
-            self.updateDeviceState(device, state, new_value)
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = int(response[3:])
+        return "pl2musicCenterWidth", new_value, f"Dolby Pro Logic II Music center width: {new_value}"
 
-            # Video Output Aspect Ratio
-            state = "videoOutputAspect"
-            new_value = int(data[9:10])
-            if new_value == 0:
-                new_value = ""
-            elif new_value == 1:
-                new_value = "4:3"
-            elif new_value == 2:
-                new_value = "16:9"
-            elif new_value == 3:
-                new_value = "14:9"
-            self.updateDeviceState(device, state, new_value)
+    #
+    # Dolby Pro Logic II Music Dimension
+    #
+    def handlePl2MusicDimensionResponse(self, device, response):
+        """
+        Dolby Pro Logic II Music dimension level (ATR).
 
-            # Video Output Color Format
-            state = "videoOutputColorFormat"
-            new_value = int(data[10:11])
-            if new_value == 0:
-                new_value = ""
-            elif new_value == 1:
-                new_value = "RGB Limited"
-            elif new_value == 2:
-                new_value = "RGB Full"
-            elif new_value == 3:
-                new_value = "YCbCr 4:4:4"
-            elif new_value == 4:
-                new_value = "YCbCr 4:2:2"
-            self.updateDeviceState(device, state, new_value)
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = (int(response[3:]) - 50)
+        return "pl2musicDimension", new_value, f"Dolby Pro Logic II Music dimension: {new_value}"
 
-            # Video Output Bit Depth
-            state = "videoOutputBitDepth"
-            new_value = int(data[11:12])
-            if new_value == 0:
-                new_value = ""
-            elif new_value == 1:
-                new_value = "24-bit (8-bit per pixel)"
-            elif new_value == 2:
-                new_value = "30-bit (10-bit per pixel)"
-            elif new_value == 3:
-                new_value = "36-bit (12-bit per pixel)"
-            elif new_value == 4:
-                new_value = "48-bit (16-bit per pixel)"
-            self.updateDeviceState(device, state, new_value)
+    #
+    # Neo:6 Center Image
+    #
+    def handleNeo6CenterImageResponse(self, device, response):
+        """
+        Neo:6 center image (ATS).
 
-            # Video Output Color Space
-            state = "videoOutputColorSpace"
-            new_value = int(data[12:13])
-            if new_value == 0:
-                new_value = ""
-            elif new_value == 1:
-                new_value = "Standard"
-            elif new_value == 2:
-                new_value = "xv.Color YCC 601"
-            elif new_value == 3:
-                new_value = "xv.Color YCC 709"
-            elif new_value == 4:
-                new_value = "sYCC"
-            elif new_value == 5:
-                new_value = "Adobe YCC 601"
-            elif new_value == 6:
-                new_value = "Adobe RGB"
-            self.updateDeviceState(device, state, new_value)
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = (float(response[3:]) / 10.0)
+        return "neo6centerImage", new_value, f"Neo:6 center image: {new_value}"
 
-            # Monitor Recommended Resolution (HDMI 1)
-            state = "monitorRecommendedResolution"
-            new_value = VIDEO_RESOLUTIONS[data[13:15]]
-            self.updateDeviceState(device, state, new_value)
+    #
+    # Effect Amount
+    #
+    def handleEffectAmountResponse(self, device, response):
+        """
+        Effect amount (ATT).
 
-            # Monitor Bit Depth Support
-            state = "monitorBitDepth"
-            new_value = int(data[15:16])
-            if new_value == 0:
-                new_value = ""
-            elif new_value == 1:
-                new_value = "24-bit (8-bit per pixel)"
-            elif new_value == 2:
-                new_value = "30-bit (10-bit per pixel)"
-            elif new_value == 3:
-                new_value = "36-bit (12-bit per pixel)"
-            elif new_value == 4:
-                new_value = "48-bit (16-bit per pixel)"
-            self.updateDeviceState(device, state, new_value)
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = (int(response[3:]) * 10)
+        return "effectAmount", new_value, f"effect level: {new_value}"
 
-            # Monitor Supported Color Spaces (HDMI 1)
-            state = "monitorColorSpaces"
-            new_value = ""
-            color_spaces = data[16:21]
-            if color_spaces[0:1] == "1":
-                new_value += "xv.Color YCC 601"
-            if color_spaces[1:2] == "1":
-                if len(new_value) > 0:
-                    new_value += ", "
-                new_value += "xv.Color YCC 709"
-            if color_spaces[2:3] == "1":
-                if len(new_value) > 0:
-                    new_value += ", "
-                new_value += "xYCC"
-            if color_spaces[3:4] == "1":
-                if len(new_value) > 0:
-                    new_value += ", "
-                new_value += "Adobe YCC 601"
-            if color_spaces[4:5] == "1":
-                if len(new_value) > 0:
-                    new_value += ", "
-                new_value += "Adobe RGB"
-            self.updateDeviceState(device, state, new_value)
+    #
+    # Preferred Video Resolution
+    #
+    def handleVideoResolutionResponse(self, device, response):
+        """
+        Preferred video output resolution (VTC).
 
-            result = "video input/output information updated"
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = VIDEO_RESOLUTION_PREFS[response[3:]]
+        return "videoResolution", new_value, f"preferred video resolution: {new_value}"
 
-        else:
-            # Unrecognized response received.
-            self.debugLog(f"Unrecognized response received from {device.name}: {response}")
-            new_value = "unknown"
+    #
+    # Progressive Motion Quality
+    #
+    def handleVideoProgressiveQualityResponse(self, device, response):
+        """
+        Video progressive scan motion quality (VTE).
 
-        get_status_update = False  # Should we perform a full status update?
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = -4 + (int(response[3:]) - 46)
+        return "videoProgressiveQuality", new_value, f"video progressive scan motion quality: {new_value}"
 
-        # Only update the device if the state is not blank.
-        if state != "":
-            # If this is a zone power state change to True and the current zone power state is False, get more status
-            # information.
-            if (state == "zone1power" and new_value and not device.states['zone1power']) or (
-                    state == "zone2power" and new_value and not device.states['zone2power']):
-                get_status_update = True
+    #
+    # Luminance Noise Reduction
+    #
+    def handleVideoYnrResponse(self, device, response):
+        """
+        Video YNR (luminance noise reduction) amount (VTH).
 
-            # Update the state on the server.
-            self.updateDeviceState(device, state, new_value)
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = int(response[3:]) - 50
+        return "videoYNR", new_value, f"video YNR: {new_value}"
 
-        #
-        # CHECK IF ADDITIONAL PROCESSING IS NEEDED
-        #
+    #
+    # Video Detail
+    #
+    def handleVideoDetailResponse(self, device, response):
+        """
+        Video detail adjustment amount (VTL).
 
-        # If this is a zone source input change, request additional information.
-        if state == "zone1source":
-            # Get the specified input source name (just in case the user changed the input name since the last full
-            # status update).
-            self.sendCommand(device, f"?RGB{response[2:]}")
-            # Audio Status.
-            self.getAudioInOutStatus(device)
-            # If this is an input change to the Tuner, get the station preset info.
-            if response == "FN02":
-                self.getTunerPresetStatus(device)
-            else:
-                # Since zone 1 is not using the Tuner, as long as zone 2 isn't either, let's clear the Tuner statuses
-                # in the device.
-                if device.states['zone2source'] != 2:
-                    self.debugLog("processResponse: Neither zone is using the tuner. Clearing frequency info.")
-                    self.updateDeviceState(device, 'tunerFrequency', 0)
-                    self.updateDeviceState(device, 'tunerFrequencyText', "")
-                    self.updateDeviceState(device, 'tunerPreset', "")
-                    self.updateDeviceState(device, 'tunerBand', "")
+        :param device:
+        :param response:
+        :return:
+        """
+        new_value = 50 - int(response[3:])
+        return "videoDetail", new_value, f"video detail amount: {new_value}"
 
-        elif state == "zone2source":
-            # Get the specified input source name (just in case the user changed the input name since the last full
-            # status update).
-            self.sendCommand(device, f"?RGB{response[3:]}")
-            # Audio Status.
-            self.getAudioInOutStatus(device)
-            # If this is an input change to the Tuner, get the band, frequency, and preset info.
-            if response == "Z2F02":
-                self.getTunerPresetStatus(device)
-            else:
-                # Since zone 2 is not using the Tuner, as long as zone 1 isn't either, let's clear the Tuner statuses
-                # in the device.
-                if device.states['zone1source'] != 2:
-                    self.debugLog("processResponse: Neither zone is using the tuner. Clearing frequency info.")
-                    self.updateDeviceState(device, 'tunerFrequency', 0)
-                    self.updateDeviceState(device, 'tunerFrequencyText', "")
-                    self.updateDeviceState(device, 'tunerPreset', "")
-                    self.updateDeviceState(device, 'tunerBand', "")
+    #
+    # Audio Input/Output Status
+    #
+    def handleAudioStatusResponse(self, device, response):
+        """
+        Audio input and output status (AST). Multiple data are provided in this response (43 bytes, or 55 for
+        VSX-1123-K), so the states are updated here.
 
-        elif state == "tunerPreset":
-            # Tuner preset was changed. Get the new frequency.
-            self.getTunerFrequency(device)
+        :param device:
+        :param response:
+        :return:
+        """
+        if device.deviceTypeId == "vsx1123k":
+            decoder = self.audio_status_decoder_2014
+        else:
+            decoder = self.audio_status_decoder
+        # Only the states that actually changed need updating.
+        receiver = self.receivers.get(device.id)
+        changed = decoder.decode(response, receiver.states if receiver is not None else None)
+        for state, new_value in changed.items():
+            self.updateDeviceState(device, state, new_value)
+        return "", "", "audio input/output information updated"
 
-        elif state == "mcaccMemory":
-            # MCACC Memory change. Set the mcaccMemory#label value.
-            # TODO: 'mcaccName' might be referenced before assignment
-            self.updateDeviceState(device, 'mcaccMemoryName', mcacc_name)
-
-        elif state == "tunerFrequency":
-            # Also set the tunerFrequencyText.
-            # TODO: 'frequencyText' might be referenced before assignment
-            self.updateDeviceState(device, 'tunerFrequencyText', frequency_text)
-
-        # If both zones are off, clear some states that should have no value when the unit is off.
-        if not device.states['zone1power'] and not device.states['zone2power']:
-            self.updateDeviceState(device, "audioInputFormat", "")
-            self.updateDeviceState(device, "audioInputFrequency", 0)
-            self.updateDeviceState(device, "inputChannels", "")
-            self.updateDeviceState(device, "outputChannels", "")
-            self.updateDeviceState(device, "monitorBitDepth", "")
-            self.updateDeviceState(device, "monitorColorSpaces", "")
-            self.updateDeviceState(device, "monitorRecommendedResolution", "")
-            self.updateDeviceState(device, "signalSource", "")
-            self.updateDeviceState(device, "sleepMode", False)
-            self.updateDeviceState(device, "sleepTime", 0)
-            self.updateDeviceState(device, "tunerBand", "")
-            self.updateDeviceState(device, "tunerFrequency", 0)
-            self.updateDeviceState(device, "tunerFrequencyText", "")
-            self.updateDeviceState(device, "tunerPreset", "")
-            self.updateDeviceState(device, "videoInputAspect", "")
-            self.updateDeviceState(device, "videoInputBitDepth", "")
-            self.updateDeviceState(device, "videoInputColorFormat", "")
-            self.updateDeviceState(device, "videoInputColorSpace", "")
-            self.updateDeviceState(device, "videoInputResolution", "")
-            self.updateDeviceState(device, "videoInputTerminal", "")
-            self.updateDeviceState(device, "videoOutputAspect", "")
-            self.updateDeviceState(device, "videoOutputBitDepth", "")
-            self.updateDeviceState(device, "videoOutputColorFormat", "")
-            self.updateDeviceState(device, "videoOutputColorSpace", "")
-            self.updateDeviceState(device, "videoOutputResolution", "")
-
-        # Now get the additional status info if needed.
-        if get_status_update:
-            self.getReceiverStatus(device)
+    #
+    # Video Input/Output Status
+    #
+    def handleVideoStatusResponse(self, device, response):
+        """
+        Video input and output status (VST). Multiple data are provided in this response, so the states are updated
+        here.
 
-        return result
+        :param device:
+        :param response:
+        :return:
+        """
+        # Only the states that actually changed need updating.
+        receiver = self.receivers.get(device.id)
+        changed = self.video_status_decoder.decode(response, receiver.states if receiver is not None else None)
+        for state, new_value in changed.items():
+            self.updateDeviceState(device, state, new_value)
+        return "", "", "video input/output information updated"
 
     #########################################
     # Information Gathering Methods
@@ -2127,7 +2803,6 @@ class Plugin(indigo.PluginBase):
         # Make sure it's not a virtual volume device.
         if dev_type != "virtualVolume":
             self.sendCommand(device, "?FL")  # Display Content Query.
-            self.sleep(0.1)  # Wait for responses to be processed.
 
     #
     # Power Status
@@ -2147,17 +2822,7 @@ class Plugin(indigo.PluginBase):
         # Make sure it's not a virtual volume device.
         if dev_type != "virtualVolume":
             self.sendCommand(device, "?P")  # Power Query (Zone 1).
-            self.sleep(0.1)  # Wait for responses to be processed.
             self.sendCommand(device, "?AP")  # Power Query (Zone 2).
-            self.sleep(0.1)
-
-            # It's important that we get the result of this status request before proceeding.
-            response = self.readData(device)
-            response = response.rstrip("\r\n")
-            for response_line in response.splitlines():
-                result = self.processResponse(device, response_line)
-                if result != "":
-                    indigo.server.log(result, device.name)
 
     #
     # Input Source Names
@@ -2179,35 +2844,27 @@ class Plugin(indigo.PluginBase):
             for the_number, the_name in SOURCE_NAMES.items():
                 # Only ask for information on sources recognized by the device type.
                 #   VSX-1021-K
-                # if dev_type is "vsk1021k": fixme
-                if dev_type == "vsk1021k":
+                if dev_type == "vsx1021k":
                     if the_number not in VSX1021k_SOURCE_MASK:
                         self.sendCommand(device, f"?RGB{the_number}")
-                        self.sleep(0.1)  # Wait for responses to be processed.
                 #   VSX-1022-K
-                # if dev_type is "vsk1022k": fixme
-                if dev_type == "vsk1022k":
+                if dev_type == "vsx1022k":
                     if the_number not in VSX1022K_SOURCE_MASK:
                         self.sendCommand(device, f"?RGB{the_number}")
-                        self.sleep(0.1)  # Wait for responses to be processed.
                 #   VSX-1122-K
-                # if dev_type is "vsk1122k": fixme
-                if dev_type == "vsk1122k":
+                if dev_type == "vsx1122k":
                     if the_number not in VSX1122K_SOURCE_MASK:
                         self.sendCommand(device, f"?RGB{the_number}")
-                        self.sleep(0.1)  # Wait for responses to be processed.
                 #   VSX-1123-K
-                # if dev_type is "vsk1123k": fixme
-                if dev_type == "vsk1123k":
+                if dev_type == "vsx1123k":
                     if the_number not in VSX1123K_SOURCE_MASK:
                         self.sendCommand(device, f"?RGB{the_number}")
-                        self.sleep(0.1)  # Wait for responses to be processed.
                 #   SC-75
-                # if dev_type is "sc75": fixme
                 if dev_type == "sc75":
                     if the_number not in SC75_SOURCE_MASK:
                         self.sendCommand(device, f"?RGB{the_number}")
-                        self.sleep(0.1)  # Wait for responses to be processed.
+            # Write all the names to the device properties at once when the last one is in.
+            self.queueCallback(device, functools.partial(self.flushDeviceProps, device.id))
 
     #
     # Tuner Preset Names
@@ -2226,7 +2883,8 @@ class Plugin(indigo.PluginBase):
         # Make sure it's not a virtual volume device.
         if dev_type != "virtualVolume":
             self.sendCommand(device, "?TQ")  # Tuner Preset label query.
-            self.sleep(0.2)
+            # Write all the names to the device properties at once when the last one is in.
+            self.queueCallback(device, functools.partial(self.flushDeviceProps, device.id))
 
     #
     # Tuner Band and Frequency
@@ -2245,7 +2903,6 @@ class Plugin(indigo.PluginBase):
         # Make sure it's not a virtual volume device.
         if dev_type != "virtualVolume":
             self.sendCommand(device, "?FR")
-            self.sleep(0.1)
 
     #
     # Tuner Preset Status
@@ -2264,7 +2921,6 @@ class Plugin(indigo.PluginBase):
         # Make sure it's not a virtual volume device.
         if dev_type != "virtualVolume":
             self.sendCommand(device, "?PR")
-            self.sleep(0.1)
 
     #
     # Volume Status (Zones 1 and 2)
@@ -2283,9 +2939,7 @@ class Plugin(indigo.PluginBase):
         # Make sure it's not a virtual volume device.
         if dev_type != "virtualVolume":
             self.sendCommand(device, "?V")  # Volume Query (Zone 1)
-            self.sleep(0.1)
             self.sendCommand(device, "?ZV")  # Volume Query (Zone 2)
-            self.sleep(0.1)
 
     #
     # Mute Status (Zones 1 and 2)
@@ -2304,9 +2958,7 @@ class Plugin(indigo.PluginBase):
         # Make sure it's not a virtual volume device.
         if dev_type != "virtualVolume":
             self.sendCommand(device, "?M")  # Mute Query (Zone 1)
-            self.sleep(0.1)
             self.sendCommand(device, "?Z2M")  # Mute Query (Zone 2)
-            self.sleep(0.1)
 
     #
     # Input Source Status (Zones 1 and 2)
@@ -2325,9 +2977,7 @@ class Plugin(indigo.PluginBase):
         # Make sure it's not a virtual volume device.
         if dev_type != "virtualVolume":
             self.sendCommand(device, "?F")  # Input Source Query (Zone 1)
-            self.sleep(0.1)
             self.sendCommand(device, "?ZS")  # Input Source Query (Zone 2)
-            self.sleep(0.1)
 
     #
     # Channel Volume Levels
@@ -2347,7 +2997,6 @@ class Plugin(indigo.PluginBase):
         if dev_type != "virtualVolume":
             for the_channel, the_state in CHANNEL_VOLUMES.items():
                 self.sendCommand(device, f"?{the_channel}CLV")
-                self.sleep(0.1)
 
     #
     # System Setup Status
@@ -2366,19 +3015,12 @@ class Plugin(indigo.PluginBase):
         # Make sure it's not a virtual volume device.
         if dev_type != "virtualVolume":
             self.sendCommand(device, "?SPK")  # Amp speaker setting.
-            self.sleep(0.1)
             self.sendCommand(device, "?PKL")  # Panel Key Lock status.
-            self.sleep(0.1)
             self.sendCommand(device, "?RML")  # Remote Lock status.
-            self.sleep(0.1)
             self.sendCommand(device, "?SSA")  # Operating Mode status.
-            self.sleep(0.1)
             self.sendCommand(device, "?SSE")  # OSD Language status.
-            self.sleep(0.1)
             self.sendCommand(device, "?SSF")  # Speaker System status.
-            self.sleep(0.1)
             self.sendCommand(device, "?SAB")  # Sleep timer time remaining.
-            self.sleep(0.1)
 
     #
     # Audio DSP Settings
@@ -2397,197 +3039,530 @@ class Plugin(indigo.PluginBase):
         # Make sure it's not a virtual volume device.
         if dev_type != "virtualVolume":
             self.sendCommand(device, "?TO")  # Tone Control status.
-            self.sleep(0.1)
             self.sendCommand(device, "?BA")  # Bass Tone Control level.
-            self.sleep(0.1)
             self.sendCommand(device, "?TR")  # Treble Tone Control level.
-            self.sleep(0.1)
             self.sendCommand(device, "?MC")  # MCACC Memory setting.
-            self.sleep(0.1)
             self.sendCommand(device, "?IS")  # Phase Control setting.
-            self.sleep(0.1)
             self.sendCommand(device, "?PQ")  # PQLS Auto status.
-            self.sleep(0.1)
             self.sendCommand(device, "?VSB")  # Virtual Surround Back setting.
-            self.sleep(0.1)
             self.sendCommand(device, "?VHT")  # Virtual Height setting.
-            self.sleep(0.1)
             self.sendCommand(device, "?HA")  # HDMI Audio pass-through setting.
-            self.sleep(0.1)
             self.sendCommand(device, "?L")  # Playback Listening Mode.
-            self.sleep(0.1)
             self.sendCommand(device, "?S")  # Surround Listening Mode.
-            self.sleep(0.1)
             self.sendCommand(device, "?SDA")  # Signal Source selection status.
-            self.sleep(0.1)
             self.sendCommand(device, "?SDB")  # Analog Input Attenuator status.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATA")  # Sound Retriever status.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATC")  # Equalizer status.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATD")  # Standing Wave compensation status.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATE")  # Phase Control Plus delay (ms).
-            self.sleep(0.1)
             self.sendCommand(device, "?ATF")  # Sound Delay (sample frames).
-            self.sleep(0.1)
             self.sendCommand(device, "?ATG")  # Digital Noise Reduction status.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATH")  # Dialog Enhancement status.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATJ")  # Dual Mono processing status.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATK")  # Fixed PCM processing status.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATL")  # Dynamic Range Compression mode.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATM")  # LFE Attenuation status.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATN")  # SACD Gain status.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATO")  # Auto Sound Delay status.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATP")  # Dolby Pro Logic II Music Center Width status.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATQ")  # Dolby Pro Logic II Music Panorama status.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATR")  # Dolby Pro Logic II Music Dimension status.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATS")  # Neo:6 Center Image status.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATT")  # Effect level status.
-            self.sleep(0.1)
             self.sendCommand(device, "?ATU")  # Dolby Pro Logic IIz Height Gain status.
-            self.sleep(0.1)
 
-    #
-    # Video DSP Settings
-    #
-    def getVideoDspSettings(self, device):
+    #
+    # Video DSP Settings
+    #
+    def getVideoDspSettings(self, device):
+        """
+        Placeholder - fixme
+
+        :param device:
+        :return:
+        """
+        self.debugLog(f"getVideoDspSettings: Getting {device.name} video DSP settings.")
+
+        dev_type = device.deviceTypeId
+
+        # Make sure it's not a virtual volume device.
+        if dev_type != "virtualVolume":
+            self.sendCommand(device, "?VTB")  # Video Converter status.
+            self.sendCommand(device, "?VTC")  # Resolution Preferences status.
+            self.sendCommand(device, "?VTD")  # Pure Cinema Mode.
+            self.sendCommand(device, "?VTE")  # Progressive Motion Quality.
+            self.sendCommand(device, "?VTG")  # Advanced Video Adjustment mode.
+            self.sendCommand(device, "?VTH")  # YNR amount.
+            self.sendCommand(device, "?VTL")  # Video Detail adjustment.
+
+    #
+    # Audio I/O Status
+    #
+    def getAudioInOutStatus(self, device):
+        """
+        Get the audio (and then video) I/O status once the signal from a newly selected input source has settled.
+
+        Since this method is called just after an input source change, the receiver needs a moment to lock on to the new
+        signal. Rather than block the I/O thread, the audio status query is scheduled AV_SETTLE_DELAY seconds out and
+        repeated with a doubling wait (up to AV_SETTLE_MAX_DELAY) for as long as the answer keeps changing. The video
+        status is asked for once the audio status has settled. Another source change starts the check over.
+
+        :param device:
+        :return:
+        """
+        self.debugLog(f"getAudioInOutStatus: Getting {device.name} audio I/O status.")
+
+        dev_type = device.deviceTypeId
+
+        # Make sure it's not a virtual volume device.
+        if dev_type != "virtualVolume":
+            receiver = self.receivers.get(device.id)
+            if receiver is None:
+                return
+            self.io_engine.cancel(receiver.av_settle_timer)
+            receiver.av_settle_reply = None
+            receiver.av_settle_response = None
+            receiver.av_settle_delay = AV_SETTLE_DELAY
+            receiver.av_settle_timer = self.io_engine.call_later(AV_SETTLE_DELAY, self.checkAvSettle, device.id)
+
+    ########################################
+    def checkAvSettle(self, device_id):
+        """
+        Ask for the audio status as part of the settle check started by getAudioInOutStatus. Runs on the I/O thread.
+
+        :param device_id:
+        :return:
+        """
+        receiver = self.receivers.get(device_id)
+        if receiver is None:
+            return
+        receiver.av_settle_timer = None
+        receiver.av_settle_asked = time.monotonic()
+        reply = self.queryReceiver(receiver.device, "?AST")  # Audio Status.
+        receiver.av_settle_reply = reply
+        reply.add_done_callback(functools.partial(self.avSettleAnswered, device_id))
+
+    ########################################
+    def avSettleAnswered(self, device_id, reply):
+        """
+        Look at the answer to a settle check audio status query: ask again a little later if it changed since the last
+        one, otherwise ask for the video status and stop. Runs on the I/O thread.
+
+        A settled answer refreshes the avIO state group as of when it was asked for, unless something made the group
+        out of date since then, so the next incremental refresh doesn't ask for the audio and video status again.
+
+        :param device_id:
+        :param reply: the query's future.
+        :return:
+        """
+        receiver = self.receivers.get(device_id)
+        if receiver is None or reply is not receiver.av_settle_reply:
+            # The session ended or another source change started a new check.
+            return
+        receiver.av_settle_reply = None
+        try:
+            response = reply.result()
+        except (ReceiverError, ConnectionError, ValueError, TimeoutError) as err:
+            self.debugLog(f"avSettleAnswered: No audio status from {receiver.name}: {err}")
+            return
+        if response != receiver.av_settle_response and receiver.av_settle_delay < AV_SETTLE_MAX_DELAY:
+            # Still changing (or this is the first answer). Check again after a longer wait.
+            receiver.av_settle_response = response
+            receiver.av_settle_delay = min(receiver.av_settle_delay * 2, AV_SETTLE_MAX_DELAY)
+            receiver.av_settle_timer = self.io_engine.call_later(
+                receiver.av_settle_delay, self.checkAvSettle, device_id
+            )
+            return
+        receiver.av_settle_response = None
+        self.sendCommand(receiver.device, "?VST")  # Video Status.
+        asked = receiver.av_settle_asked
+        if receiver.group_invalidated.get('avIO', asked) <= asked:
+            receiver.group_refreshed['avIO'] = asked
+
+    #
+    # All Status Information
+    #
+    def getReceiverStatus(self, device, stale_only=False):
+        """
+        Refresh the receiver's states, one state group (see STATE_GROUP_TTLS) at a time.
+
+        :param device:
+        :param stale_only: only ask for the groups that are out of date or older than their time to live.
+        :return:
+        """
+        # Refresh sweeps are only ever run on the I/O thread.
+        if threading.current_thread() is not self.io_engine.poll_thread and self.io_engine.poll_thread is not None:
+            self.io_engine.call_later(0, self.getReceiverStatus, device, stale_only)
+            return
+        self.debugLog(f"getReceiverStatus: Getting all information for {device.name}.")
+
+        # Make sure it's a started receiver (not a virtual volume device).
+        receiver = self.receivers.get(device.id)
+        if receiver is None:
+            return
+
+        # Only one refresh sweep per receiver is ever under way. Refreshes asked for in the meantime are merged into a
+        # single follow-up pass, run when the sweep finishes, that asks for whatever is out of date by then: the groups
+        # the sweep didn't cover (for example those of a zone that turned on halfway through it), and every group if a
+        # full refresh was asked for.
+        if receiver.refresh_sweep is not None:
+            if not stale_only:
+                self.invalidateStateGroups(device, STATE_GROUP_TTLS)
+            receiver.refresh_follow_up = True
+            self.debugLog(f"getReceiverStatus: {device.name} is already being refreshed; a follow-up pass will be run.")
+            return
+
+        # Indicate in the log that we're going to be gathering all kinds of information.
+        self.receiverLog(device, "Gathering receiver system information.")
+
+        # Note where the counters stand so the time and traffic of this refresh can be reported at the end. The tuple
+        # also identifies the sweep, so the callbacks of one cut short by the end of its session are ignored.
+        sweep = (time.monotonic(), receiver.commands_sent, receiver.replies_timed_out)
+        receiver.refresh_sweep = sweep
+        # What else to ask for depends on which zones are on, so get the power status first.
+        groups = []
+        if not stale_only or self.isStateGroupStale(device, 'power'):
+            groups.append('power')
+            self.queryStateGroup(device, 'power')  # Power Status.
+        self.getDisplayContent(device)  # Display Content Query.
+        self.queueCallback(device, functools.partial(self.getPoweredZoneStatus, device.id, sweep, stale_only, groups))
+
+    ########################################
+    def getPoweredZoneStatus(self, device_id, sweep=None, stale_only=False, groups=None):
+        """
+        Second half of getReceiverStatus: query the input source names and the settings that only matter for zones that
+        are turned on. Runs on the I/O thread once the power status queries have been answered. The queries are
+        pipelined (see QUERY_WINDOW), so the whole refresh takes a few round trips' worth of time rather than one round
+        trip per query.
+
+        :param device_id:
+        :param sweep: (start time, commands sent, replies timed out) when the refresh began.
+        :param stale_only: only ask for the state groups that are out of date.
+        :param groups: list of the state groups already asked for; the ones asked for here are added to it.
+        :return:
+        """
+        receiver = self.receivers.get(device_id)
+        if receiver is None or receiver.refresh_sweep is not sweep:
+            # The session ended before the power status came back.
+            return
+
+        device = receiver.device
+        groups = [] if groups is None else groups
+        # Input source names, then information related to both zones, then information relevant only to the main
+        # zone (1).
+        wanted = ['sourceNames']
+        if self.getDeviceState(device, 'zone1power') or self.getDeviceState(device, 'zone2power'):
+            wanted += ['volume', 'source', 'avIO', 'tuner', 'systemSetup']
+        if self.getDeviceState(device, 'zone1power'):
+            wanted += ['audioDsp', 'videoDsp', 'channelLevels']
+        for group in wanted:
+            if not stale_only or self.isStateGroupStale(device, group):
+                groups.append(group)
+                self.queryStateGroup(device, group)
+        self.debugLog(f"getPoweredZoneStatus: Refreshing {', '.join(groups) or 'nothing'} for {device.name}.")
+
+        # Report on the refresh and run any follow-up pass once all the answers are in.
+        self.queueCallback(device, functools.partial(self.finishReceiverStatus, device_id, sweep, groups))
+
+    ########################################
+    def queryStateGroup(self, device, group):
         """
-        Placeholder - fixme
+        Queue the status queries for one state group (see STATE_GROUP_TTLS).
 
         :param device:
+        :param group: state group name.
         :return:
         """
-        self.debugLog(f"getVideoDspSettings: Getting {device.name} video DSP settings.")
+        # Skip the queries the receiver has said it doesn't support (see sendCommand).
+        self.refreshing.active = True
+        try:
+            if group == 'power':
+                self.getPowerStatus(device)  # Power Status.
+            elif group == 'sourceNames':
+                self.getInputSourceNames(device)  # Input Source Names.
+            elif group == 'volume':
+                self.getVolumeStatus(device)  # Volume Status.
+                self.getMuteStatus(device)  # Mute Status
+            elif group == 'source':
+                self.getInputSourceStatus(device)  # Input Source Status.
+            elif group == 'avIO':
+                # The input source isn't changing during a refresh, so there's no need to let it settle before asking
+                # for the audio and video I/O status (as getAudioInOutStatus does).
+                self.sendCommand(device, "?AST")  # Audio Status.
+                self.sendCommand(device, "?VST")  # Video Status.
+            elif group == 'tuner':
+                self.getTunerPresetNames(device)  # Tuner Preset Names.
+                self.getTunerPresetStatus(device)  # Tuner Preset Status.
+                # self.getTunerFrequency(device)  # Tuner Band and Frequency.
+            elif group == 'systemSetup':
+                self.getSystemSetupStatus(device)  # System Setup Status.
+            elif group == 'audioDsp':
+                self.getAudioDspSettings(device)  # Audio DSP Settings.
+            elif group == 'videoDsp':
+                self.getVideoDspSettings(device)  # Video DSP Settings.
+            elif group == 'channelLevels':
+                self.getChannelVolumeLevels(device)  # Channel Volume Levels.
+        finally:
+            self.refreshing.active = False
 
-        dev_type = device.deviceTypeId
+    ########################################
+    def isStateGroupStale(self, device, group):
+        """
+        Report whether a state group needs refreshing: it hasn't been refreshed this session, something has made it out
+        of date since, or it's older than its time to live.
 
-        # Make sure it's not a virtual volume device.
-        if dev_type != "virtualVolume":
-            self.sendCommand(device, "?VTB")  # Video Converter status.
-            self.sleep(0.1)
-            self.sendCommand(device, "?VTC")  # Resolution Preferences status.
-            self.sleep(0.1)
-            self.sendCommand(device, "?VTD")  # Pure Cinema Mode.
-            self.sleep(0.1)
-            self.sendCommand(device, "?VTE")  # Progressive Motion Quality.
-            self.sleep(0.1)
-            self.sendCommand(device, "?VTG")  # Advanced Video Adjustment mode.
-            self.sleep(0.1)
-            self.sendCommand(device, "?VTH")  # YNR amount.
-            self.sleep(0.1)
-            self.sendCommand(device, "?VTL")  # Video Detail adjustment.
-            self.sleep(0.1)
+        :param device:
+        :param group: state group name.
+        :return: bool
+        """
+        receiver = self.receivers.get(device.id)
+        if receiver is None:
+            return True
+        refreshed = receiver.group_refreshed.get(group)
+        return refreshed is None or time.monotonic() - refreshed >= STATE_GROUP_TTLS[group]
 
-    #
-    # Audio I/O Status
-    #
-    def getAudioInOutStatus(self, device):
+    ########################################
+    def invalidateStateGroups(self, device, groups):
         """
-        Placeholder - fixme
+        Mark state groups out of date, so the next incremental refresh asks for them again.
 
         :param device:
+        :param groups: state group names.
         :return:
         """
-        self.debugLog(f"getAudioInOutStatus: Getting {device.name} audio I/O status.")
+        receiver = self.receivers.get(device.id)
+        if receiver is None:
+            return
+        now = time.monotonic()
+        for group in groups:
+            receiver.group_refreshed.pop(group, None)
+            receiver.group_invalidated[group] = now
 
-        dev_type = device.deviceTypeId
+    ########################################
+    def finishReceiverStatus(self, device_id, sweep, groups=()):
+        """
+        Last step of getReceiverStatus. Runs on the I/O thread once every refresh query has been answered or has timed
+        out.
 
-        # Make sure it's not a virtual volume device.
-        if dev_type != "virtualVolume":
-            # Since this method is called just after an input source change, wait a bit for the system to finalize the
-            # change.
-            self.sleep(1)
-            self.sendCommand(device, "?AST")  # Audio Status.
+        :param device_id:
+        :param sweep: (start time, commands sent, replies timed out) when the refresh began.
+        :param groups: the state groups that were refreshed.
+        :return:
+        """
+        receiver = self.receivers.get(device_id)
+        if receiver is None or receiver.refresh_sweep is not sweep:
+            # The session ended before the refresh did.
+            return
+        receiver.refresh_sweep = None
+        started, commands_sent, replies_timed_out = sweep
+        # The groups are current as of the start of the refresh, unless something made them out of date since then.
+        for group in groups:
+            if receiver.group_invalidated.get(group, started) <= started:
+                receiver.group_refreshed[group] = started
+        self.receiverLog(
+            receiver.device, f"Gathered receiver system information in {time.monotonic() - started:.2f} seconds."
+        )
+        self.debugLog(
+            f"finishReceiverStatus: {receiver.commands_sent - commands_sent} queries sent to {receiver.name}, "
+            f"{receiver.replies_timed_out - replies_timed_out} unanswered. Worst wait for data: "
+            f"{receiver.worst_stall * 1000:.1f} ms ({self.worst_io_stall * 1000:.1f} ms across all receivers)."
+        )
+        if receiver.unverified_groups:
+            # The refresh has verified the restored groups, except those its answers made out of date (a zone turned
+            # off or another input source selected while the plugin wasn't running). Those are asked for again.
+            if not receiver.unverified_groups.issubset(receiver.group_refreshed):
+                receiver.refresh_follow_up = True
+            receiver.unverified_groups.clear()
+        if receiver.refresh_follow_up:
+            receiver.refresh_follow_up = False
+            self.getReceiverStatus(receiver.device, stale_only=True)
 
+    #########################################
+    # Volume Fades
     #
-    # Video I/O Status
-    #
-    def getVideoInOutStatus(self, device):
+    #   A fade steps a zone's volume to a new level along a curve (see VolumeFade). The steps are timed by I/O engine
+    #   timers and written with the zone's set volume command through the command queue, so each one waits for the
+    #   receiver to answer the one before it. If the receiver says it's busy (B00), the step is tried again with a
+    #   longer wait between steps. Another volume or mute action, a volume change made some other way (such as the
+    #   receiver's remote control), muting the zone or turning it off stops the fade.
+    #########################################
+    def startVolumeFade(self, device, zone, target, duration, curve, start=None):
         """
-        Placeholder - fixme
+        Fade a zone's volume to a new level, replacing any fade already under way on the zone. Safe to call from any
+        thread.
 
         :param device:
+        :param zone: 1 or 2.
+        :param target: volume (dB) to end the fade at.
+        :param duration: seconds the fade takes.
+        :param curve: one of VOLUME_FADE_CURVES.
+        :param start: volume (dB) to start the fade at, or None to start at the current volume.
         :return:
         """
-        self.debugLog(f"getVideoInOutStatus: Getting {device.name} video I/O status.")
+        # Fades are only ever run on the I/O thread.
+        if threading.current_thread() is not self.io_engine.poll_thread and self.io_engine.poll_thread is not None:
+            self.io_engine.call_later(0, self.startVolumeFade, device, zone, target, duration, curve, start)
+            return
+        receiver = self.receivers.get(device.id)
+        if receiver is None or not receiver.connected:
+            self.receiverError(device, f"Unable to fade the zone {zone} volume of {device.name}. It is not connected.")
+            return
+        self.stopVolumeFade(device, zone)
+
+        if start is None:
+            start = self.getDeviceState(device, f"zone{zone}volume")
+        fade = VolumeFade(
+            zone, self.getVolumeUnits(zone, start), self.getVolumeUnits(zone, target), time.monotonic(), duration, curve
+        )
+        receiver.volume_fades[zone] = fade
+        self.debugLog(
+            f"startVolumeFade: Fading {device.name} zone {zone} volume from {fade.start} to {fade.target} over "
+            f"{duration} seconds ({curve})."
+        )
+        self.stepVolumeFade(device.id, fade)
 
-        dev_type = device.deviceTypeId
+    ########################################
+    def stepVolumeFade(self, device_id, fade):
+        """
+        Write the next step of a volume fade, if the volume should have moved since the last one. Runs on the I/O
+        thread.
 
-        # Make sure it's not a virtual volume device.
-        if dev_type != "virtualVolume":
-            # Since this method is called just after an input source change, wait half a second for the system to
-            # finalize the change.
-            self.sleep(0.5)
-            self.sendCommand(device, "?VST")  # Video Status.
+        :param device_id:
+        :param fade: VolumeFade instance.
+        :return:
+        """
+        receiver = self.receivers.get(device_id)
+        if receiver is None or receiver.volume_fades.get(fade.zone) is not fade:
+            # The fade has been stopped.
+            return
+        fade.timer = None
+        if fade.reply is not None:
+            # Still waiting for the receiver to answer the last step. volumeFadeStepAnswered carries on from there.
+            return
+        device = receiver.device
+        if not self.getDeviceState(device, f"zone{fade.zone}power"):
+            self.stopVolumeFade(device, fade.zone, f"zone {fade.zone} is off")
+            return
 
-    #
-    # All Status Information
-    #
-    def getReceiverStatus(self, device):
+        now = time.monotonic()
+        level = fade.level_at(now)
+        if level == fade.level:
+            self.scheduleVolumeFadeStep(receiver, fade)
+            return
+        suffix, digits, _, _, _ = VOLUME_COMMAND_UNITS[fade.zone]
+        if fade.level is not None:
+            fade.previous = fade.level
+        elif fade.previous is None:
+            fade.previous = self.getVolumeUnits(fade.zone, self.getDeviceState(device, f"zone{fade.zone}volume"))
+        fade.level = level
+        fade.written = now
+        fade.reply = concurrent.futures.Future()
+        fade.reply.add_done_callback(functools.partial(self.volumeFadeStepAnswered, device_id, fade))
+        self.queueCommand(device, f"{level:0{digits}d}{suffix}", fade.reply)  # Set Volume.
+
+    ########################################
+    def volumeFadeStepAnswered(self, device_id, fade, reply):
         """
-        Placeholder - fixme
+        Carry on with a volume fade once the receiver has answered its last step. Runs on the I/O thread.
 
-        :param device:
+        :param device_id:
+        :param fade: VolumeFade instance.
+        :param reply: the step's reply future.
         :return:
         """
-        self.debugLog(f"getReceiverStatus: Getting all information for{device.name}.")
-        self.debugLog(f"getReceiverStatus: List of device IDs being updated: {self.devicesBeingUpdated}")
+        receiver = self.receivers.get(device_id)
+        if receiver is None or receiver.volume_fades.get(fade.zone) is not fade:
+            return
+        fade.reply = None
+        try:
+            reply.result()
+        except (ReceiverError, TimeoutError) as err:
+            if isinstance(err, ReceiverError) and err.response != "B00":
+                self.stopVolumeFade(receiver.device, fade.zone, f"the receiver refused it ({err})")
+                return
+            # The receiver is busy (or slow to answer). Give it more time between steps and try this one again.
+            fade.step_interval = min(fade.step_interval * 2, VOLUME_FADE_MAX_STEP_INTERVAL)
+            fade.level = None
+            self.debugLog(
+                f"volumeFadeStepAnswered: {receiver.name} didn't take a step ({err}). Waiting "
+                f"{fade.step_interval:.1f} seconds between steps."
+            )
+        except ConnectionError:
+            # The session has ended (closeSession stops the fade).
+            return
+        else:
+            fade.previous = fade.level
+            if fade.level == fade.target:
+                del receiver.volume_fades[fade.zone]
+                self.debugLog(f"volumeFadeStepAnswered: {receiver.name} zone {fade.zone} volume fade finished.")
+                return
+        self.scheduleVolumeFadeStep(receiver, fade)
 
-        # Make sure we aren't already updating this device.
-        if device.id not in self.devicesBeingUpdated:
-            # Add it to the list of devices being updated.
-            self.devicesBeingUpdated.append(device.id)
+    ########################################
+    def scheduleVolumeFadeStep(self, receiver, fade):
+        """
+        Set the timer for the next step of a volume fade.
 
-            # Now gather all receiver data.
+        :param receiver: ReceiverShadow instance.
+        :param fade: VolumeFade instance.
+        :return:
+        """
+        now = time.monotonic()
+        fade.timer = self.io_engine.call_later(
+            fade.next_step_time(now) - now, self.stepVolumeFade, receiver.device_id, fade
+        )
 
-            dev_type = device.deviceTypeId
+    ########################################
+    def stopVolumeFade(self, device, zone, reason=None):
+        """
+        Stop the volume fade under way on a zone, if there is one. Safe to call from any thread; a step already queued
+        is still written.
 
-            # Indicate in the log that we're going to be gathering all kinds of information.
-            indigo.server.log("Gathering receiver system information.", device.name)
+        :param device:
+        :param zone: 1 or 2.
+        :param reason: why the fade is being stopped, for the log (None to stop it without logging).
+        :return:
+        """
+        # Fades are only ever run on the I/O thread. Steps that fall due before it gets to this were queued before
+        # anything the calling thread queues next, so they can't undo it.
+        if threading.current_thread() is not self.io_engine.poll_thread and self.io_engine.poll_thread is not None:
+            self.io_engine.call_later(0, self.stopVolumeFade, device, zone, reason)
+            return
+        receiver = self.receivers.get(device.id)
+        fade = receiver.volume_fades.pop(zone, None) if receiver is not None else None
+        if fade is None:
+            return
+        self.io_engine.cancel(fade.timer)
+        if reason:
+            self.receiverLog(device, f"Stopped the volume fade (zone {zone}): {reason}.")
 
-            # Make sure it's not a virtual volume device.
-            if dev_type != "virtualVolume":
-                # Get this information regardless of whether the receiver is on or off.
-                self.getDisplayContent(device)  # Display Content Query.
-                self.getPowerStatus(device)  # Power Status.
-                self.getInputSourceNames(device)  # Input Source Names.
+    ########################################
+    def checkVolumeFade(self, device, zone, units):
+        """
+        Stop a zone's volume fade if the receiver reports a volume the fade didn't set. Runs on the I/O thread.
 
-                # Information related to both zones...
-                if device.states['zone1power'] or device.states['zone2power']:
-                    self.getVolumeStatus(device)  # Volume Status.
-                    self.getMuteStatus(device)  # Mute Status
-                    self.getInputSourceStatus(device)  # Input Source Status.
-                    self.getAudioInOutStatus(device)  # Audio I/O Status.
-                    self.getVideoInOutStatus(device)  # Video I/O Status.
-                    self.getTunerPresetNames(device)  # Tuner Preset Names.
-                    self.getTunerPresetStatus(device)  # Tuner Preset Status.
-                    # self.getTunerFrequency(device)  # Tuner Band and Frequency.
-                    self.getSystemSetupStatus(device)  # System Setup Status.
-
-                # Information relevant only to the main zone (1)...
-                if device.states['zone1power']:
-                    self.getAudioDspSettings(device)  # Audio DSP Settings.
-                    self.getVideoDspSettings(device)  # Video DSP Settings.
-                    self.getChannelVolumeLevels(device)  # Channel Volume Levels.
-
-            self.sleep(0.5)  # Wait a bit for processing.
-
-            # Now remove the device from the list of devices being updated.
-            self.devicesBeingUpdated.remove(device.id)
+        :param device:
+        :param zone: 1 or 2.
+        :param units: the reported volume, in volume command units.
+        :return:
+        """
+        receiver = self.receivers.get(device.id)
+        fade = receiver.volume_fades.get(zone) if receiver is not None else None
+        if fade is not None and fade.level is not None and units not in (fade.level, fade.previous):
+            self.stopVolumeFade(device, zone, "the volume was changed")
+
+    ########################################
+    @staticmethod
+    def getVolumeUnits(zone, volume):
+        """
+        Convert a volume in dB to a zone's volume command units (see VOLUME_COMMAND_UNITS), within the zone's range.
+
+        :param zone: 1 or 2.
+        :param volume: volume (dB). The minimum volume state value (-999) gives the lowest volume.
+        :return: int
+        """
+        _, _, units_per_db, zero_db, highest = VOLUME_COMMAND_UNITS[zone]
+        return min(max(zero_db + int(round(float(volume) * units_per_db)), 0), highest)
 
     #########################################
     # ACTION METHODS
@@ -2620,7 +3595,6 @@ class Plugin(indigo.PluginBase):
         if device.deviceTypeId == "vsx1021k":
             command = "PO"  # Power On
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
         # For VSX-1022-K and later.
         if device.deviceTypeId in ["vsx1022k", "vsx1122k", "vsx1123k", "sc75"]:
@@ -2631,11 +3605,9 @@ class Plugin(indigo.PluginBase):
             #         or device.deviceTypeId == "sc75"):
             command = "PO"  # Power On
             self.sendCommand(device, command)
-            self.sleep(0.1)
             # Pioneer suggests that for 2012 and later models, this command be sent twice.
             command = "PO"  # Power On
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Power Off (Zone 1)
@@ -2665,7 +3637,6 @@ class Plugin(indigo.PluginBase):
         if device.deviceTypeId != "virtualVolume":
             command = "PF"  # Power Off
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Power Toggle (Zone 1)
@@ -2693,12 +3664,10 @@ class Plugin(indigo.PluginBase):
 
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
-            command = "?P"  # Query power status first to wake up 2012+ receiver CPUs.
-            self.sendCommand(device, command)
-            self.sleep(0.1)
+            # Query power status first to wake up 2012+ receiver CPUs, and wait until it has answered.
+            self.waitForQuery(device, "?P")
             command = "PZ"  # Power Toggle
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Volume Up 0.5 dB (Zone 1)
@@ -2724,11 +3693,13 @@ class Plugin(indigo.PluginBase):
             )
             return False
 
+        # Another volume or mute action stops any volume fade under way.
+        self.stopVolumeFade(device, 1, "another volume or mute action was run")
+
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
             command = "VU"  # Volume Up
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Volume Down 0.5 dB (Zone 1)
@@ -2754,11 +3725,13 @@ class Plugin(indigo.PluginBase):
             )
             return False
 
+        # Another volume or mute action stops any volume fade under way.
+        self.stopVolumeFade(device, 1, "another volume or mute action was run")
+
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
             command = "VD"  # Volume Down
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Set Volume in dB (Zone 1)
@@ -2790,6 +3763,9 @@ class Plugin(indigo.PluginBase):
 
         self.debugLog(f"Set volume to {new_value} dB (zone 1) for {device.name}")
 
+        # Another volume or mute action stops any volume fade under way.
+        self.stopVolumeFade(device, 1, "another volume or mute action was run")
+
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
             new_value = 161 + int(new_value / 0.5)
@@ -2801,7 +3777,58 @@ class Plugin(indigo.PluginBase):
                 new_value = f"{new_value}"
             command = new_value + "VL"  # Set Volume.
             self.sendCommand(device, command)
-            self.sleep(0.1)
+
+    #
+    # Fade Volume in dB (Zone 1)
+    #
+    def zone1fadeVolume(self, action):
+        """
+        Fade the zone 1 volume to a new level over a number of seconds (see startVolumeFade).
+
+        :param action:
+        :return:
+        """
+        device = indigo.devices[action.deviceId]
+
+        # Catch attempts to send a command to a Virtual Volume Controller device, which is not possible (but because
+        # it's not currently possible to prevent the user from selecting it as a destination device in the Indigo UI,
+        # we must check for it).
+        if device.deviceTypeId == "virtualVolume":
+            self.errorLog(
+                f"Device \"{device.name}\" is a Virtual Volume Controller, not a Pioneer receiver. Modify the Indigo "
+                f"action to send the command to a Pioneer receiver instead of this device."
+            )
+            return False
+
+        try:
+            new_value = float(action.props.get('volume', "-90"))
+            start_value = action.props.get('startVolume', "").strip()
+            start_value = float(start_value) if start_value else None
+            duration = float(action.props.get('duration', "0"))
+        except ValueError:
+            self.errorLog(f"The Zone 1 volume fade action for \"{device.name}\" has an invalid volume or fade time.")
+            return False
+        if new_value == -90.0:  # No value was provided.
+            self.errorLog(f"No Zone 1 Volume was specified in the action for \"{device.name}\"")
+            return False
+        curve = action.props.get('curve', "linear")
+
+        self.debugLog(f"Fade volume to {new_value} dB over {duration} seconds (zone 1) for {device.name}")
+        self.startVolumeFade(device, 1, new_value, duration, curve, start_value)
+
+    #
+    # Stop Volume Fade (Zone 1)
+    #
+    def zone1stopVolumeFade(self, action):
+        """
+        Stop the zone 1 volume fade under way, leaving the volume where it is.
+
+        :param action:
+        :return:
+        """
+        device = indigo.devices[action.deviceId]
+        self.debugLog(f"Stopping the volume fade (zone 1) for {device.name}")
+        self.stopVolumeFade(device, 1, "the Stop Volume Fade action was run")
 
     #
     # Mute On (Zone 1)
@@ -2826,11 +3853,13 @@ class Plugin(indigo.PluginBase):
                 f"action to send the command to a Pioneer receiver instead of this device.")
             return False
 
+        # Another volume or mute action stops any volume fade under way.
+        self.stopVolumeFade(device, 1, "another volume or mute action was run")
+
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
             command = "MO"  # Mute On
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Mute Off (Zone 1)
@@ -2856,11 +3885,13 @@ class Plugin(indigo.PluginBase):
             )
             return False
 
+        # Another volume or mute action stops any volume fade under way.
+        self.stopVolumeFade(device, 1, "another volume or mute action was run")
+
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
             command = "MF"  # Mute Off
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Mute Toggle (Zone 1)
@@ -2886,11 +3917,13 @@ class Plugin(indigo.PluginBase):
             )
             return False
 
+        # Another volume or mute action stops any volume fade under way.
+        self.stopVolumeFade(device, 1, "another volume or mute action was run")
+
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
             command = "MZ"  # Toggle Mute
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Select Next Source (Zone 1)
@@ -2920,7 +3953,6 @@ class Plugin(indigo.PluginBase):
         if device.deviceTypeId != "virtualVolume":
             command = "FU"  # Source Up (Next)
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Select Previous Source (Zone 1)
@@ -2950,7 +3982,6 @@ class Plugin(indigo.PluginBase):
         if device.deviceTypeId != "virtualVolume":
             command = "FD"  # Source Down (Previous)
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Set Input Source (Zone 1)
@@ -2987,7 +4018,6 @@ class Plugin(indigo.PluginBase):
         if device.deviceTypeId != "virtualVolume":
             command = new_value + "FN"  # Set Source.
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Power On (Zone 2)
@@ -3017,7 +4047,6 @@ class Plugin(indigo.PluginBase):
         if device.deviceTypeId != "virtualVolume":
             command = "APO"  # Power On
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Power Off (Zone 2)
@@ -3047,7 +4076,6 @@ class Plugin(indigo.PluginBase):
         if device.deviceTypeId != "virtualVolume":
             command = "APF"  # Power Off
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Power Toggle (Zone 2)
@@ -3077,7 +4105,6 @@ class Plugin(indigo.PluginBase):
         if device.deviceTypeId != "virtualVolume":
             command = "APZ"  # Power Toggle
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Volume Up 1 dB (Zone 2)
@@ -3103,13 +4130,15 @@ class Plugin(indigo.PluginBase):
             )
             return False
 
+        # Another volume or mute action stops any volume fade under way.
+        self.stopVolumeFade(device, 2, "another volume or mute action was run")
+
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
             # If the current speaker system setup is not "A + Zone 2", zone mute and volume commands will be ignored.
             if device.states['speakerSystem'] == "A + Zone 2":
                 command = "ZU"  # Volume Up
                 self.sendCommand(device, command)
-                self.sleep(0.1)
             else:
                 self.errorLog(
                     f"Zone 2 mute and volume level control not supported with the {device.states['speakerSystem']} "
@@ -3141,13 +4170,15 @@ class Plugin(indigo.PluginBase):
             )
             return False
 
+        # Another volume or mute action stops any volume fade under way.
+        self.stopVolumeFade(device, 2, "another volume or mute action was run")
+
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
             # If the current speaker system setup is not "A + Zone 2", zone mute and volume commands will be ignored.
             if device.states['speakerSystem'] == "A + Zone 2":
                 command = "ZD"  # Volume Down
                 self.sendCommand(device, command)
-                self.sleep(0.1)
             else:
                 self.errorLog(
                     f"Zone 2 mute and volume level control not supported with the {device.states['speakerSystem']} "
@@ -3185,6 +4216,9 @@ class Plugin(indigo.PluginBase):
 
         self.debugLog(f"Set volume to {new_value} dB (zone 2) for {device.name}")
 
+        # Another volume or mute action stops any volume fade under way.
+        self.stopVolumeFade(device, 2, "another volume or mute action was run")
+
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
             # If the current speaker system setup is not "A + Zone 2", zone mute and volume commands will be ignored.
@@ -3196,7 +4230,6 @@ class Plugin(indigo.PluginBase):
                     new_value = str(new_value)
                 command = new_value + "ZV"  # Set Volume.
                 self.sendCommand(device, command)
-                self.sleep(0.1)
             else:
                 self.errorLog(
                     f"Zone 2 mute and volume level control not supported with the {device.states['speakerSystem']} "
@@ -3204,6 +4237,67 @@ class Plugin(indigo.PluginBase):
                     f"Speaker System setup menu."
                 )
 
+    #
+    # Fade Volume in dB (Zone 2)
+    #
+    def zone2fadeVolume(self, action):
+        """
+        Fade the zone 2 volume to a new level over a number of seconds (see startVolumeFade).
+
+        :param action:
+        :return:
+        """
+        device = indigo.devices[action.deviceId]
+
+        # Catch attempts to send a command to a Virtual Volume Controller device, which is not possible (but because
+        # it's not currently possible to prevent the user from selecting it as a destination device in the Indigo UI,
+        # we must check for it).
+        if device.deviceTypeId == "virtualVolume":
+            self.errorLog(
+                f"Device \"{device.name}\" is a Virtual Volume Controller, not a Pioneer receiver. Modify the Indigo "
+                f"action to send the command to a Pioneer receiver instead of this device."
+            )
+            return False
+
+        try:
+            new_value = float(action.props.get('volume', "-90"))
+            start_value = action.props.get('startVolume', "").strip()
+            start_value = float(start_value) if start_value else None
+            duration = float(action.props.get('duration', "0"))
+        except ValueError:
+            self.errorLog(f"The Zone 2 volume fade action for \"{device.name}\" has an invalid volume or fade time.")
+            return False
+        if new_value == -90.0:  # No value was provided.
+            self.errorLog(f"No Zone 2 Volume was specified in the action for \"{device.name}\"")
+            return False
+        curve = action.props.get('curve', "linear")
+
+        # If the current speaker system setup is not "A + Zone 2", zone mute and volume commands will be ignored.
+        if device.states['speakerSystem'] != "A + Zone 2":
+            self.errorLog(
+                f"Zone 2 mute and volume level control not supported with the {device.states['speakerSystem']} "
+                f"speaker system layout. The speaker system must be set to \"Zone 2\" in receiver's System Setup > "
+                f"Speaker System setup menu."
+            )
+            return False
+
+        self.debugLog(f"Fade volume to {new_value} dB over {duration} seconds (zone 2) for {device.name}")
+        self.startVolumeFade(device, 2, new_value, duration, curve, start_value)
+
+    #
+    # Stop Volume Fade (Zone 2)
+    #
+    def zone2stopVolumeFade(self, action):
+        """
+        Stop the zone 2 volume fade under way, leaving the volume where it is.
+
+        :param action:
+        :return:
+        """
+        device = indigo.devices[action.deviceId]
+        self.debugLog(f"Stopping the volume fade (zone 2) for {device.name}")
+        self.stopVolumeFade(device, 2, "the Stop Volume Fade action was run")
+
     #
     # Mute On (Zone 2)
     #
@@ -3228,6 +4322,9 @@ class Plugin(indigo.PluginBase):
             )
             return False
 
+        # Another volume or mute action stops any volume fade under way.
+        self.stopVolumeFade(device, 2, "another volume or mute action was run")
+
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
             # If the current speaker system setup is not "A + Zone 2",
@@ -3235,7 +4332,6 @@ class Plugin(indigo.PluginBase):
             if device.states['speakerSystem'] == "A + Zone 2":
                 command = "Z2MO"  # Mute On
                 self.sendCommand(device, command)
-                self.sleep(0.1)
             else:
                 self.errorLog(
                     f"Zone 2 mute and volume level control not supported with the {device.states['speakerSystem']} "
@@ -3267,13 +4363,15 @@ class Plugin(indigo.PluginBase):
             )
             return False
 
+        # Another volume or mute action stops any volume fade under way.
+        self.stopVolumeFade(device, 2, "another volume or mute action was run")
+
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
             # If the current speaker system setup is not "A + Zone 2", zone mute and volume commands will be ignored.
             if device.states['speakerSystem'] == "A + Zone 2":
                 command = "Z2MF"  # Mute Off
                 self.sendCommand(device, command)
-                self.sleep(0.1)
             else:
                 self.errorLog(
                     f"Zone 2 mute and volume level control not supported with the {device.states['speakerSystem']} "
@@ -3305,13 +4403,15 @@ class Plugin(indigo.PluginBase):
             )
             return False
 
+        # Another volume or mute action stops any volume fade under way.
+        self.stopVolumeFade(device, 2, "another volume or mute action was run")
+
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
             # If the current speaker system setup is not "A + Zone 2", zone mute and volume commands will be ignored.
             if device.states['speakerSystem'] == "A + Zone 2":
                 command = "Z2MZ"  # Toggle Mute
                 self.sendCommand(device, command)
-                self.sleep(0.1)
             else:
                 self.errorLog(
                     f"Zone 2 mute and volume level control not supported with the {device.states['speakerSystem']} "
@@ -3350,7 +4450,6 @@ class Plugin(indigo.PluginBase):
         if device.deviceTypeId != "virtualVolume":
             command = new_value + "ZS"  # Set Source.
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Select Tuner Preset
@@ -3389,7 +4488,6 @@ class Plugin(indigo.PluginBase):
             if (device.states['zone1source'] == 2) or (device.states['zone2source'] == 2):
                 command = new_value + "PR"  # Select Tuner Preset.
                 self.sendCommand(device, command)
-                self.sleep(0.1)
             else:
                 # Neither of zones 1 or 2 are using the Tuner. Cannot set the preset.
                 self.errorLog(
@@ -3463,13 +4561,10 @@ class Plugin(indigo.PluginBase):
 
                 # Start sending the command.
                 self.sendCommand(device, band_command)  # Set the frequency band.
-                self.sleep(0.1)  # Wait for the band to change.
                 self.sendCommand(device, "TAC")  # Begin direct frequency entry.
-                self.sleep(0.1)
                 for the_char in frequency:
                     # Send each frequency number character individually.
                     self.sendCommand(device, the_char + "TP")
-                    self.sleep(0.1)
                 # Clear the device's preset state since entering a frequency directly.
                 self.updateDeviceState(device, 'tunerPreset', "")
 
@@ -3501,10 +4596,8 @@ class Plugin(indigo.PluginBase):
         if device.deviceTypeId != "virtualVolume":
             command = "0001SR"
             self.sendCommand(device, command)
-            self.sleep(0.1)
-            # Wait a bit and get an update on the actual listening mode.
+            # Get an update on the actual listening mode once the receiver has answered.
             self.sendCommand(device, "?S")
-            self.sleep(0.1)
 
     #
     # Next Auto Surround/Stream Direct Listening Mode
@@ -3534,10 +4627,8 @@ class Plugin(indigo.PluginBase):
         if device.deviceTypeId != "virtualVolume":
             command = "0005SR"
             self.sendCommand(device, command)
-            self.sleep(0.1)
-            # Wait a bit and get an update on the actual listening mode.
+            # Get an update on the actual listening mode once the receiver has answered.
             self.sendCommand(device, "?S")
-            self.sleep(0.1)
 
     #
     # Next Advanced Surround Listening Mode
@@ -3568,10 +4659,8 @@ class Plugin(indigo.PluginBase):
         if device.deviceTypeId != "virtualVolume":
             command = "0100SR"
             self.sendCommand(device, command)
-            self.sleep(0.1)
-            # Wait a bit and get an update on the actual listening mode.
+            # Get an update on the actual listening mode once the receiver has answered.
             self.sendCommand(device, "?S")
-            self.sleep(0.1)
 
     #
     # Select Listening Mode
@@ -3613,7 +4702,6 @@ class Plugin(indigo.PluginBase):
             # Add the proper characters to the listening mode ID to make it a valid command.
             command = f"{command}SR"
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Next MCACC Memory
@@ -3647,7 +4735,6 @@ class Plugin(indigo.PluginBase):
                 mcacc_memory = 1
             command = f"{mcacc_memory}MC"
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Previous MCACC Memory
@@ -3681,7 +4768,6 @@ class Plugin(indigo.PluginBase):
                 mcacc_memory = 6
             command = f"{mcacc_memory}MC"
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Select MCACC Memory
@@ -3716,7 +4802,6 @@ class Plugin(indigo.PluginBase):
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Send Remote Control Button Press
@@ -3855,7 +4940,6 @@ class Plugin(indigo.PluginBase):
             # Send the command if no errors.
             if not error:
                 self.sendCommand(device, command)
-                self.sleep(0.1)
 
         # For VSX-1022-K
         if device.deviceTypeId == "vsx1022k":
@@ -3947,7 +5031,6 @@ class Plugin(indigo.PluginBase):
             # Send the command if no errors.
             if not error:
                 self.sendCommand(device, command)
-                self.sleep(0.1)
 
         # For VSX-1122-K
         if device.deviceTypeId == "vsx1122k":
@@ -4039,7 +5122,6 @@ class Plugin(indigo.PluginBase):
             # Send the command if no errors.
             if not error:
                 self.sendCommand(device, command)
-                self.sleep(0.1)
 
         # For VSX-1123-K
         if device.deviceTypeId == "vsx1123k":
@@ -4213,7 +5295,6 @@ class Plugin(indigo.PluginBase):
             # Send the command if no errors.
             if not error:
                 self.sendCommand(device, command)
-                self.sleep(0.1)
 
     #
     # Set Display Brightness
@@ -4248,7 +5329,6 @@ class Plugin(indigo.PluginBase):
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Set Sleep Timer
@@ -4282,7 +5362,6 @@ class Plugin(indigo.PluginBase):
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Send Raw Command
@@ -4317,7 +5396,6 @@ class Plugin(indigo.PluginBase):
         # Make sure it's not a virtual volume device.
         if device.deviceTypeId != "virtualVolume":
             self.sendCommand(device, command)
-            self.sleep(0.1)
 
     #
     # Refresh All States
@@ -4343,9 +5421,48 @@ class Plugin(indigo.PluginBase):
             )
             return False
 
-        # Make sure it's not a virtual volume device.
+        # Make sure it's not a virtual volume device. Only ask for the states that might be out of date.
         if device.deviceTypeId != "virtualVolume":
-            self.getReceiverStatus(device)
+            self.getReceiverStatus(device, stale_only=True)
+
+    ########################################
+    def reprobeCapabilities(self, action):
+        """
+        Forget which status queries the receiver has rejected and refresh all states, so every query is tried again
+        (for example after a firmware update).
+
+        :param action:
+        :return:
+        """
+        device = indigo.devices[action.deviceId]
+        self.debugLog(f"Re-probe supported queries for {device.name}")
+
+        # Catch attempts to send a command to a Virtual Volume Controller device.
+        if device.deviceTypeId == "virtualVolume":
+            self.errorLog(
+                f"Device \"{device.name}\" is a Virtual Volume Controller, not a Pioneer receiver. Modify the Indigo "
+                f"action to send the command to a Pioneer receiver instead of this device."
+            )
+            return False
+
+        # The lists belong to the I/O thread, which also runs the refresh after clearing them.
+        self.io_engine.call_later(0, self.forgetUnsupportedQueries, device)
+
+    ########################################
+    def forgetUnsupportedQueries(self, device):
+        """
+        Second half of reprobeCapabilities, run on the I/O thread.
+
+        :param device:
+        :return:
+        """
+        receiver = self.receivers.get(device.id)
+        if receiver is not None:
+            receiver.unsupported_queries.clear()
+            receiver.query_rejections.clear()
+        self.stageDeviceProps(device, {'unsupportedQueries': ""})
+        self.receiverLog(device, "Cleared the list of unsupported status queries.")
+        self.getReceiverStatus(device)
 
     ########################################
     # Virtual Level Controller
@@ -4393,6 +5510,9 @@ class Plugin(indigo.PluginBase):
         # Get the receiver device object.
         receiver_device_id = int(receiver_device_id)
         receiver = indigo.devices[receiver_device_id]
+        # Controlling the volume or mute stops any volume fade under way on the zone.
+        if control_destination in ["zone1volume", "zone2volume"]:
+            self.stopVolumeFade(receiver, int(control_destination[4]), f"{device.name} was used")
 
         # ====== TURN ON ======
         if action.deviceAction == indigo.kDeviceAction.TurnOn:
@@ -4544,8 +5664,11 @@ class Plugin(indigo.PluginBase):
                     if control_destination == "zone1volume":
                         # Set the currentBrightness to the current receiver volume. We're doing this because if the
                         # receiver is muted, this virtual device will have a brightness of 0 and brightening by
-                        # anything will set brightness to 0 plus the brightening amount.
-                        current_brightness = int(100 - round(float(receiver.states['zone1volume']) / -80.5 * 100, 0))
+                        # anything will set brightness to 0 plus the brightening amount. Ask the receiver first so a
+                        # volume change made on the receiver itself isn't missed.
+                        self.waitForQuery(receiver, "?V")
+                        zone_volume = self.getDeviceState(receiver, 'zone1volume')
+                        current_brightness = int(100 - round(float(zone_volume) / -80.5 * 100, 0))
                         brightness_level = current_brightness + int(action.actionValue)
 
                         # Sanity check...
@@ -4575,8 +5698,11 @@ class Plugin(indigo.PluginBase):
                     elif control_destination == "zone2volume":
                         # Set the currentBrightness to the current receiver volume. We're doing this because if the
                         # receiver is muted, this virtual device will have a brightness of 0 and brightening by
-                        # anything will set brightness to 0 plus the brightening amount.
-                        current_brightness = int(100 - round(float(receiver.states['zone2volume']) / -81 * 100, 0))
+                        # anything will set brightness to 0 plus the brightening amount. Ask the receiver first so a
+                        # volume change made on the receiver itself isn't missed.
+                        self.waitForQuery(receiver, "?ZV")
+                        zone_volume = self.getDeviceState(receiver, 'zone2volume')
+                        current_brightness = int(100 - round(float(zone_volume) / -81 * 100, 0))
                         brightness_level = current_brightness + int(action.actionValue)
 
                         # Sanity check...
@@ -4817,6 +5943,58 @@ class Plugin(indigo.PluginBase):
 
             desc_string += f"set volume (zone 2) to {the_number}"
 
+        #
+        # Fade Volume dB (Zones 1 and 2)
+        #
+        if type_id in ["zone1fadeVolume", "zone2fadeVolume"]:
+            # Catch attempts to send a command to a Virtual Volume Controller device, which is not possible (but
+            # because it's not currently possible to prevent the user from selecting it as a destination device in the
+            # Indigo UI, we must check for it).
+            if device.deviceTypeId == "virtualVolume":
+                error_msg_dict['volume'] = (
+                    f"Device \"{device.name}\" is a Virtual Volume Controller, not a Pioneer receiver. Modify the "
+                    f"Indigo action to send the command to a Pioneer receiver instead of this device."
+                )
+                error_msg_dict['showAlertText'] = error_msg_dict['volume']
+                return False, values_dict, error_msg_dict
+
+            # Zone 1 volume is set in 0.5 dB steps from -80.5 to 12 dB, zone 2 volume in 1 dB steps from -81 to 0 dB.
+            if type_id == "zone1fadeVolume":
+                zone, lowest, highest, step = 1, -80.5, 12.0, 0.5
+                range_msg = "The volume must be a number between -80.5 and 12 dB, evenly divisible by 0.5 dB."
+            else:
+                zone, lowest, highest, step = 2, -81.0, 0.0, 1.0
+                range_msg = "The volume must be a whole number between -81 and 0 dB."
+            for field in ['volume', 'startVolume']:
+                value = values_dict.get(field, "").strip()
+                if field == 'startVolume' and not value:
+                    # Start at the current volume.
+                    continue
+                try:
+                    the_number = float(value)
+                except ValueError:
+                    the_number = None
+                if the_number is None or the_number < lowest or the_number > highest or the_number % step != 0:
+                    error_msg_dict[field] = range_msg
+                    error_msg_dict['showAlertText'] = error_msg_dict[field]
+                    return False, values_dict, error_msg_dict
+
+            try:
+                duration = float(values_dict.get('duration', ""))
+            except ValueError:
+                duration = -1
+            if duration < 0 or duration > 3600:
+                error_msg_dict['duration'] = "The fade time must be a number of seconds between 0 and 3600."
+                error_msg_dict['showAlertText'] = error_msg_dict['duration']
+                return False, values_dict, error_msg_dict
+
+            if values_dict.get('curve', "") not in VOLUME_FADE_CURVES:
+                error_msg_dict['curve'] = "Please select a fade curve."
+                error_msg_dict['showAlertText'] = error_msg_dict['curve']
+                return False, values_dict, error_msg_dict
+
+            desc_string += f"fade volume (zone {zone}) to {values_dict['volume'].strip()} over {duration:g} s"
+
         #
         # Set Source (Zone 2)
         #
@@ -5198,6 +6376,16 @@ class Plugin(indigo.PluginBase):
                     error_msg_dict['showAlertText'] = error_msg_dict['address']
                     return False, values_dict, error_msg_dict
 
+            # Make sure the minimum command gap is a whole number of milliseconds.
+            try:
+                command_gap = int(values_dict.get('commandGap', DEFAULT_COMMAND_GAP))
+                if command_gap < 0 or command_gap > 1000:
+                    raise ValueError
+            except ValueError:
+                error_msg_dict['commandGap'] = "Please enter a whole number of milliseconds from 0 to 1000."
+                error_msg_dict['showAlertText'] = error_msg_dict['commandGap']
+                return False, values_dict, error_msg_dict
+
             # For newly created devices, the device_id won't be in the device list.
             if device_id > 0:
                 device = indigo.devices[device_id]
@@ -5467,6 +6655,26 @@ class Plugin(indigo.PluginBase):
         return True, values_dict
 
     # Plugin Configuration Dialog
+    ########################################
+    def validatePrefsConfigUi(self, values_dict):
+        """
+        Make sure the display update rate is a sensible whole number.
+
+        :param values_dict:
+        :return:
+        """
+        error_msg_dict = indigo.Dict()
+        try:
+            rate = int(values_dict.get('displayUpdateRate', DEFAULT_DISPLAY_UPDATE_RATE))
+            if rate < 0 or rate > 20:
+                raise ValueError
+        except ValueError:
+            error_msg_dict['displayUpdateRate'] = "Please enter a whole number of updates per second from 0 to 20."
+            error_msg_dict['showAlertText'] = error_msg_dict['displayUpdateRate']
+            return False, values_dict, error_msg_dict
+
+        return True, values_dict
+
     ########################################
     def closedPrefsConfigUi(self, values_dict, user_cancelled):
         """
@@ -5479,6 +6687,7 @@ class Plugin(indigo.PluginBase):
         self.debugLog("closedPrefsConfigUi called.")
 
         if not user_cancelled:
+            self.display_update_interval = self.getDisplayUpdateInterval(values_dict)
             self.debug = values_dict.get("showDebugInfo", False)
             if self.debug:
                 indigo.server.log("Debug logging enabled")
@@ -0,0 +1,172 @@
+"""
+Pioneer receiver protocol helpers
+
+The protocol.py file contains helpers for decoding the responses sent by the receiver's telnet control interface.
+Like constants.py, it has no dependency on the Indigo server.
+"""
+import functools
+import re
+
+# Lengths of the response prefixes used as dispatch table keys, tried after an exact match on the whole response.
+RESPONSE_PREFIX_LENGTHS = (2, 3, 5)
+
+# A command that starts with a parameter: digits ("081VL"), or a tuner preset class and number ("A01PR"), followed by
+# the command code.
+PARAMETER_COMMAND = re.compile(r"[A-Z]?\d+(\D+)")
+
+
+class ReceiverError(Exception):
+    """
+    The receiver answered a command or query with an error response (E02, E03, E04, E06 or B00).
+    """
+    def __init__(self, response, description):
+        super().__init__(f"{response}: {description}")
+        self.response = response
+
+
+def find_response_handler(dispatch_table, response):
+    """
+    Find the handler for a receiver response.
+
+    The dispatch table maps complete responses (errors, acknowledgements) and 2, 3 or 5 character response prefixes to
+    handlers. Because no prefix in the table begins another one, at most one key can match, so the cost of the lookup
+    doesn't depend on which response it is.
+
+    :param dispatch_table: dictionary of response or response prefix to handler.
+    :param response: a complete response line.
+    :return: the handler, or None if the response isn't recognized.
+    """
+    handler = dispatch_table.get(response)
+    if handler is None:
+        for length in RESPONSE_PREFIX_LENGTHS:
+            handler = dispatch_table.get(response[:length])
+            if handler is not None:
+                break
+    return handler
+
+
+def decode_display(response, display_characters):
+    """
+    Decode the front panel display text from an FL response.
+
+    The response is "FL", two flag digits and 14 display characters, each sent as a 2 digit hex character code. The
+    codes are converted to bytes in one go and then translated to text with a table indexed by character code.
+
+    :param response: a complete FL response line.
+    :param display_characters: 256-entry sequence of character code to text (DISPLAY_CHARACTERS).
+    :return: the display text.
+    :raises ValueError: if the character codes aren't valid hex.
+    """
+    # Latin-1 maps each byte to the character with the same code, which is what str.translate looks up.
+    return bytes.fromhex(response[4:32]).decode("latin-1").translate(display_characters)
+
+
+class StatusDecoder:
+    """
+    Decoder for fixed-width multi-field status responses (AST, VST).
+
+    The field layout (see AUDIO_STATUS_FIELDS) is compiled once into a list of (state, slice, decoded values, converter)
+    entries, so decoding a response is a single pass of slices and dictionary lookups. Each field's decoded values are
+    seeded from its lookup table (if it has one) and remember whatever else has been converted, since a receiver keeps
+    sending the same few codes. Codes missing from a lookup table are kept as received.
+    """
+    # Most converted values remembered per field on top of its lookup table.
+    MAX_REMEMBERED_VALUES = 256
+
+    def __init__(self, fields, prefix_length=3):
+        self.fields = []
+        for state, offset, width, conversion in fields:
+            start = prefix_length + offset
+            if isinstance(conversion, dict):
+                values = dict(conversion)
+                converter = _keep_code
+            elif isinstance(conversion, (list, tuple)):
+                values = {}
+                converter = functools.partial(_flag_names, conversion)
+            else:
+                values = {}
+                converter = conversion
+            self.fields.append((state, slice(start, start + width), values, converter, len(values)))
+
+    ########################################
+    def decode(self, response, states=None):
+        """
+        Decode a status response.
+
+        :param response: a complete status response line.
+        :param states: current state values; fields that already have their decoded value are left out.
+        :return: dictionary of state:new value.
+        """
+        if states is None:
+            states = {}
+        changed = {}
+        for state, field, values, converter, seeded in self.fields:
+            code = response[field]
+            try:
+                new_value = values[code]
+            except KeyError:
+                new_value = converter(code)
+                if len(values) < seeded + self.MAX_REMEMBERED_VALUES:
+                    values[code] = new_value
+            if state not in states or states[state] != new_value:
+                changed[state] = new_value
+        return changed
+
+
+def _keep_code(code):
+    """
+    Value of a code missing from a lookup table: the code itself.
+
+    :param code:
+    :return:
+    """
+    return code
+
+
+def _flag_names(names, flags):
+    """
+    Turn a field of "1"/"0" flags into a comma-separated list of the names of the flags that are set.
+
+    :param names:
+    :param flags:
+    :return:
+    """
+    return ", ".join([name for name, flag in zip(names, flags) if flag == "1"])
+
+
+def expected_response(query, query_responses):
+    """
+    Work out which response answers a status query.
+
+    :param query: a query command such as "?V", "?RGB01" or "?L__CLV".
+    :param query_responses: dictionary of query to response prefix (QUERY_RESPONSES).
+    :return: the prefix of the answering response, or None if the command isn't a known query.
+    """
+    prefix = query_responses.get(query)
+    if prefix is not None:
+        return prefix
+    if query.startswith("?RGB"):
+        # Input source name: ?RGB## is answered by RGB##<name>.
+        return f"RGB{query[4:]}"
+    if query.endswith("CLV") and query.startswith("?"):
+        # Channel level: ?###CLV is answered by CLV###<level>.
+        return f"CLV{query[1:-3]}"
+    return None
+
+
+def command_response(command, command_responses):
+    """
+    Work out which response echoes a (non-query) command.
+
+    :param command: a command such as "VU", "081VL", "A01PR" or "Z2MO".
+    :param command_responses: dictionary of command code to response prefix (COMMAND_RESPONSES).
+    :return: the prefix of the echoing response, or None if the command doesn't have a known echo.
+    """
+    # Commands without a parameter, and those listed along with theirs (such as "00TN"), are looked up whole. Anything
+    # else only matches if what follows its parameter is exactly a listed code, so "TFD" isn't taken for "FD".
+    prefix = command_responses.get(command)
+    if prefix is None:
+        match = PARAMETER_COMMAND.fullmatch(command)
+        if match is not None:
+            prefix = command_responses.get(match.group(1))
+    return prefix
@@ -0,0 +1,361 @@
+"""
+Receiver I/O engine
+
+The receiver_io.py file contains the event-driven multiplexer used by the plugin to service its receiver connections.
+It has no dependency on the Indigo server, so it can be imported (and exercised) outside the plugin host.
+"""
+import concurrent.futures
+import heapq
+import itertools
+import selectors
+import socket
+import sys
+import threading
+import time
+import traceback
+
+
+class ReceiverIOEngine:
+    """
+    Event-driven socket multiplexer for receiver connections.
+
+    The engine blocks until one of the registered receiver connections is readable, a timer falls due or another
+    thread wakes it up, and then reports only the receivers that actually have data waiting. Sockets that are still
+    connecting can be watched for writability, which is how a non-blocking connect reports that it has finished.
+    Timers and wake-ups may be scheduled from any thread; everything else is meant to be called from the thread running
+    `poll`.
+    """
+    def __init__(self):
+        self.selector = selectors.DefaultSelector()
+        self.connections = {}
+        self.timers = []
+        self.timer_sequence = itertools.count()
+        self.lock = threading.Lock()
+        self.poll_thread = None
+        # Called with the callback and the traceback text when a timer or watch callback raises an exception (None
+        # writes the traceback to stderr). Either way the engine carries on with the next callback.
+        self.error_handler = None
+        # When the engine first saw each receiver's waiting data (device ID:time.monotonic()), until it's read.
+        self.readable_times = {}
+        # A socket pair lets other threads interrupt a blocking select() call.
+        self.wakeup_reader, self.wakeup_writer = socket.socketpair()
+        self.wakeup_reader.setblocking(False)
+        self.wakeup_writer.setblocking(False)
+        self.selector.register(self.wakeup_reader, selectors.EVENT_READ, None)
+
+    ########################################
+    def register(self, device_id, connection):
+        """
+        Watch a receiver connection for incoming data.
+
+        :param device_id: Indigo device ID of the receiver.
+        :param connection: any object with a fileno() method (socket, telnetlib.Telnet, ...).
+        :return:
+        """
+        self.unregister(device_id)
+        self.selector.register(connection, selectors.EVENT_READ, device_id)
+        self.connections[device_id] = connection
+
+    ########################################
+    def unregister(self, device_id):
+        """
+        Stop watching a receiver connection. Unknown device IDs are ignored.
+
+        :param device_id: Indigo device ID of the receiver.
+        :return:
+        """
+        connection = self.connections.pop(device_id, None)
+        if connection is not None:
+            try:
+                self.selector.unregister(connection)
+            except (KeyError, ValueError, OSError):
+                # The connection was already closed; the selector has nothing left to forget.
+                pass
+        self.readable_times.pop(device_id, None)
+
+    ########################################
+    def is_registered(self, device_id):
+        """
+        Report whether a receiver connection is being watched.
+
+        :param device_id: Indigo device ID of the receiver.
+        :return: bool
+        """
+        return device_id in self.connections
+
+    ########################################
+    def watch_writable(self, sock, callback, *args):
+        """
+        Run a callback on the I/O thread once a socket becomes writable (for example when a non-blocking connect
+        completes or fails). The watch is removed before the callback runs.
+
+        :param sock: socket to watch.
+        :param callback: callable to run.
+        :param args: positional arguments for the callback.
+        :return:
+        """
+        self.selector.register(sock, selectors.EVENT_WRITE, (callback, args))
+
+    ########################################
+    def unwatch(self, sock):
+        """
+        Stop watching a socket passed to watch_writable(). Sockets that aren't being watched are ignored.
+
+        :param sock: socket being watched.
+        :return:
+        """
+        try:
+            self.selector.unregister(sock)
+        except (KeyError, ValueError, OSError):
+            pass
+
+    ########################################
+    def call_later(self, delay, callback, *args):
+        """
+        Run a callback on the I/O thread after `delay` seconds. Safe to call from any thread.
+
+        :param delay: seconds from now.
+        :param callback: callable to run.
+        :param args: positional arguments for the callback.
+        :return: timer handle that can be passed to cancel().
+        """
+        timer = [time.monotonic() + max(delay, 0), next(self.timer_sequence), callback, args, False]
+        with self.lock:
+            heapq.heappush(self.timers, timer)
+            earliest = self.timers[0] is timer
+        # Only interrupt the poll if this timer is now the next one due and it was scheduled from another thread (the
+        # I/O thread recalculates its timeout before every poll anyway).
+        if earliest and threading.current_thread() is not self.poll_thread:
+            self.wakeup()
+        return timer
+
+    ########################################
+    @staticmethod
+    def cancel(timer):
+        """
+        Cancel a timer returned by call_later(). Cancelling a timer that already ran is harmless.
+
+        :param timer: timer handle.
+        :return:
+        """
+        if timer is not None:
+            timer[4] = True
+
+    ########################################
+    def call_and_wait(self, callback, *args, timeout=None):
+        """
+        Run a callback on the I/O thread and wait for its result. Safe to call from any thread. On the I/O thread
+        itself, or before the first poll or once polling has stopped (poll_thread is None), the callback is run right
+        away in the calling thread instead. It is never run in the calling thread once it has been handed over: if the
+        I/O thread doesn't start on it within `timeout` seconds, it stays queued and TimeoutError is raised.
+
+        :param callback: callable to run.
+        :param args: positional arguments for the callback.
+        :param timeout: most seconds to wait for the I/O thread to start running the callback (None waits forever).
+        :return: the callback's result (its exceptions are raised in the calling thread).
+        """
+        if self.poll_thread is None or threading.current_thread() is self.poll_thread:
+            return callback(*args)
+        future = concurrent.futures.Future()
+        self.call_later(0, self.complete_future, future, callback, args)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            # Once the I/O thread has started on it, wait for it to finish.
+            if future.running() or future.done():
+                return future.result()
+            raise TimeoutError(f"The I/O thread didn't run {callback.__name__} within {timeout} seconds.") from None
+
+    ########################################
+    @staticmethod
+    def complete_future(future, callback, args):
+        """
+        Run a callback for call_and_wait() and hand its result (or exception) to the waiting thread.
+
+        :param future: concurrent.futures.Future the caller is waiting on.
+        :param callback: callable to run.
+        :param args: positional arguments for the callback.
+        :return:
+        """
+        future.set_running_or_notify_cancel()
+        try:
+            future.set_result(callback(*args))
+        except Exception as err:
+            future.set_exception(err)
+
+    ########################################
+    def wakeup(self):
+        """
+        Interrupt a blocking poll() from another thread.
+
+        :return:
+        """
+        try:
+            self.wakeup_writer.send(b"\0")
+        except (BlockingIOError, OSError):
+            # The wake-up pipe is already full, so the poll is going to return anyway.
+            pass
+
+    ########################################
+    def poll(self, max_timeout=None):
+        """
+        Wait for receiver activity, run any timers that fell due and return the receivers with data waiting.
+
+        :param max_timeout: upper bound on how long to block (None blocks until there is activity).
+        :return: list of device IDs whose connections are readable.
+        """
+        self.poll_thread = threading.current_thread()
+        timeout = max_timeout
+        with self.lock:
+            if self.timers:
+                next_due = max(self.timers[0][0] - time.monotonic(), 0)
+                timeout = next_due if timeout is None else min(timeout, next_due)
+
+        ready = []
+        writable = []
+        events = self.selector.select(timeout)
+        now = time.monotonic()
+        for key, _ in events:
+            if key.data is None:
+                self.drain_wakeups()
+            elif isinstance(key.data, tuple):
+                writable.append(key)
+            else:
+                ready.append(key.data)
+                self.readable_times.setdefault(key.data, now)
+
+        for key in writable:
+            self.unwatch(key.fileobj)
+            callback, args = key.data
+            self.run_callback(callback, args)
+        self.run_due_timers()
+        return ready
+
+    ########################################
+    def note_readable(self):
+        """
+        Note the time for receivers whose data arrived since the last poll, without running anything or blocking. The
+        loop calls this between receivers, so data that arrives while it's busy is timed from about when it arrived
+        rather than from the next poll.
+
+        :return:
+        """
+        now = time.monotonic()
+        for key, _ in self.selector.select(0):
+            if key.data is not None and not isinstance(key.data, tuple):
+                self.readable_times.setdefault(key.data, now)
+
+    ########################################
+    def readable_since(self, device_id):
+        """
+        Report when the engine first saw a receiver's waiting data and forget it, as the data is about to be read.
+
+        :param device_id: Indigo device ID of the receiver.
+        :return: time.monotonic() value (now if the engine hadn't seen any).
+        """
+        return self.readable_times.pop(device_id, time.monotonic())
+
+    ########################################
+    def drain_wakeups(self):
+        """
+        Empty the wake-up pipe so the next select() call blocks again.
+
+        :return:
+        """
+        try:
+            while self.wakeup_reader.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    ########################################
+    def run_due_timers(self):
+        """
+        Run every timer whose due time has passed.
+
+        :return:
+        """
+        now = time.monotonic()
+        due = []
+        with self.lock:
+            while self.timers and self.timers[0][0] <= now:
+                due.append(heapq.heappop(self.timers))
+        for _, _, callback, args, cancelled in due:
+            if not cancelled:
+                self.run_callback(callback, args)
+
+    ########################################
+    def run_callback(self, callback, args):
+        """
+        Run a timer or watch callback. An exception it raises is reported to error_handler instead of ending the poll,
+        so one failing callback doesn't stop the others (or the I/O thread).
+
+        :param callback: callable to run.
+        :param args: positional arguments for the callback.
+        :return:
+        """
+        try:
+            callback(*args)
+        except Exception:
+            if self.error_handler is not None:
+                self.error_handler(callback, traceback.format_exc())
+            else:
+                traceback.print_exc(file=sys.stderr)
+
+
+class LineFramer:
+    """
+    Reassembly buffer that turns a receiver's byte stream into complete response lines.
+
+    Receivers terminate every response with CR+LF, but a single read can end in the middle of a line (long AST, VST and
+    FL responses are routinely split across TCP segments). Only complete lines are returned; the unterminated tail is
+    kept for the next read. A line longer than `max_frame_size` is discarded (up to the next CR+LF, if it grows past
+    that without a terminator) so a misbehaving receiver can't make the buffer grow without limit.
+    """
+    TERMINATOR = b"\r\n"
+
+    def __init__(self, max_frame_size):
+        self.buffer = bytearray()
+        self.max_frame_size = max_frame_size
+        # True while skipping the remainder of an oversized line.
+        self.discarding = False
+        self.dropped_frames = 0
+
+    ########################################
+    def feed(self, data):
+        """
+        Add newly received bytes and return every line completed by them.
+
+        :param data: bytes read from the connection.
+        :return: list of decoded response lines without their terminators (empty lines are skipped).
+        """
+        buffer = self.buffer
+        search_from = max(len(buffer) - 1, 0)
+        buffer += data
+        lines = []
+        start = 0
+        # Decode each line straight out of the buffer instead of slicing it into intermediate byte strings.
+        with memoryview(buffer) as view:
+            while True:
+                end = buffer.find(self.TERMINATOR, search_from)
+                if end < 0:
+                    break
+                if self.discarding:
+                    self.discarding = False
+                elif end - start > self.max_frame_size:
+                    self.dropped_frames += 1
+                elif end > start:
+                    lines.append(str(view[start:end], "utf-8", "replace"))
+                start = search_from = end + len(self.TERMINATOR)
+        del buffer[:start]
+
+        if len(buffer) > self.max_frame_size:
+            # Keep a trailing CR: it may be the first half of the terminator that ends the discarded line.
+            carriage_return = buffer.endswith(b"\r")
+            buffer.clear()
+            if carriage_return:
+                buffer += b"\r"
+            if not self.discarding:
+                self.discarding = True
+                self.dropped_frames += 1
+        return lines
@@ -0,0 +1,225 @@
+"""
+Receiver shadow state
+
+The receiver_state.py file contains the plugin-side model of each receiver device. It has no dependency on the Indigo
+server, so it can be imported outside the plugin host.
+"""
+import collections
+import math
+
+from constants import SESSION_CONNECTING, SESSION_IDLE, SESSION_SYNCING, VOLUME_FADE_STEP_INTERVAL, ZONES_OFF_STATES
+
+
+class ReceiverShadow:
+    """
+    In-memory copy of a receiver device's states and properties, plus the session used to talk to it.
+
+    Only the plugin ever changes a receiver's states, so once the copy is seeded from the device it's kept current by
+    recording each state the plugin writes, and device update notifications only add states the copy doesn't have yet
+    (for example after the state list changes). Properties can also be changed by the user, so they're replaced by the
+    ones in each device update notification, except for the notifications that simply echo back properties the plugin
+    wrote itself; a late echo would otherwise undo a newer write.
+    """
+    def __init__(self, device):
+        self.device_id = device.id
+        self.type_id = device.deviceTypeId
+        # Socket and line reassembly buffer while there's a session (None otherwise).
+        self.connection = None
+        self.framer = None
+        # Where the session is in being set up: SESSION_IDLE, SESSION_CONNECTING (TCP connect under way),
+        # SESSION_SYNCING (primed, waiting for the answer to the first query) or SESSION_READY.
+        self.session_state = SESSION_IDLE
+        # Timer that gives up on a connect or sync that takes too long.
+        self.session_timer = None
+        # Pending connection attempt, the current back-off wait (in seconds) and the number of attempts that have
+        # failed in a row.
+        self.reconnect_timer = None
+        self.reconnect_delay = 0.0
+        self.failed_connects = 0
+        # Outbound (command, expected response prefix or None, reply future or None, reply timeout, whether it's a
+        # status query) entries, and callbacks to run once everything queued before them is done, oldest first.
+        self.command_queue = collections.deque()
+        # [expected response prefix or None, reply deadline, reply future or None, command, whether it's a status query]
+        # for each command written but not yet answered, oldest first.
+        self.in_flight = collections.deque()
+        self.reply_timer = None
+        self.next_write_time = 0.0
+        self.writer_scheduled = False
+        # Latest display text not yet written to the "display" state, the timer that will write it and when the state
+        # was last written (see Plugin.publishDisplay).
+        self.display_pending = None
+        self.display_timer = None
+        self.display_written = 0.0
+        # Property changes not yet written to the server (property:value) and the timer that will write them (see
+        # Plugin.stageDeviceProps).
+        self.props_pending = {}
+        self.props_timer = None
+        # Audio status settle check after an input source change (see Plugin.getAudioInOutStatus): the timer for the
+        # next audio status query, the reply to the one outstanding and when it was asked (time.monotonic()), the
+        # current wait and the last answer.
+        self.av_settle_timer = None
+        self.av_settle_reply = None
+        self.av_settle_asked = 0.0
+        self.av_settle_delay = 0.0
+        self.av_settle_response = None
+        # When each state group (see STATE_GROUP_TTLS) was last refreshed and last made out of date (time.monotonic()).
+        self.group_refreshed = {}
+        self.group_invalidated = {}
+        # Refresh times restored from the snapshot file (group:time.monotonic()), applied once the first session is
+        # ready (see Plugin.sessionSynced), or None.
+        self.restored_groups = None
+        # Restored state groups no live answer has vouched for yet. The first refresh of the session checks the groups
+        # in WARM_START_VERIFY_GROUPS, and any of these its answers make out of date are asked for again.
+        self.unverified_groups = set()
+        # Refresh sweep under way ((start time, commands sent, replies timed out) when it began, or None) and whether
+        # another refresh was asked for while it ran (see Plugin.getReceiverStatus).
+        self.refresh_sweep = None
+        self.refresh_follow_up = False
+        # Volume fades under way (zone:VolumeFade; see Plugin.startVolumeFade).
+        self.volume_fades = {}
+        # Running totals, used to report on status refreshes.
+        self.commands_sent = 0
+        self.replies_timed_out = 0
+        # Longest time (in seconds) the receiver's data has waited to be read while the I/O loop was busy elsewhere.
+        self.worst_stall = 0.0
+        self.states = dict(device.states)
+        # ZONES_OFF_STATES that may hold something other than their "off" value. Nothing is known about the states yet,
+        # so the first time both zones are found off every one of them is checked.
+        self.zones_off_dirty = set(ZONES_OFF_STATES)
+        self.props = dict(device.pluginProps)
+        # Status queries the receiver has rejected as unsupported, remembered in the "unsupportedQueries" property so
+        # status refreshes can skip them.
+        self.unsupported_queries = set(query for query in self.props.get('unsupportedQueries', "").split(",") if query)
+        # Status queries rejected as unsupported but not (yet) remembered, and how many times in a row they've been
+        # rejected while they were the only query waiting for an answer (query:count). They're written on their own,
+        # so a rejection can't be blamed on another query.
+        self.query_rejections = {}
+        # Properties written by the plugin that the server hasn't echoed back yet, oldest first.
+        self.unconfirmed_props = []
+        self.device = device
+        self.name = device.name
+
+    ########################################
+    @property
+    def connected(self):
+        """
+        Report the receiver's "connected" state.
+
+        :return: bool
+        """
+        return self.states.get('connected', False)
+
+    ########################################
+    @property
+    def connecting(self):
+        """
+        Report whether a session is being set up or a connection attempt is scheduled.
+
+        :return: bool
+        """
+        return self.session_state in (SESSION_CONNECTING, SESSION_SYNCING) or self.reconnect_timer is not None
+
+    ########################################
+    def record_state(self, state, new_value):
+        """
+        Note a state change the plugin has made (or is about to make) on the server.
+
+        :param state: state name.
+        :param new_value: new state value.
+        :return:
+        """
+        self.states[state] = new_value
+        if ZONES_OFF_STATES.get(state, new_value) != new_value:
+            self.zones_off_dirty.add(state)
+
+    ########################################
+    def record_props(self, new_props):
+        """
+        Note a set of properties the plugin has written to the server.
+
+        :param new_props: the complete properties dictionary.
+        :return:
+        """
+        self.props = dict(new_props)
+        self.unconfirmed_props.append(self.props)
+
+    ########################################
+    def device_updated(self, device):
+        """
+        Bring the copy up to date from a device update notification.
+
+        :param device: the updated Indigo device.
+        :return:
+        """
+        self.device = device
+        self.name = device.name
+        # States are only ever added, so there's nothing to pick up unless the counts differ.
+        if len(device.states) != len(self.states):
+            for state, value in device.states.items():
+                self.states.setdefault(state, value)
+
+        props = dict(device.pluginProps)
+        if props in self.unconfirmed_props:
+            # The server is confirming one of our own writes. Anything written before it has been superseded.
+            del self.unconfirmed_props[:self.unconfirmed_props.index(props) + 1]
+        elif props != self.props:
+            # Somebody else (the device configuration dialog) changed the properties.
+            self.props = props
+            self.unconfirmed_props.clear()
+
+
+class VolumeFade:
+    """
+    A volume fade under way on one zone of a receiver: the volume moves from `start` to `target` (both in the zone's
+    volume command units, see VOLUME_COMMAND_UNITS) over `duration` seconds, following one of VOLUME_FADE_CURVES.
+    """
+    def __init__(self, zone, start, target, started, duration, curve):
+        self.zone = zone
+        self.start = start
+        self.target = target
+        self.started = started
+        self.duration = max(duration, 0.0)
+        self.curve = curve
+        # Time between steps if the volume moved one unit at a time at an even pace.
+        units = abs(target - start)
+        self.tick = max(self.duration / units if units else 0.0, VOLUME_FADE_STEP_INTERVAL)
+        # Shortest time between steps (stretched while the receiver is busy), when the last step was written, the
+        # volume it set (None before the first step, or if the receiver didn't take the last one) and the volume before
+        # it (until the receiver has answered it, the receiver may report either).
+        self.step_interval = VOLUME_FADE_STEP_INTERVAL
+        self.written = 0.0
+        self.level = None
+        self.previous = None
+        # Reply to the step waiting for the receiver's answer (or None) and the timer for the next step.
+        self.reply = None
+        self.timer = None
+
+    ########################################
+    def level_at(self, now):
+        """
+        Volume the fade should have reached by a given time.
+
+        :param now: time.monotonic() value.
+        :return: volume command units.
+        """
+        fraction = min((now - self.started) / self.duration, 1.0) if self.duration else 1.0
+        fraction = max(fraction, 0.0)
+        if self.curve == "logarithmic":
+            # Most of the change comes early on, and the last few steps are taken slowly.
+            fraction = math.log10(1 + 9 * fraction)
+        elif self.curve == "sCurve":
+            # Eases in and out (smoothstep).
+            fraction = fraction * fraction * (3 - 2 * fraction)
+        return self.start + int(round((self.target - self.start) * fraction))
+
+    ########################################
+    def next_step_time(self, now):
+        """
+        When to take the next step: on the fade's own schedule (a whole number of ticks after it started, and no later
+        than its end), but no sooner than the step interval allows.
+
+        :param now: time.monotonic() value.
+        :return: time.monotonic() value.
+        """
+        due = self.started + (int((now - self.started) // self.tick) + 1) * self.tick
+        return max(min(due, self.started + self.duration), self.written + self.step_interval)
@@ -0,0 +1,89 @@
+"""
+Display decoder micro-benchmark
+
+Compares the cost of decoding each FL (front panel display) response in a generated response mix using the original
+per-character loop against the lookup-table decoder used by Plugin.handleDisplayResponse.
+
+Usage: python benchmarks/display_decoder.py [response file] [repetitions]
+"""
+import os
+import sys
+import timeit
+
+SERVER_PLUGIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "Pioneer Receiver.indigoPlugin", "Contents", "Server Plugin")
+sys.path.insert(0, SERVER_PLUGIN)
+
+from constants import CHARACTER_MAP, DISPLAY_CHARACTERS  # noqa: E402
+from protocol import decode_display  # noqa: E402
+
+
+def legacy_decode(response):
+    """
+    Decode the display text the way the original FL branch of processResponse did.
+
+    :param response:
+    :return: the display text.
+    """
+    new_value = ""
+    the_string = response[4:]
+    index = 0
+    while index < 28:
+        ascii_val = int(f"0x{the_string[index:index + 2]}", 16)
+        if ascii_val < 32 or ascii_val > 126:
+            new_value += CHARACTER_MAP[ascii_val]
+        else:
+            new_value += f"{chr(ascii_val)}"
+        index += 2
+    return new_value
+
+
+def load_frames(path):
+    """
+    Read the FL responses from a response mix.
+
+    :param path:
+    :return: list of FL responses.
+    """
+    with open(path, encoding="utf-8") as response_file:
+        return [line.rstrip("\r\n") for line in response_file if line.startswith("FL")]
+
+
+def main():
+    """
+    Run both decoders over the display frames and print the per-frame cost of each.
+
+    :return:
+    """
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "response_mix.txt")
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    frames = load_frames(path)
+    # Every character code, so the special characters are covered as well as whatever the recording happens to show.
+    for start in range(0, 256, 14):
+        frames.append("FL00" + "".join(f"{code % 256:02X}" for code in range(start, start + 14)))
+
+    # Both decoders must agree before their speed is worth comparing.
+    for frame in frames:
+        expected = legacy_decode(frame)
+        actual = decode_display(frame, DISPLAY_CHARACTERS)
+        if expected != actual:
+            raise SystemExit(f"Decode mismatch for {frame!r}: loop gave {expected!r}, table gave {actual!r}")
+
+    def run_legacy():
+        for frame in frames:
+            legacy_decode(frame)
+
+    def run_table():
+        for frame in frames:
+            decode_display(frame, DISPLAY_CHARACTERS)
+
+    count = len(frames) * repetitions
+    legacy = min(timeit.repeat(run_legacy, number=repetitions, repeat=5)) / count
+    table = min(timeit.repeat(run_table, number=repetitions, repeat=5)) / count
+    print(f"{len(frames)} frames x {repetitions} repetitions")
+    print(f"per-character loop: {legacy * 1e9:8.1f} ns per frame")
+    print(f"lookup table:       {table * 1e9:8.1f} ns per frame ({legacy / table:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
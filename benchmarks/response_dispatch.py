@@ -0,0 +1,97 @@
+"""
+Response dispatch micro-benchmark
+
+Compares the cost of finding the handler for each response in a generated response mix using the original chain of
+`response.startswith()` tests against the prefix-indexed dispatch table used by Plugin.processResponse. Only the lookup
+is timed; the handlers themselves need the Indigo server.
+
+Usage: python benchmarks/response_dispatch.py [response file] [repetitions]
+"""
+import os
+import sys
+import timeit
+
+SERVER_PLUGIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "Pioneer Receiver.indigoPlugin", "Contents", "Server Plugin")
+sys.path.insert(0, SERVER_PLUGIN)
+
+from constants import ENUMERATED_RESPONSES, RESPONSE_HANDLERS  # noqa: E402
+from protocol import find_response_handler  # noqa: E402
+
+# Complete responses tested with == at the top of the original chain, then the prefixes in the order the original
+# chain tested them.
+LEGACY_EXACT = ("E02", "E03", "E04", "E06", "B00", "R")
+LEGACY_PREFIXES = (
+    "PWR", "MUT", "FN", "VOL", "APR", "Z2F", "Z2MUT", "ZV", "RGB", "FL", "MC", "IS", "VSP", "VSB", "VHT", "CLV", "SPK",
+    "HA", "PQ", "SSA", "SSE", "SSF", "SAA", "SAB", "PKL", "RML", "FR", "PR", "TQ", "SR", "LM", "TO", "BA", "TR", "ATA",
+    "SDA", "SDB", "ATC", "ATD", "ATE", "ATF", "ATG", "ATH", "ATI", "ATJ", "ATK", "ATL", "ATM", "ATN", "ATO", "ATP",
+    "ATQ", "ATR", "ATS", "ATT", "ATU", "VTB", "VTC", "VTD", "VTE", "VTG", "VTH", "VTL", "AST", "VST",
+)
+
+
+def legacy_lookup(response):
+    """
+    Find the response type the way the original if/elif chain did.
+
+    :param response:
+    :return: the matching response or prefix, or None.
+    """
+    for exact in LEGACY_EXACT:
+        if response == exact:
+            return exact
+    for prefix in LEGACY_PREFIXES:
+        if response.startswith(prefix):
+            return prefix
+    return None
+
+
+def load_responses(path):
+    """
+    Read a response mix, skipping comments and blank lines.
+
+    :param path:
+    :return: list of responses.
+    """
+    with open(path, encoding="utf-8") as response_file:
+        return [line.rstrip("\r\n") for line in response_file if line.strip() and not line.startswith("#")]
+
+
+def main():
+    """
+    Run both lookups over the response mix and print the per-response cost of each.
+
+    :return:
+    """
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "response_mix.txt")
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    responses = load_responses(path)
+
+    # The plugin maps keys to bound methods; the key itself is enough to compare lookups.
+    dispatch_table = {prefix: prefix for prefix in RESPONSE_HANDLERS}
+    dispatch_table.update({prefix: prefix for prefix in ENUMERATED_RESPONSES})
+
+    # Both lookups must agree before their speed is worth comparing.
+    for response in responses:
+        expected = legacy_lookup(response)
+        actual = find_response_handler(dispatch_table, response)
+        if expected != actual:
+            raise SystemExit(f"Lookup mismatch for {response!r}: chain found {expected!r}, table found {actual!r}")
+
+    def run_legacy():
+        for response in responses:
+            legacy_lookup(response)
+
+    def run_table():
+        for response in responses:
+            find_response_handler(dispatch_table, response)
+
+    count = len(responses) * repetitions
+    legacy = min(timeit.repeat(run_legacy, number=repetitions, repeat=5)) / count
+    table = min(timeit.repeat(run_table, number=repetitions, repeat=5)) / count
+    print(f"{len(responses)} responses x {repetitions} repetitions")
+    print(f"if/elif chain:  {legacy * 1e9:8.1f} ns per response")
+    print(f"dispatch table: {table * 1e9:8.1f} ns per response ({legacy / table:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Audio/video status decoder micro-benchmark
+
+Compares the cost of decoding the AST (audio status) and VST (video status) responses in a generated response mix using
+the original hand-sliced branch code against the table-driven StatusDecoder used by Plugin.handleAudioStatusResponse and
+Plugin.handleVideoStatusResponse. Both produce every field's value; the state updates themselves need the Indigo server.
+
+Each status response in the mix is turned into a number of variants with changing field values, so the decoder's
+remembered values don't answer every lookup after the first. The decoder is timed cold (new decoders for every pass over
+the responses) and warm (decoders that have already seen them).
+
+Usage: python benchmarks/status_decoder.py [response file] [repetitions] [variants per status response]
+"""
+import os
+import random
+import sys
+import time
+
+SERVER_PLUGIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "Pioneer Receiver.indigoPlugin", "Contents", "Server Plugin")
+sys.path.insert(0, SERVER_PLUGIN)
+
+from constants import (AUDIO_CHANNELS, AUDIO_INPUT_FORMATS, AUDIO_INPUT_FREQUENCIES,  # noqa: E402
+                       AUDIO_OUTPUT_FREQUENCIES, AUDIO_STATUS_FIELDS_2014, VIDEO_RESOLUTIONS, VIDEO_STATUS_FIELDS)
+from protocol import StatusDecoder  # noqa: E402
+
+# A VSX-1123-K audio status response, which carries the 2014 model fields as well.
+AUDIO_STATUS_2014 = "AST0307101000000000000000000000110000000000000022400001050"
+
+VIDEO_NAMES = {
+    'terminal': {0: "", 1: "Video", 2: "S-Video", 3: "Component", 4: "HDMI", 5: "Self (OSD/JPEG)"},
+    'aspect': {0: "", 1: "4:3", 2: "16:9", 3: "14:9"},
+    'color_format': {0: "", 1: "RGB Limited", 2: "RGB Full", 3: "YCbCr 4:4:4", 4: "YCbCr 4:2:2"},
+    'bit_depth': {0: "", 1: "24-bit (8-bit per pixel)", 2: "30-bit (10-bit per pixel)", 3: "36-bit (12-bit per pixel)",
+                  4: "48-bit (16-bit per pixel)"},
+    'color_space': {0: "", 1: "Standard", 2: "xv.Color YCC 601", 3: "xv.Color YCC 709", 4: "sYCC", 5: "Adobe YCC 601",
+                    6: "Adobe RGB"},
+}
+
+
+def legacy_enumeration(names, code):
+    """
+    Translate a one digit code the way the original if/elif ladders did (unknown codes were left as numbers).
+
+    :param names:
+    :param code:
+    :return:
+    """
+    new_value = int(code)
+    for number, name in names.items():
+        if new_value == number:
+            return name
+    return new_value
+
+
+def legacy_audio_status(response):
+    """
+    Decode an AST response (VSX-1123-K layout) the way the original handler did.
+
+    :param response:
+    :return: dictionary of state:value.
+    """
+    states = {}
+    data = response[3:]
+    states['audioInputFormat'] = AUDIO_INPUT_FORMATS[data[0:2]]
+    states['audioInputFrequency'] = AUDIO_INPUT_FREQUENCIES[data[2:4]]
+    new_value = ""
+    for i in range(5, 26):
+        if data[(i - 1):i] == "1":
+            if new_value != "":
+                new_value += ", "
+            new_value += AUDIO_CHANNELS[(i - 5)]
+    states['inputChannels'] = new_value
+    new_value = ""
+    for i in range(26, 44):
+        if data[(i - 1):i] == "1":
+            if new_value != "":
+                new_value += ", "
+            new_value += AUDIO_CHANNELS[(i - 26)]
+    states['outputChannels'] = new_value
+    states['audioOutputFrequency'] = AUDIO_OUTPUT_FREQUENCIES[data[43:45]]
+    states['audioOutputBitDepth'] = int(data[45:47])
+    pqls_mode = data[51:52]
+    if pqls_mode == "0":
+        pqls_mode = "off"
+    elif pqls_mode == "1":
+        pqls_mode = "2-channel"
+    elif pqls_mode == "2":
+        pqls_mode = "multi-channel"
+    elif pqls_mode == "3":
+        pqls_mode = "bitstream"
+    states['pqlsMode'] = pqls_mode
+    states['phaseControlPlusWorkingTime'] = int(data[52:54])
+    reversed_phase = data[54:55]
+    if reversed_phase == "0":
+        reversed_phase = True
+    elif reversed_phase == "1":
+        reversed_phase = False
+    states['phaseControlPlusReversed'] = reversed_phase
+    return states
+
+
+def legacy_video_status(response):
+    """
+    Decode a VST response the way the original handler did.
+
+    :param response:
+    :return: dictionary of state:value.
+    """
+    states = {}
+    data = response[3:]
+    states['videoInputTerminal'] = legacy_enumeration(VIDEO_NAMES['terminal'], data[0:1])
+    states['videoInputResolution'] = VIDEO_RESOLUTIONS[data[1:3]]
+    states['videoInputAspect'] = legacy_enumeration(VIDEO_NAMES['aspect'], data[3:4])
+    states['videoInputColorFormat'] = legacy_enumeration(VIDEO_NAMES['color_format'], data[4:5])
+    states['videoInputBitDepth'] = legacy_enumeration(VIDEO_NAMES['bit_depth'], data[5:6])
+    states['videoInputColorSpace'] = legacy_enumeration(VIDEO_NAMES['color_space'], data[6:7])
+    states['videoOutputResolution'] = VIDEO_RESOLUTIONS[data[7:9]]
+    states['videoOutputAspect'] = legacy_enumeration(VIDEO_NAMES['aspect'], data[9:10])
+    states['videoOutputColorFormat'] = legacy_enumeration(VIDEO_NAMES['color_format'], data[10:11])
+    states['videoOutputBitDepth'] = legacy_enumeration(VIDEO_NAMES['bit_depth'], data[11:12])
+    states['videoOutputColorSpace'] = legacy_enumeration(VIDEO_NAMES['color_space'], data[12:13])
+    states['monitorRecommendedResolution'] = VIDEO_RESOLUTIONS[data[13:15]]
+    states['monitorBitDepth'] = legacy_enumeration(VIDEO_NAMES['bit_depth'], data[15:16])
+    new_value = ""
+    color_spaces = data[16:21]
+    for index, name in enumerate(("xv.Color YCC 601", "xv.Color YCC 709", "xYCC", "Adobe YCC 601", "Adobe RGB")):
+        if color_spaces[index:index + 1] == "1":
+            if len(new_value) > 0:
+                new_value += ", "
+            new_value += name
+    states['monitorColorSpaces'] = new_value
+    return states
+
+
+def load_status_responses(path):
+    """
+    Read the AST and VST responses from a response mix. The mix is modelled on a VSX-1021-K, whose AST responses lack
+    the 2014 model fields, so a VSX-1123-K AST response is used for each of them instead.
+
+    :param path:
+    :return: list of status responses.
+    """
+    with open(path, encoding="utf-8") as response_file:
+        lines = [line.rstrip("\r\n") for line in response_file]
+    return [AUDIO_STATUS_2014 if line.startswith("AST") else line for line in lines if line.startswith(("AST", "VST"))]
+
+
+def vary_status_response(response, fields, rng):
+    """
+    Make a copy of a status response with a new value in every field: a code from the field's lookup table, random flags
+    for a list of names, or a random number.
+
+    :param response:
+    :param fields: the response's field layout (see AUDIO_STATUS_FIELDS).
+    :param rng: random.Random instance.
+    :return: the new response.
+    """
+    data = list(response[3:])
+    for state, offset, width, conversion in fields:
+        if isinstance(conversion, dict):
+            code = rng.choice([code for code in conversion if len(code) == width])
+        elif isinstance(conversion, (list, tuple)):
+            code = "".join(rng.choice("01") for _ in range(width))
+        else:
+            code = f"{rng.randrange(10 ** width):0{width}d}"
+        data[offset:offset + width] = code
+    return response[:3] + "".join(data)
+
+
+def vary_status_responses(responses, variants, seed=1021):
+    """
+    Replace each status response with a number of variants (see vary_status_response), in the same order.
+
+    :param responses:
+    :param variants: variants per response.
+    :param seed: random seed, so every run decodes the same responses.
+    :return: list of status responses.
+    """
+    rng = random.Random(seed)
+    layouts = {"AST": AUDIO_STATUS_FIELDS_2014, "VST": VIDEO_STATUS_FIELDS}
+    return [vary_status_response(response, layouts[response[:3]], rng)
+            for response in responses for _ in range(variants)]
+
+
+def time_passes(make_work, repetitions):
+    """
+    Time a number of passes over the responses. Only the decoding is timed, not making the work for each pass.
+
+    :param make_work: callable returning a list of (decode, response) for one pass.
+    :param repetitions: number of passes.
+    :return: total seconds spent decoding.
+    """
+    total = 0.0
+    for _ in range(repetitions):
+        work = make_work()
+        started = time.perf_counter()
+        for decode, response in work:
+            decode(response)
+        total += time.perf_counter() - started
+    return total
+
+
+def main():
+    """
+    Run both decoders over the status responses and print the per-response cost of each.
+
+    :return:
+    """
+    path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(os.path.dirname(__file__), "response_mix.txt")
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    variants = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+    responses = vary_status_responses(load_status_responses(path), variants)
+    legacy_decoders = {"AST": legacy_audio_status, "VST": legacy_video_status}
+
+    def make_table_decoders():
+        return {"AST": StatusDecoder(AUDIO_STATUS_FIELDS_2014), "VST": StatusDecoder(VIDEO_STATUS_FIELDS)}
+
+    def make_table_work(decoders):
+        return [(decoders[response[:3]].decode, response) for response in responses]
+
+    # Both decoders must agree before their speed is worth comparing. Codes missing from a table were left as numbers
+    # by the branch code and are left as received by the decoder, which reads the same once stored in a state.
+    table_decoders = make_table_decoders()
+    for response in responses:
+        expected = {state: str(value) for state, value in legacy_decoders[response[:3]](response).items()}
+        actual = {state: str(value) for state, value in table_decoders[response[:3]].decode(response).items()}
+        if expected != actual:
+            raise SystemExit(f"Decode mismatch for {response!r}: branches gave {expected!r}, table gave {actual!r}")
+
+    # The check above has warmed table_decoders up.
+    legacy_work = [(legacy_decoders[response[:3]], response) for response in responses]
+    warm_work = make_table_work(table_decoders)
+
+    count = len(responses) * repetitions
+    legacy = time_passes(lambda: legacy_work, repetitions) / count
+    cold = time_passes(lambda: make_table_work(make_table_decoders()), repetitions) / count
+    warm = time_passes(lambda: warm_work, repetitions) / count
+    print(f"{len(responses)} responses ({len(set(responses))} different) x {repetitions} repetitions")
+    print(f"branch code:           {legacy * 1e9:8.1f} ns per response")
+    print(f"status decoder (cold): {cold * 1e9:8.1f} ns per response ({legacy / cold:.1f}x faster)")
+    print(f"status decoder (warm): {warm * 1e9:8.1f} ns per response ({legacy / warm:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()